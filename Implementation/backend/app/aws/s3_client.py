@@ -1,42 +1,149 @@
 # app/aws/s3_client.py
-import os
-import boto3
-from dotenv import load_dotenv
-from typing import Tuple
+# ✅ The single S3 gateway: owns one client and every S3 operation the app performs.
+import threading
+from typing import BinaryIO, Dict, Iterable, Optional, Tuple
 import uuid
+from app.config.config import settings
+from app.services.cache import TTLCache
 
-load_dotenv()
+AWS_BUCKET_NAME = settings.AWS_BUCKET_NAME
+AWS_REGION = settings.AWS_REGION
 
-AWS_ACCESS_KEY = os.getenv("AWS_ACCESS_KEY")
-AWS_SECRET_KEY = os.getenv("AWS_SECRET_KEY")
-AWS_BUCKET_NAME = os.getenv("AWS_BUCKET_NAME")
-AWS_REGION = os.getenv("AWS_REGION")
+_s3_client = None
+_s3_client_lock = threading.Lock()
 
-s3_client = boto3.client(
-    "s3",
-    aws_access_key_id=AWS_ACCESS_KEY,
-    aws_secret_access_key=AWS_SECRET_KEY,
-    region_name=AWS_REGION,
+
+def get_s3_client():
+    """
+    ✅ The one shared S3 client, created on first use (boto3 is imported lazily too).
+    Pool size and retries come from Settings; AWS_S3_ENDPOINT_URL points it at a local stand-in.
+    """
+    global _s3_client
+    if _s3_client is None:
+        with _s3_client_lock:
+            if _s3_client is None:
+                import boto3
+                from botocore.config import Config
+
+                _s3_client = boto3.client(
+                    "s3",
+                    aws_access_key_id=settings.AWS_ACCESS_KEY,
+                    aws_secret_access_key=settings.AWS_SECRET_KEY,
+                    region_name=AWS_REGION,
+                    endpoint_url=settings.AWS_S3_ENDPOINT_URL,
+                    config=Config(
+                        max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+                        retries={"max_attempts": settings.S3_MAX_ATTEMPTS, "mode": "standard"},
+                    ),
+                )
+    return _s3_client
+
+
+def reset_s3_client():
+    """
+    Drops the shared client and signed-URL cache (e.g. between tests against a local S3 stand-in).
+    """
+    global _s3_client
+    with _s3_client_lock:
+        _s3_client = None
+    presigned_get_cache.clear()
+
+
+def object_url(object_key: str) -> str:
+    """
+    The stored (unsigned) URL for an object; responses sign it on the way out.
+    """
+    return f"https://{AWS_BUCKET_NAME}.s3.{AWS_REGION}.amazonaws.com/{object_key}"
+
+
+PRESIGNED_GET_EXPIRES_IN = 3600  # URL valid for 1 hour
+PRESIGNED_GET_REFRESH_MARGIN = 300  # ✅ Re-sign 5 minutes before expiry so clients never get a nearly-dead URL
+
+# ✅ Object key -> presigned GET URL, reused until shortly before it expires
+presigned_get_cache = TTLCache(
+    maxsize=10_000,
+    ttl=PRESIGNED_GET_EXPIRES_IN - PRESIGNED_GET_REFRESH_MARGIN,
 )
 
+
+def generate_presigned_get_url(object_key: str) -> str:
+    url = presigned_get_cache.get(object_key)
+    if url is None:
+        url = get_s3_client().generate_presigned_url(
+            "get_object",
+            Params={"Bucket": AWS_BUCKET_NAME, "Key": object_key},
+            ExpiresIn=PRESIGNED_GET_EXPIRES_IN,
+        )
+        presigned_get_cache.set(object_key, url)
+    return url
+
+
+def generate_presigned_get_urls(object_keys: Iterable[str]) -> Dict[str, str]:
+    """
+    Presigns a batch of keys, signing each distinct uncached key once.
+    """
+    return {key: generate_presigned_get_url(key) for key in set(object_keys)}
+
+
+def generate_presigned_put_url(object_key: str, content_type: str = "image/jpeg", expires_in: int = 3600) -> str:
+    return get_s3_client().generate_presigned_url(
+        "put_object",
+        Params={
+            "Bucket": AWS_BUCKET_NAME,
+            "Key": object_key,
+            "ContentType": content_type
+            # ❗ DO NOT ADD ACL HERE
+        },
+        ExpiresIn=expires_in,
+    )
+
+
+def upload_fileobj(fileobj: BinaryIO, object_key: str, content_type: Optional[str] = None, public: bool = False):
+    """
+    ✅ Streams a file object to S3. Bodies above S3_MULTIPART_THRESHOLD_MB are sent as a
+    multipart upload in S3_MULTIPART_CHUNKSIZE_MB parts, so the whole body is never held in memory.
+    """
+    from boto3.s3.transfer import TransferConfig
+
+    extra_args = {}
+    if content_type:
+        extra_args["ContentType"] = content_type
+    if public:
+        extra_args["ACL"] = "public-read"
+
+    get_s3_client().upload_fileobj(
+        fileobj,
+        AWS_BUCKET_NAME,
+        object_key,
+        ExtraArgs=extra_args,
+        Config=TransferConfig(
+            multipart_threshold=settings.S3_MULTIPART_THRESHOLD_MB * 1024 * 1024,
+            multipart_chunksize=settings.S3_MULTIPART_CHUNKSIZE_MB * 1024 * 1024,
+            max_concurrency=settings.S3_UPLOAD_MAX_CONCURRENCY,
+        ),
+    )
+    presigned_get_cache.delete(object_key)
+
+
+def download_fileobj(object_key: str, fileobj: BinaryIO):
+    get_s3_client().download_fileobj(AWS_BUCKET_NAME, object_key, fileobj)
+
+
+def delete_object(object_key: str):
+    get_s3_client().delete_object(Bucket=AWS_BUCKET_NAME, Key=object_key)
+    presigned_get_cache.delete(object_key)
+
+
+def profile_photo_key(user_id) -> str:
+    return f"users/{user_id}/profile.jpg"
+
+
 # s3_client.py
 def generate_presigned_profile_photo_url(user_id: str) -> Tuple[str, str]:
     try:
-        object_key = f"users/{user_id}/profile.jpg"
-        image_url = f"https://{AWS_BUCKET_NAME}.s3.{AWS_REGION}.amazonaws.com/{object_key}"
-
-        presigned_url = s3_client.generate_presigned_url(
-            "put_object",
-            Params={
-                "Bucket": AWS_BUCKET_NAME,
-                "Key": object_key,
-                "ContentType": "image/jpeg"
-                # ❗ DO NOT ADD ACL HERE
-            },
-            ExpiresIn=3600
-        )
-
-        return presigned_url, image_url
+        object_key = profile_photo_key(user_id)
+        presigned_url = generate_presigned_put_url(object_key, content_type="image/jpeg")
+        return presigned_url, object_url(object_key)
 
     except Exception as e:
         print("Error generating presigned URL:", e)
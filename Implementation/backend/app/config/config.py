@@ -4,10 +4,83 @@ from dotenv import load_dotenv
 load_dotenv()
 
 class Settings:
-    DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./test.db")
+    DATABASE_URL: str = os.getenv("DATABASE_URL")  # ✅ Required (Postgres); app.db.db refuses to start without it
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your_secret_key_here")
     GOOGLE_PLACES_API_KEY: str = os.getenv("GOOGLE_PLACES_API_KEY")
     OPENWEATHERMAP_API_KEY: str = os.getenv("OPENWEATHERMAP_API_KEY")
     PREDICTHQ_API_KEY: str = os.getenv("PREDICTHQ_API_KEY")
+    OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY")
+    FIREBASE_DB_URL: str = os.getenv("FIREBASE_DB_URL")
+
+    # AWS S3
+    AWS_ACCESS_KEY: str = os.getenv("AWS_ACCESS_KEY")
+    AWS_SECRET_KEY: str = os.getenv("AWS_SECRET_KEY")
+    AWS_BUCKET_NAME: str = os.getenv("AWS_BUCKET_NAME")
+    AWS_REGION: str = os.getenv("AWS_REGION")
+    AWS_S3_ENDPOINT_URL: str = os.getenv("AWS_S3_ENDPOINT_URL")  # ✅ Optional local S3 stand-in
+    S3_MAX_POOL_CONNECTIONS: int = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "50"))
+    S3_MAX_ATTEMPTS: int = int(os.getenv("S3_MAX_ATTEMPTS", "3"))
+    S3_MULTIPART_THRESHOLD_MB: int = int(os.getenv("S3_MULTIPART_THRESHOLD_MB", "8"))
+    S3_MULTIPART_CHUNKSIZE_MB: int = int(os.getenv("S3_MULTIPART_CHUNKSIZE_MB", "8"))
+    S3_UPLOAD_MAX_CONCURRENCY: int = int(os.getenv("S3_UPLOAD_MAX_CONCURRENCY", "4"))
+    IMAGE_WORKERS: int = int(os.getenv("IMAGE_WORKERS", "2"))  # ✅ Thumbnail/WebP derivative worker pool
+    IMAGE_VARIANT_RETRY_BASE_SECONDS: int = int(os.getenv("IMAGE_VARIANT_RETRY_BASE_SECONDS", "60"))  # ✅ Backoff after a failed derivative job (doubles per attempt)
+    IMAGE_VARIANT_RETRY_MAX_SECONDS: int = int(os.getenv("IMAGE_VARIANT_RETRY_MAX_SECONDS", "3600"))
+    IMAGE_VARIANT_MAX_ATTEMPTS: int = int(os.getenv("IMAGE_VARIANT_MAX_ATTEMPTS", "5"))  # Missing originals are retried regardless
+    UPLOAD_MAX_CONCURRENCY: int = int(os.getenv("UPLOAD_MAX_CONCURRENCY", "8"))  # ✅ Uploads running off the event loop at once
+
+    # Database engine / connection pool
+    DB_ECHO: bool = os.getenv("DB_ECHO", "false").lower() == "true"  # ✅ SQL statement logging (off in production)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT_SECONDS: float = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+    DB_POOL_RECYCLE_SECONDS: int = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "15000"))
+    DB_APPLICATION_NAME: str = os.getenv("DB_APPLICATION_NAME", "waypoint-api")
+    AUTO_MIGRATE: bool = os.getenv("AUTO_MIGRATE", "false").lower() == "true"  # ✅ Local dev only; deploys run `python -m app.db.migrations`
+
+    # Itinerary detail responses (keyed by ETag)
+    ITINERARY_DETAIL_CACHE_ENABLED: bool = os.getenv("ITINERARY_DETAIL_CACHE_ENABLED", "true").lower() == "true"
+    ITINERARY_DETAIL_CACHE_MAX_ENTRIES: int = int(os.getenv("ITINERARY_DETAIL_CACHE_MAX_ENTRIES", "512"))
+
+    # Recommendation feed (precomputed per geohash cell and travel style)
+    RECOMMENDATIONS_CELL_PRECISION: int = int(os.getenv("RECOMMENDATIONS_CELL_PRECISION", "5"))  # ✅ ~5 km cells
+    RECOMMENDATIONS_TOP_N: int = int(os.getenv("RECOMMENDATIONS_TOP_N", "20"))
+    RECOMMENDATIONS_REFRESH_SECONDS: int = int(os.getenv("RECOMMENDATIONS_REFRESH_SECONDS", "3600"))
+    RECOMMENDATIONS_REFRESH_ENABLED: bool = os.getenv("RECOMMENDATIONS_REFRESH_ENABLED", "true").lower() == "true"
+
+    # Google Places tile cache
+    PLACES_CACHE_TTL_SECONDS: int = int(os.getenv("PLACES_CACHE_TTL_SECONDS", "900"))
+    PLACES_CACHE_MAX_ENTRIES: int = int(os.getenv("PLACES_CACHE_MAX_ENTRIES", "2048"))
+
+    # Outbound HTTP (shared async clients)
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    GOOGLE_PLACES_TIMEOUT_SECONDS: float = float(os.getenv("GOOGLE_PLACES_TIMEOUT_SECONDS", "10"))
+    GOOGLE_PLACES_MAX_CONCURRENCY: int = int(os.getenv("GOOGLE_PLACES_MAX_CONCURRENCY", "20"))
+    OPENWEATHERMAP_TIMEOUT_SECONDS: float = float(os.getenv("OPENWEATHERMAP_TIMEOUT_SECONDS", "5"))
+    OPENWEATHERMAP_MAX_CONCURRENCY: int = int(os.getenv("OPENWEATHERMAP_MAX_CONCURRENCY", "20"))
+    OPENAI_TIMEOUT_SECONDS: float = float(os.getenv("OPENAI_TIMEOUT_SECONDS", "60"))
+    OPENAI_MAX_CONCURRENCY: int = int(os.getenv("OPENAI_MAX_CONCURRENCY", "100"))
+    FIREBASE_TIMEOUT_SECONDS: float = float(os.getenv("FIREBASE_TIMEOUT_SECONDS", "10"))
+    FIREBASE_MAX_CONCURRENCY: int = int(os.getenv("FIREBASE_MAX_CONCURRENCY", "20"))
+
+    # Weather cache ("memory" per worker, or "redis" for a shared Redis-compatible server)
+    WEATHER_CACHE_BACKEND: str = os.getenv("WEATHER_CACHE_BACKEND", "memory")
+    WEATHER_CACHE_TTL_SECONDS: int = int(os.getenv("WEATHER_CACHE_TTL_SECONDS", "600"))
+    WEATHER_CACHE_STALE_SECONDS: int = int(os.getenv("WEATHER_CACHE_STALE_SECONDS", "1800"))
+    WEATHER_CACHE_MAX_ENTRIES: int = int(os.getenv("WEATHER_CACHE_MAX_ENTRIES", "4096"))
+    REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+    # Chatbot completions ("openai", or "fake" for offline runs) and their response cache
+    CHATBOT_COMPLETION_BACKEND: str = os.getenv("CHATBOT_COMPLETION_BACKEND", "openai")
+    CHATBOT_MODEL: str = os.getenv("CHATBOT_MODEL", "gpt-4o-mini")
+    CHATBOT_CACHE_BACKEND: str = os.getenv("CHATBOT_CACHE_BACKEND", "memory")
+    CHATBOT_CACHE_TTL_SECONDS: int = int(os.getenv("CHATBOT_CACHE_TTL_SECONDS", "21600"))
+    CHATBOT_CACHE_MAX_ENTRIES: int = int(os.getenv("CHATBOT_CACHE_MAX_ENTRIES", "2048"))
+    CHATBOT_CONTEXT_TOKEN_BUDGET: int = int(os.getenv("CHATBOT_CONTEXT_TOKEN_BUDGET", "1200"))  # ✅ Verbatim history per session turn
+    CHATBOT_SUMMARY_MAX_TOKENS: int = int(os.getenv("CHATBOT_SUMMARY_MAX_TOKENS", "250"))
+    CHATBOT_GROUNDING_CANDIDATES: int = int(os.getenv("CHATBOT_GROUNDING_CANDIDATES", "12"))  # ✅ Places offered to the model per request
 
 settings = Settings()
@@ -1,19 +1,10 @@
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from dotenv import load_dotenv
-from pathlib import Path
-import os
+from app.config.config import settings
+from app.db.pool import InstrumentedQueuePool
 
-# ✅ Load environment variables ONLY in local environment
-BASE_DIR = Path(__file__).resolve().parent.parent.parent
-ENV_PATH = BASE_DIR / ".env"
-
-if os.getenv("DATABASE_URL") is None:
-    print("🔍 Loading environment variables from .env")
-    load_dotenv(dotenv_path=ENV_PATH)
-
-# ✅ Get DATABASE_URL
-DATABASE_URL = os.getenv("DATABASE_URL")
+# ✅ Get DATABASE_URL (.env is loaded once, by app.config.config)
+DATABASE_URL = settings.DATABASE_URL
 if not DATABASE_URL:
     raise ValueError("❌ DATABASE_URL is not set. Check your environment variables!")
 
@@ -21,24 +12,34 @@ if not DATABASE_URL:
 if DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
-print(f"✅ Using DATABASE_URL: {DATABASE_URL}")
-
-# ✅ Create database engine
-engine = create_engine(DATABASE_URL, echo=True)
+# ✅ Create database engine (pool and statement logging come from Settings)
+engine_kwargs = {"echo": settings.DB_ECHO}
+if DATABASE_URL.startswith("postgresql"):
+    engine_kwargs.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={
+            "application_name": settings.DB_APPLICATION_NAME,
+            "options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}",
+        },
+    )
+engine = create_engine(DATABASE_URL, **engine_kwargs)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-# ✅ Import Base AFTER defining engine
-from app.db.base import Base  # ✅ Use Base from base.py to prevent conflicts
-
-# ✅ Import models AFTER Base is defined
+# ✅ Import models so every mapper/relationship is configured before first use
 from app.models import *  # ✅ Ensure all models are imported
 
-# ✅ Ensure tables are created in "public" schema
-metadata = MetaData(schema="public")
-Base.metadata.schema = "public"  # ✅ Explicitly set schema
-print("🔄 Creating tables if they don't exist...")
-Base.metadata.create_all(bind=engine)  # ✅ Create tables after all models are loaded
-print("✅ Tables successfully created.")
+def pool_stats() -> dict:
+    """
+    ✅ Connection pool readout (checkouts, waits, overflow) for the /metrics endpoint.
+    """
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        return engine.pool.stats()
+    return {"status": engine.pool.status()}
 
 # ✅ Dependency function to get DB session
 def get_db():
@@ -0,0 +1,163 @@
+from datetime import datetime
+from sqlalchemy import inspect, text
+from app.services.geo import encode_geohash
+
+# ✅ `Base.metadata.create_all` only creates missing tables. Columns and indexes added
+# to existing tables are applied here, in order, and recorded in `schema_migrations`.
+
+
+def _add_column(conn, table: str, column: str, ddl: str):
+    existing = {col["name"] for col in inspect(conn).get_columns(table)}
+    if column not in existing:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+
+
+def _drop_index(conn, name: str):
+    conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+
+def _create_index(conn, name: str, table: str, columns: str, unique: bool = False):
+    unique_sql = "UNIQUE " if unique else ""
+    conn.execute(text(f"CREATE {unique_sql}INDEX IF NOT EXISTS {name} ON {table} ({columns})"))
+
+
+def _0001_place_geohash(conn):
+    _add_column(conn, "places", "geohash", "VARCHAR(12)")
+    _create_index(conn, "ix_places_geohash", "places", "geohash")
+    _create_index(conn, "ix_places_lat_lon", "places", "latitude, longitude")
+
+    rows = conn.execute(text("SELECT id, latitude, longitude FROM places WHERE geohash IS NULL")).fetchall()
+    if rows:
+        conn.execute(
+            text("UPDATE places SET geohash = :geohash WHERE id = :id"),
+            [{"id": row.id, "geohash": encode_geohash(row.latitude, row.longitude)} for row in rows],
+        )
+
+
+def _0002_api_cache_key(conn):
+    _add_column(conn, "api_cache", "cache_key", "VARCHAR")
+    _create_index(conn, "ix_api_cache_cache_key", "api_cache", "cache_key")
+
+
+def _0003_place_natural_key(conn):
+    # ✅ Fold existing duplicates onto the oldest row before enforcing uniqueness
+    conn.execute(text(
+        "UPDATE user_favorites SET place_id = ("
+        "SELECT MIN(dup.id) FROM places cur JOIN places dup "
+        "ON dup.name = cur.name AND dup.latitude = cur.latitude AND dup.longitude = cur.longitude "
+        "WHERE cur.id = user_favorites.place_id)"
+    ))
+    conn.execute(text(
+        "DELETE FROM places WHERE id NOT IN ("
+        "SELECT MIN(id) FROM places GROUP BY name, latitude, longitude)"
+    ))
+    _create_index(conn, "uq_places_name_lat_lon", "places", "name, latitude, longitude", unique=True)
+
+
+def _0004_itinerary_pagination(conn):
+    # ✅ Keyset pagination orders by (updated_at, id), so updated_at must be set
+    conn.execute(text("UPDATE itineraries SET updated_at = created_at WHERE updated_at IS NULL"))
+    _create_index(conn, "ix_itineraries_created_by_updated_at", "itineraries", "created_by, updated_at")
+
+
+def _0005_itinerary_day_order(conn):
+    _create_index(conn, "ix_itinerary_days_itinerary_id_order_index", "itinerary_days", "itinerary_id, order_index")
+
+
+def _delete_duplicates(conn, table: str, columns: str, keep_first: str):
+    """
+    Keeps one row per `columns` value so a unique index can be created: the first one in
+    `keep_first` order (ids are random UUIDs, so they can't pick the survivor).
+    """
+    conn.execute(text(
+        f"DELETE FROM {table} WHERE id IN ("
+        f"SELECT id FROM (SELECT id, ROW_NUMBER() OVER (PARTITION BY {columns} ORDER BY {keep_first}, id) AS rank "
+        f"FROM {table}) ranked WHERE rank > 1)"
+    ))
+
+
+def _0006_lookup_indexes(conn):
+    # itinerary_days.itinerary_id and itineraries.created_by are already the leading
+    # columns of ix_itinerary_days_itinerary_id_order_index / ix_itineraries_created_by_updated_at.
+    _create_index(conn, "ix_activities_itinerary_day_id_created_at", "activities", "itinerary_day_id, created_at, id")
+
+    # ✅ Never drop an itinerary's Owner; otherwise keep the earliest membership
+    _delete_duplicates(conn, "itinerary_members", "itinerary_id, user_id", "(role = 'Owner') DESC, joined_at NULLS LAST")
+    _create_index(conn, "uq_itinerary_members_itinerary_id_user_id", "itinerary_members", "itinerary_id, user_id", unique=True)
+
+    _delete_duplicates(conn, "user_favorites", "user_id, place_id", "added_at NULLS LAST")
+    _create_index(conn, "uq_user_favorites_user_id_place_id", "user_favorites", "user_id, place_id", unique=True)
+
+    # ✅ quiz_results has no timestamp; keep the most recently written row (youngest xmin)
+    _delete_duplicates(conn, "quiz_results", "user_id", "age(xmin)")
+    _create_index(conn, "uq_quiz_results_user_id", "quiz_results", "user_id", unique=True)
+
+
+def _0007_place_category_rating(conn):
+    _create_index(conn, "ix_places_category_rating", "places", "category, rating")
+
+
+def _0008_place_geohash_pattern(conn):
+    # ✅ A plain btree on geohash can't serve `LIKE 'prefix%'` unless the database uses the C collation
+    _create_index(conn, "ix_places_geohash_pattern", "places", "geohash varchar_pattern_ops")
+    _drop_index(conn, "ix_places_geohash")
+
+
+def _0009_user_profile_photo_variants(conn):
+    _add_column(conn, "users", "profile_photo_variants", "JSON")
+
+
+MIGRATIONS = [
+    ("0001_place_geohash", _0001_place_geohash),
+    ("0002_api_cache_key", _0002_api_cache_key),
+    ("0003_place_natural_key", _0003_place_natural_key),
+    ("0004_itinerary_pagination", _0004_itinerary_pagination),
+    ("0005_itinerary_day_order", _0005_itinerary_day_order),
+    ("0006_lookup_indexes", _0006_lookup_indexes),
+    ("0007_place_category_rating", _0007_place_category_rating),
+    ("0008_place_geohash_pattern", _0008_place_geohash_pattern),
+    ("0009_user_profile_photo_variants", _0009_user_profile_photo_variants),
+]
+
+
+def run_migrations(engine):
+    """
+    ✅ Applies every migration that has not been recorded yet, each in its own transaction.
+    """
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "version VARCHAR(64) PRIMARY KEY, applied_at TIMESTAMP NOT NULL)"
+        ))
+        applied = {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+    for version, migrate in MIGRATIONS:
+        if version in applied:
+            continue
+        with engine.begin() as conn:
+            # ✅ Index builds and backfills on large tables may outlast the app's DB_STATEMENT_TIMEOUT_MS
+            conn.execute(text("SET LOCAL statement_timeout = 0"))
+            migrate(conn)
+            conn.execute(
+                text("INSERT INTO schema_migrations (version, applied_at) VALUES (:version, :applied_at)"),
+                {"version": version, "applied_at": datetime.utcnow()},
+            )
+        print(f"✅ Applied migration {version}")
+
+
+def migrate():
+    """
+    ✅ Creates missing tables, then applies pending migrations.
+    Run explicitly on deploy: `python -m app.db.migrations`
+    """
+    from app.db.base import Base
+    from app.db.db import engine
+
+    print("🔄 Creating tables if they don't exist...")
+    Base.metadata.create_all(bind=engine)  # ✅ app.db.db imports every model first
+    run_migrations(engine)
+    print("✅ Schema is up to date.")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,60 @@
+import threading
+import time
+from sqlalchemy.pool import QueuePool
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    ✅ QueuePool that counts checkouts, waits (checkouts that found the pool exhausted),
+    time spent waiting and checkouts served by overflow connections.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._max_overflow_limit = kwargs.get("max_overflow", 10)
+        self._metrics_lock = threading.Lock()
+        self.metrics = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_seconds_total": 0.0,
+            "overflow_checkouts": 0,
+            "timeouts": 0,
+        }
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self):
+        exhausted = self.checkedin() == 0 and self.overflow() >= self._max_overflow_limit
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except Exception:
+            with self._metrics_lock:
+                self.metrics["timeouts"] += 1
+            raise
+        waited = time.perf_counter() - start
+
+        with self._metrics_lock:
+            self.metrics["checkouts"] += 1
+            if exhausted:
+                self.metrics["waits"] += 1
+                self.metrics["wait_seconds_total"] += waited
+            if self.overflow() > 0:
+                self.metrics["overflow_checkouts"] += 1
+        return conn
+
+    def stats(self) -> dict:
+        with self._metrics_lock:
+            metrics = dict(self.metrics)
+        metrics["wait_seconds_total"] = round(metrics["wait_seconds_total"], 6)
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            "max_overflow": self._max_overflow_limit,
+            **metrics,
+        }
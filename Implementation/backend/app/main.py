@@ -1,16 +1,19 @@
 from fastapi import FastAPI, Depends, HTTPException, UploadFile, File, Form
 from sqlalchemy.orm import Session
 from app.config.config import settings
-from app.db.db import SessionLocal
+from app.db.db import SessionLocal, engine, pool_stats
+from app.db.migrations import migrate
+from app.aws import s3_client
 from sqlalchemy.sql import text  # ✅ Import `text`
 import os
-import boto3
-from dotenv import load_dotenv
 import uvicorn
 from app.models.itinerary_models import Itinerary
 import uuid
-import requests
-import json
+from contextlib import asynccontextmanager
+from app.services.http_client import close_http_clients
+from app.services import upload_service, image_derivatives, recommendation_service
+import asyncio
+from app.services.itinerary_projection import extract_key, itinerary_detail_cache
 
 from app.routes import (
     user_routes, 
@@ -25,24 +28,25 @@ from app.routes import (
     image,
 )   
 
-app = FastAPI()
-
-load_dotenv()
-
-
-# AWS Credentials
-AWS_ACCESS_KEY = os.getenv("AWS_ACCESS_KEY")
-AWS_SECRET_KEY = os.getenv("AWS_SECRET_KEY")
-AWS_BUCKET_NAME = os.getenv("AWS_BUCKET_NAME")
-AWS_REGION = os.getenv("AWS_REGION")
-
-# Initialize S3 Client
-s3_client = boto3.client(
-    "s3",
-    aws_access_key_id=AWS_ACCESS_KEY,
-    aws_secret_access_key=AWS_SECRET_KEY,
-    region_name=AWS_REGION,
-)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # ✅ Nothing heavy at import time: schema changes are an explicit step
+    # (`python -m app.db.migrations`) and SDK clients are created on first use.
+    if settings.AUTO_MIGRATE:
+        migrate()
+    # ✅ Keeps the /places/recommended feed fresh (one worker rebuilds at a time)
+    refresh_task = None
+    if settings.RECOMMENDATIONS_REFRESH_ENABLED:
+        refresh_task = asyncio.create_task(recommendation_service.run_refresh_loop())
+    yield
+    if refresh_task is not None:
+        refresh_task.cancel()
+    # ✅ Release pooled outbound connections on shutdown
+    await close_http_clients()
+    image_derivatives.shutdown()
+    engine.dispose()
+
+app = FastAPI(lifespan=lifespan)
 
 
 # ✅ Include routers
@@ -74,6 +78,17 @@ def read_root():
 def healthcheck():
     return {"status": "FastAPI is running!"}
 
+# ✅ Runtime metrics for sizing dynos (DB pool, upstream caches)
+@app.get("/metrics")
+def metrics():
+    return {
+        "db_pool": pool_stats(),
+        "places_cache": place_routes.cache_stats(),
+        "weather_cache": weather_routes.weather_cache.stats(),
+        "itinerary_detail_cache": itinerary_detail_cache.stats(),
+        "chatbot_cache": chatbot_routes.cache_stats(),
+    }
+
 # ✅ Fix: Use `text()` to wrap raw SQL
 @app.get("/test-db")
 def test_db(db: Session = Depends(get_db)):
@@ -106,17 +121,14 @@ def generate_presigned_url(itinerary_id: str, db: Session = Depends(get_db)):
         file_name = f"itineraries/{itinerary_id}_{uuid.uuid4().hex}.jpg"
 
         # Generate Pre-Signed URL
-        presigned_url = s3_client.generate_presigned_url(
-            "put_object",
-            Params={"Bucket": AWS_BUCKET_NAME, "Key": file_name, "ContentType": "image/jpeg"},
-            ExpiresIn=3600,  # URL expires in 1 hour
-        )
+        presigned_url = s3_client.generate_presigned_put_url(file_name, content_type="image/jpeg")
 
         # Build the image URL (public URL or the base URL from S3)
-        image_url = f"https://{AWS_BUCKET_NAME}.s3.{AWS_REGION}.amazonaws.com/{file_name}"
+        image_url = s3_client.object_url(file_name)
 
-        # Update the itinerary's extra_data with the new image URL
-        extra_data = itinerary.extra_data or {}
+        # Update the itinerary's extra_data with the new image URL (old variants belong to the old image)
+        extra_data = dict(itinerary.extra_data or {})
+        extra_data.pop("image_variants", None)
         extra_data = {**extra_data, "image_url": image_url}
         itinerary.extra_data = extra_data
         db.commit()
@@ -126,26 +138,27 @@ def generate_presigned_url(itinerary_id: str, db: Session = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating pre-signed URL: {str(e)}")
 
+@app.post("/image-upload-complete/")
+def image_upload_complete(itinerary_id: str, db: Session = Depends(get_db)):
+    """
+    Called by the client once its pre-signed PUT has finished.
+    Queues thumbnail/WebP generation for the itinerary's cover image.
+    """
+    itinerary = db.query(Itinerary).filter(Itinerary.id == itinerary_id).first()
+    if not itinerary:
+        raise HTTPException(status_code=404, detail="Itinerary not found")
+    if not (itinerary.extra_data or {}).get("image_url"):
+        raise HTTPException(status_code=400, detail="Itinerary has no image")
+
+    object_key = extract_key(itinerary.extra_data["image_url"])
+    queued = image_derivatives.schedule_variants(object_key, itinerary_id=itinerary.id)
+    return {"queued": queued, "variants": image_derivatives.variant_keys(object_key)}
+
 @app.post("/upload-profile-photo/")
 async def upload_profile_photo(user_id: str = Form(...), file: UploadFile = File(...)):
-    filename = f"profile_photos/{user_id}/profile.jpg"
     try:
-        s3_client.upload_fileobj(
-            file.file,
-            AWS_BUCKET_NAME,
-            filename,
-            ExtraArgs={
-                "ACL": "public-read",
-                "ContentType": file.content_type
-            }
-        )
-        image_url = f"https://{AWS_BUCKET_NAME}.s3.{AWS_REGION}.amazonaws.com/{filename}"
-
-        # Save to Firebase
-        firebase_url = f"{FIREBASE_DB_URL}/users/{user_id}/profilePhotoUrl.json"
-        response = requests.patch(firebase_url, data=json.dumps(image_url))
-        if response.status_code != 200:
-            raise Exception("Failed to update Firebase")
+        # ✅ S3 upload runs off the event loop; the Firebase patch is async with retries
+        image_url = await upload_service.upload_profile_photo(user_id, file)
 
         return {"url": image_url}
 
@@ -8,4 +8,6 @@ from .shared_itinerary_model import SharedItinerary
 from .badge_model import Badge
 from .user_badge_model import UserBadge
 from .api_cache_model import APICache
-from .quiz_model import QuizResult  # ✅ Include QuizResult to avoid missing references
\ No newline at end of file
+from .quiz_model import QuizResult  # ✅ Include QuizResult to avoid missing references
+from .chat_session_model import ChatSession, ChatMessage
+from .place_recommendation_model import PlaceRecommendation
@@ -9,5 +9,6 @@ class APICache(Base):
     __tablename__ = "api_cache"
     id = Column(Integer, primary_key=True, index=True)
     source = Column(String, nullable=False)  # GooglePlaces or Eventbrite
+    cache_key = Column(String, nullable=True, index=True)  # ✅ e.g. places:<style>:<geohash tile>:<radius>
     data = Column(JSON, nullable=False)  # Store JSON response data
     fetched_at = Column(DateTime, default=datetime.utcnow)
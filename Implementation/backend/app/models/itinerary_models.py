@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, JSON, Float, Enum, Integer
+from sqlalchemy import Column, String, ForeignKey, DateTime, JSON, Float, Enum, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -11,6 +11,9 @@ from app.db.base import Base  # ✅ Import Base from base.py (Fix Circular Impor
 
 class Itinerary(Base):
     __tablename__ = "itineraries"
+    __table_args__ = (
+        Index("ix_itineraries_created_by_updated_at", "created_by", "updated_at"),  # ✅ Per-user keyset pagination
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)  # ✅ UUID Type
     name = Column(String, nullable=False)
@@ -29,7 +32,12 @@ class Itinerary(Base):
     # ✅ Relationships
     members = relationship("ItineraryMember", back_populates="itinerary", cascade="all, delete")
     owner = relationship("User", back_populates="itineraries")  # ✅ Fix: Ensure `User` model has `itineraries`
-    days = relationship("ItineraryDay", back_populates="itinerary", cascade="all, delete")
+    days = relationship(
+        "ItineraryDay",
+        back_populates="itinerary",
+        cascade="all, delete",
+        order_by="(ItineraryDay.order_index, ItineraryDay.id)",
+    )
     
     # ✅ Ensure SharedItinerary is referenced if used in your project
     shared_itineraries = relationship("SharedItinerary", back_populates="itinerary", cascade="all, delete")
@@ -37,6 +45,9 @@ class Itinerary(Base):
 
 class ItineraryMember(Base):
     __tablename__ = "itinerary_members"
+    __table_args__ = (
+        Index("uq_itinerary_members_itinerary_id_user_id", "itinerary_id", "user_id", unique=True),  # ✅ One membership per user
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)  # ✅ UUID Type
     itinerary_id = Column(UUID(as_uuid=True), ForeignKey("itineraries.id", ondelete="CASCADE"), nullable=False)  # ✅ Must match `Itinerary.id`
@@ -49,6 +60,9 @@ class ItineraryMember(Base):
 
 class ItineraryDay(Base):
     __tablename__ = "itinerary_days"
+    __table_args__ = (
+        Index("ix_itinerary_days_itinerary_id_order_index", "itinerary_id", "order_index"),  # ✅ Ordered days per itinerary
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     itinerary_id = Column(UUID(as_uuid=True), ForeignKey("itineraries.id", ondelete="CASCADE"), nullable=False)
@@ -59,11 +73,19 @@ class ItineraryDay(Base):
 
 
     itinerary = relationship("Itinerary", back_populates="days")
-    activities = relationship("Activity", back_populates="day", cascade="all, delete")
+    activities = relationship(
+        "Activity",
+        back_populates="day",
+        cascade="all, delete",
+        order_by="(Activity.created_at, Activity.id)",  # ✅ Stable order for eager loads
+    )
 
 
 class Activity(Base):
     __tablename__ = "activities"
+    __table_args__ = (
+        Index("ix_activities_itinerary_day_id_created_at", "itinerary_day_id", "created_at", "id"),  # ✅ A day's activities, in order
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     itinerary_day_id = Column(UUID(as_uuid=True), ForeignKey("itinerary_days.id", ondelete="CASCADE"), nullable=False)
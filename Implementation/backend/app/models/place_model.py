@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, JSON, DateTime, Float
+from sqlalchemy import Column, Integer, String, JSON, DateTime, Float, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base import Base  # ✅ Import Base from base.py (Fix Circular Import)
@@ -6,11 +6,20 @@ from app.db.base import Base  # ✅ Import Base from base.py (Fix Circular Impor
 # Place Model
 class Place(Base):
     __tablename__ = "places"
+    __table_args__ = (
+        Index("ix_places_lat_lon", "latitude", "longitude"),  # ✅ Bounding-box prefilter
+        # ✅ Geohash prefix lookups (`LIKE 'prefix%'`) regardless of the database collation
+        Index("ix_places_geohash_pattern", "geohash", postgresql_ops={"geohash": "varchar_pattern_ops"}),
+        Index("uq_places_name_lat_lon", "name", "latitude", "longitude", unique=True),  # ✅ Natural key for upserts
+        Index("ix_places_category_rating", "category", "rating"),  # ✅ Top-rated places per category
+    )
+
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     name = Column(String, nullable=False)
     category = Column(String, nullable=False)
     latitude = Column(Float, nullable=False)
     longitude = Column(Float, nullable=False)
+    geohash = Column(String(12), nullable=True)  # ✅ Spatial cell for indexed radius lookups
     rating = Column(Float, nullable=True)
     source_api = Column(String, nullable=False)
     cached_data = Column(JSON, nullable=True)
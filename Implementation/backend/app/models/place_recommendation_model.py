@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, DateTime, JSON
+from datetime import datetime
+from app.db.base import Base  # ✅ Import Base from base.py (Fix Circular Import)
+
+
+# Precomputed Recommendation Feed: ranked top-N places per (geohash cell, travel style)
+class PlaceRecommendation(Base):
+    __tablename__ = "place_recommendations"
+
+    cell = Column(String(12), primary_key=True)  # ✅ Geohash prefix; (cell, travel_style) is the lookup key
+    travel_style = Column(String(50), primary_key=True)
+    places = Column(JSON, nullable=False)  # Ranked place snapshots, best first
+    computed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey
+from sqlalchemy import Column, String, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID  # ✅ Use UUID Type
 from sqlalchemy.orm import relationship
 from app.db.base import Base  # ✅ Fix Circular Import
@@ -6,6 +6,9 @@ import uuid
 
 class QuizResult(Base):
     __tablename__ = "quiz_results"
+    __table_args__ = (
+        Index("uq_quiz_results_user_id", "user_id", unique=True),  # ✅ One quiz result per user (create upserts)
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)  # ✅ Changed to UUID
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)  # ✅ Updated to UUID
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID  # ✅ Use UUID Type
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -8,6 +8,10 @@ from app.db.base import Base  # ✅ Fix Circular Import
 # User Favorite Model
 class UserFavorite(Base):
     __tablename__ = "user_favorites"
+    __table_args__ = (
+        Index("uq_user_favorites_user_id_place_id", "user_id", "place_id", unique=True),  # ✅ A place is favorited once per user
+    )
+
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)  # ✅ Changed to UUID
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)  # ✅ Updated to UUID
     place_id = Column(Integer, ForeignKey("places.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, Integer  # ✅ Added Integer
+from sqlalchemy import Column, String, ForeignKey, DateTime, Integer, JSON  # ✅ Added Integer
 from sqlalchemy.dialects.postgresql import UUID  # ✅ Use UUID for user_id only
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -17,6 +17,7 @@ class User(Base):
     travel_style_id = Column(Integer, ForeignKey("travel_styles.id"), nullable=True)
     status = Column(String, default="active")
     created_at = Column(DateTime, default=datetime.utcnow)
+    profile_photo_variants = Column(JSON, nullable=True)  # ✅ Thumb/medium WebP keys for the profile photo (image_derivatives)
 
     # Relationships
     travel_style = relationship("TravelStyle", back_populates="users")
@@ -1,18 +1,30 @@
-from fastapi import APIRouter, HTTPException
-from openai import OpenAI
-import os
-from dotenv import load_dotenv
+import json
+from typing import List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-
-load_dotenv()
+from sqlalchemy.orm import Session
+from app.db.db import get_db
+from app.models.chat_session_model import ChatMessage
+from app.schemas.chat_session_schema import (
+    ChatMessageCreate,
+    ChatMessageResponse,
+    ChatSessionCreate,
+    ChatSessionResponse,
+    ChatTurnResponse,
+)
+from app.services import chat_session_service
+from app.services.chat_grounding import GROUNDED_MAX_TOKENS, grounding_context, mentioned_places
+from starlette.concurrency import run_in_threadpool
+from app.services.chat_service import cache_stats, cached_completion, get_system_prompt, stream_completion
 
 chatbot_router = APIRouter()
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
 class ChatbotRequest(BaseModel):
     user_message: str
     travel_style: str
+    user_id: Optional[UUID] = None  # ✅ Optional: ground answers in this user's current itinerary
 
 class PackingRequest(BaseModel):
     city: str
@@ -20,61 +32,139 @@ class PackingRequest(BaseModel):
     condition: str
 
 
-def get_system_prompt(travel_style):
-    base_prompt = "Your name is Waypointer, a travel assistant for Vancouver, British Columbia, Canada."
-    
-    style_prompts = {
-        "relaxation": "Focus on suggesting quiet, peaceful, and scenic locations like spas, beaches, and tranquil parks. Provide specific place suggestions.",
-        "adventure": "Recommend thrilling activities such as hiking, kayaking, zip-lining, and outdoor exploration. Provide specific place suggestions.",
-        "cultural": "Suggest historical sites, museums, art galleries, and local cultural experiences. Provide specific place suggestions.",
-    }
+async def _grounded_prompt(db: Session, request: ChatbotRequest):
+    """
+    ✅ Builds the messages for a chatbot request, grounded in candidate places from our
+    database (and the user's itinerary). Returns (messages, completion params, candidates).
+    """
+    system_prompt = get_system_prompt(request.travel_style)
+    context, candidates = await run_in_threadpool(grounding_context, db, request.travel_style, request.user_id)
+
+    messages = [{"role": "system", "content": system_prompt}]
+    params = {}
+    if context:
+        messages.append({"role": "system", "content": context})
+        params["max_tokens"] = GROUNDED_MAX_TOKENS  # ✅ Choose-and-explain answers are short
+    messages.append({"role": "user", "content": request.user_message})
+    return messages, params, candidates
 
-    additional_prompt = "Please limit to 3 suggestions unless specified in my request. Provide specific place suggestions."
-    
-    style_message = style_prompts.get(travel_style.lower(), "Provide general travel recommendations.")
-    
-    return f"{base_prompt} {style_message} {additional_prompt}"
 
 @chatbot_router.post("/")
-async def chatbot_interaction(request: ChatbotRequest):
+async def chatbot_interaction(request: ChatbotRequest, db: Session = Depends(get_db)):
     try:
-        system_prompt = get_system_prompt(request.travel_style)
-
-        completion = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": request.user_message}
-                 ]
-        )
+        messages, params, candidates = await _grounded_prompt(db, request)
+
+        # ✅ Repeated prompts per travel style are served from the response cache
+        completion = await cached_completion(messages=messages, **params)
         # Debugging: Add travel style in response to confirm user travel style retrieval
         #response_text = completion.choices[0].message.content
         #formatted_response = f"For {request.travel_style} lovers: {response_text}"
         #return {"response": formatted_response}
         
-        return {"response": completion.choices[0].message.content}
+        return {"response": completion["content"], "places": mentioned_places(completion["content"], candidates)}
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _sse(data: dict, event: str = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+@chatbot_router.post("/stream")
+async def chatbot_interaction_stream(request: ChatbotRequest, db: Session = Depends(get_db)):
+    """
+    ✅ Streaming variant of `POST /chatbot/`: relays the answer over Server-Sent Events as it is generated.
+    Events: `data: {"delta": ...}` per chunk, then `event: done` with token usage and linked places
+    (or `event: error`). When the client disconnects, Starlette cancels this generator and the
+    upstream stream is closed.
+    """
+    messages, params, candidates = await _grounded_prompt(db, request)
+
+    async def events():
+        answer = []
+        try:
+            async for delta, usage in stream_completion(messages, **params):
+                if delta is not None:
+                    answer.append(delta)
+                    yield _sse({"delta": delta})
+                else:
+                    yield _sse({"usage": usage, "places": mentioned_places("".join(answer), candidates)}, event="done")
+        except Exception as e:
+            yield _sse({"detail": str(e)}, event="error")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# -------------------- Chat Sessions (multi-turn) --------------------
+
+@chatbot_router.post("/sessions", response_model=ChatSessionResponse)
+def create_chat_session(session: ChatSessionCreate, db: Session = Depends(get_db)):
+    return chat_session_service.create_session(db, session.user_id, session.travel_style)
+
+
+@chatbot_router.post("/sessions/{session_id}/messages", response_model=ChatTurnResponse)
+async def send_chat_message(session_id: UUID, message: ChatMessageCreate, db: Session = Depends(get_db)):
+    """
+    ✅ One turn of a server-side conversation. Only the new message is sent; the server adds the
+    persona, a rolling summary of older turns and the recent turns within a fixed token budget.
+    """
+    try:
+        return await chat_session_service.send_message(db, session_id, message.user_message)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@chatbot_router.get("/sessions/{session_id}/messages", response_model=List[ChatMessageResponse])
+def get_chat_messages(session_id: UUID, db: Session = Depends(get_db)):
+    chat_session_service.get_session(db, session_id)
+    return (
+        db.query(ChatMessage)
+        .filter(ChatMessage.session_id == session_id)
+        .order_by(ChatMessage.created_at, ChatMessage.id)
+        .all()
+    )
+
+
+@chatbot_router.delete("/sessions/{session_id}")
+def delete_chat_session(session_id: UUID, db: Session = Depends(get_db)):
+    session = chat_session_service.get_session(db, session_id)
+    db.delete(session)
+    db.commit()
+    return {"message": "Chat session deleted successfully"}
+
+
 @chatbot_router.post("/packing")
 async def get_packing_tip(req: PackingRequest):
+    # ✅ Rounded so nearby temperatures share one cached tip
     prompt = (
         f"You are a helpful travel assistant. Based on this weather: "
-        f"{req.temperature}°C, {req.condition.lower()} in {req.city}, "
+        f"{round(req.temperature)}°C, {req.condition.lower()} in {req.city}, "
         f"suggest what a traveler should pack. Keep it short and under 3 sentences."
     )
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
+        response = await cached_completion(
             messages=[{"role": "user", "content": prompt}],
             temperature=0.7,
             max_tokens=80,
         )
 
-        message = response.choices[0].message.content
+        message = response["content"]
         return {"status": "success", "packing_tip": message}
 
     except Exception as e:
         return {"status": "error", "detail": str(e)}
+
+
+@chatbot_router.get("/cache/stats")
+def get_chatbot_cache_stats():
+    """
+    ✅ Hit rate and tokens saved by the chatbot response cache on this worker.
+    """
+    return cache_stats()
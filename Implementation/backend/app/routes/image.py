@@ -1,5 +1,10 @@
-from app.aws.s3_client import generate_presigned_profile_photo_url
-from fastapi import APIRouter, HTTPException
+from uuid import UUID
+from app.aws.s3_client import generate_presigned_profile_photo_url, profile_photo_key
+from app.db.db import get_db
+from app.models.user_model import User
+from app.services import image_derivatives
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
 
 router = APIRouter()
 
@@ -14,3 +19,17 @@ async def generate_profile_photo_url(user_id: str):
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/profile-photo-upload-complete/")
+def profile_photo_upload_complete(user_id: UUID, db: Session = Depends(get_db)):
+    """
+    Called by the client once its pre-signed profile photo PUT has finished.
+    Queues thumbnail/WebP generation; the variants show up on GET /users/{user_id}.
+    """
+    if not db.query(User.id).filter(User.id == user_id).first():
+        raise HTTPException(status_code=404, detail="User not found")
+
+    object_key = profile_photo_key(user_id)
+    queued = image_derivatives.schedule_profile_variants(object_key, user_id=user_id)
+    return {"queued": queued, "variants": image_derivatives.variant_keys(object_key)}
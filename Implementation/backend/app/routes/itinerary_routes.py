@@ -1,21 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, Header
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session, joinedload, load_only
 from app.db.db import get_db  # ✅ Import database session from db.py
 from app.models.itinerary_models import Itinerary, ItineraryDay, Activity, ItineraryMember
 from app.schemas import itinerary_schema
 from app.schemas.itinerary_detail_schema import ItineraryDetailResponseSchema
-from typing import List
+from typing import List, Optional
 import uuid
 from sqlalchemy.sql import func
 from datetime import datetime
 from uuid import UUID
-from urllib.parse import urlparse
-from app.aws.s3_client import s3_client, AWS_BUCKET_NAME
-
-
-def extract_key(url: str) -> str:
-    parsed = urlparse(url)
-    return parsed.path.lstrip('/')
+from app.config.config import settings
+from app.services.itinerary_projection import (
+    SUMMARY_FIELDS,
+    etag_matches,
+    itinerary_detail_cache,
+    itinerary_etag,
+    to_itinerary_detail,
+    to_itinerary_summaries,
+)
+from app.services.image_derivatives import schedule_missing_itinerary_variants
+from app.services.itinerary_service import (
+    apply_activity_batch,
+    format_activity_time,
+    itinerary_edit,
+    reorder_itinerary_days,
+)
+from app.services.pagination import decode_cursor, encode_cursor
 
 
 itinerary_router = APIRouter()
@@ -42,60 +55,44 @@ def create_itinerary(itinerary: itinerary_schema.ItineraryCreate, db: Session =
     return new_itinerary
 
 @itinerary_router.get("/{itinerary_id}", response_model=ItineraryDetailResponseSchema)
-def get_itinerary(itinerary_id: str, db: Session = Depends(get_db)):
-    itinerary = db.query(Itinerary).filter(Itinerary.id == itinerary_id).first()
-    if not itinerary:
+def get_itinerary(
+    itinerary_id: str,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
+    # ✅ Version check first: one indexed lookup of (id, updated_at), no days/activities yet
+    version = db.query(Itinerary.id, Itinerary.updated_at).filter(Itinerary.id == itinerary_id).first()
+    if not version:
         raise HTTPException(status_code=404, detail="Itinerary not found")
 
-    itinerary_days = (
-        db.query(ItineraryDay)
-        .filter(ItineraryDay.itinerary_id == itinerary_id)
-        .order_by(ItineraryDay.order_index)
-        .all()
-    )
-
-    extra_data = itinerary.extra_data or {}
-    if "image_url" in extra_data:
-        key = extract_key(extra_data["image_url"])
-        presigned_get_url = s3_client.generate_presigned_url(
-            "get_object",
-            Params={"Bucket": AWS_BUCKET_NAME, "Key": key},
-            ExpiresIn=3600,  # URL valid for 1 hour
+    etag = itinerary_etag(version.id, version.updated_at)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    content = itinerary_detail_cache.get(etag) if settings.ITINERARY_DETAIL_CACHE_ENABLED else None
+    if content is None:
+        # ✅ Load itinerary + days in one query and all activities in a second (no per-day queries)
+        itinerary = (
+            db.query(Itinerary)
+            .options(joinedload(Itinerary.days).selectinload(ItineraryDay.activities))
+            .filter(Itinerary.id == itinerary_id)
+            .first()
         )
-        extra_data["image_url"] = presigned_get_url
+        if not itinerary:
+            raise HTTPException(status_code=404, detail="Itinerary not found")
 
-    return ItineraryDetailResponseSchema(
-        id=itinerary.id,
-        name=itinerary.name,
-        destination=itinerary.destination,
-        start_date=itinerary.start_date,
-        end_date=itinerary.end_date,
-        created_by=itinerary.created_by,
-        updated_at=itinerary.updated_at,
-        last_updated_by=itinerary.last_updated_by,
-        budget=itinerary.budget,
-        extra_data=extra_data,
-        days=[
-            {
-                "id": day.id,
-                "date": day.date,
-                "title": day.title,
-                "activities": [
-                    {
-                        "id": activity.id,
-                        "time": activity.time,
-                        "name": activity.name,
-                        "location": activity.location,
-                        "estimated_cost": activity.estimated_cost if activity.estimated_cost is not None else 0, 
-                    }
-                    for activity in db.query(Activity)
-                        .filter(Activity.itinerary_day_id == day.id)
-                        .all()
-                ],
-            }
-            for day in itinerary_days
-        ],
-    )
+        # ✅ Covers uploaded before derivatives existed get their variants generated in the background
+        schedule_missing_itinerary_variants([itinerary])
+
+        # Re-derive the tag from the row actually serialized, in case it changed since the version check
+        etag = itinerary_etag(itinerary.id, itinerary.updated_at)
+        headers["ETag"] = etag
+        content = jsonable_encoder(to_itinerary_detail(itinerary))
+        if settings.ITINERARY_DETAIL_CACHE_ENABLED:
+            itinerary_detail_cache.set(etag, content)
+
+    return JSONResponse(content=content, headers=headers)
 
 
 
@@ -108,10 +105,6 @@ def add_day_to_itinerary(
     db: Session = Depends(get_db),
     x_user_id: str = Header(..., alias="X-User-Id")
 ):
-    itinerary = db.query(Itinerary).filter(Itinerary.id == itinerary_id).first()
-    if not itinerary:
-        raise HTTPException(status_code=404, detail="Itinerary not found")
-
     max_order = db.query(func.max(ItineraryDay.order_index)).filter(ItineraryDay.itinerary_id == itinerary_id).scalar()
     new_order_index = (max_order + 1) if max_order is not None else 0
 
@@ -123,14 +116,9 @@ def add_day_to_itinerary(
         order_index=new_order_index
     )
 
-    db.add(new_day)
-    db.commit()
-    db.refresh(new_day)
-
-    # Update itinerary metadata
-    itinerary.updated_at = datetime.utcnow()
-    itinerary.last_updated_by = x_user_id
-    db.commit()
+    # ✅ Day insert + itinerary metadata bump in one transaction (404 if the itinerary is missing)
+    with itinerary_edit(db, itinerary_id, x_user_id):
+        db.add(new_day)
 
     return new_day
 
@@ -151,19 +139,10 @@ def add_activity(
     if not day:
         raise HTTPException(status_code=404, detail="Itinerary day not found")
 
-    def format_time(time_str):
-        try:
-            return datetime.strptime(time_str, "%I%p").strftime("%I:%M %p")
-        except ValueError:
-            try:
-                return datetime.strptime(time_str, "%I:%M%p").strftime("%I:%M %p")
-            except ValueError:
-                return time_str
-
     new_activity = Activity(
         id=uuid.uuid4(),
         itinerary_day_id=day_id,
-        time=format_time(activity.time),
+        time=format_activity_time(activity.time),
         name=activity.name,
         location=activity.location,
         notes=activity.notes if activity.notes else "",
@@ -172,20 +151,58 @@ def add_activity(
         created_at=datetime.utcnow(),
     )
 
-    db.add(new_activity)
-    db.commit()
-    db.refresh(new_activity)
-
-    # Update itinerary metadata:
-    itinerary = db.query(Itinerary).filter(Itinerary.id == itinerary_id).first()
-    if itinerary:
-        itinerary.updated_at = datetime.utcnow()
-        itinerary.last_updated_by = x_user_id
-        db.commit()
+    # ✅ Activity insert + itinerary metadata bump in one transaction
+    with itinerary_edit(db, itinerary_id, x_user_id):
+        db.add(new_activity)
 
     return new_activity
 
 
+def _activity_batch_response(results, updated_at) -> itinerary_schema.ActivityBatchResponse:
+    applied = sum(1 for result in results if result.status == "ok")
+    return itinerary_schema.ActivityBatchResponse(
+        results=results,
+        applied=applied,
+        failed=len(results) - applied,
+        updated_at=updated_at,
+    )
+
+
+@itinerary_router.post("/{itinerary_id}/activities/batch", response_model=itinerary_schema.ActivityBatchResponse)
+def batch_activities(
+    itinerary_id: uuid.UUID,
+    batch: itinerary_schema.ActivityBatchRequest,
+    db: Session = Depends(get_db),
+    x_user_id: str = Header(..., alias="X-User-Id")
+):
+    """
+    ✅ Applies a list of activity create/update/delete operations across the itinerary in one
+    transaction (e.g. syncing offline edits). Each operation gets its own result; invalid ones are skipped.
+    """
+    results, updated_at = apply_activity_batch(db, itinerary_id, batch.operations, x_user_id)
+    return _activity_batch_response(results, updated_at)
+
+
+@itinerary_router.post("/{itinerary_id}/days/{day_id}/activities/batch", response_model=itinerary_schema.ActivityBatchResponse)
+def batch_day_activities(
+    itinerary_id: uuid.UUID,
+    day_id: uuid.UUID,
+    batch: itinerary_schema.ActivityBatchRequest,
+    db: Session = Depends(get_db),
+    x_user_id: str = Header(..., alias="X-User-Id")
+):
+    """
+    ✅ Same as the itinerary batch, scoped to this day: creates default to it, and operations on
+    activities of other days (or moving activities out of it) fail as not found.
+    """
+    operations = [
+        op.model_copy(update={"day_id": day_id}) if op.op == "create" and op.day_id is None else op
+        for op in batch.operations
+    ]
+    results, updated_at = apply_activity_batch(db, itinerary_id, operations, x_user_id, day_id=day_id)
+    return _activity_batch_response(results, updated_at)
+
+
 # -------------------- Itinerary Member Routes (For Collaboration) --------------------
 
 @itinerary_router.post("/{itinerary_id}/members/", response_model=itinerary_schema.ItineraryMemberResponse)
@@ -221,53 +238,86 @@ def get_itinerary_members(itinerary_id: uuid.UUID, db: Session = Depends(get_db)
         raise HTTPException(status_code=404, detail="No members found for this itinerary")
     return members
 
+def _parse_fields(fields: Optional[str]):
+    if not fields:
+        return None
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in SUMMARY_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return requested
+
+
+def list_user_itineraries(db: Session, user_id: str, limit: int, cursor: Optional[str] = None, fields=None):
+    """
+    ✅ Keyset page of a user's itineraries ordered by (updated_at, id) desc, served by
+    ix_itineraries_created_by_updated_at. Returns (itineraries, next_cursor).
+    """
+    query = db.query(Itinerary).filter(Itinerary.created_by == user_id)
+    if cursor:
+        cursor_updated_at, cursor_id = decode_cursor(cursor)
+        query = query.filter(tuple_(Itinerary.updated_at, Itinerary.id) < tuple_(cursor_updated_at, cursor_id))
+    if fields is not None:
+        # ✅ Only read the requested columns (plus the cursor columns)
+        columns = set(fields) | {"id", "updated_at"}
+        query = query.options(load_only(*[getattr(Itinerary, column) for column in columns]))
+
+    itineraries = (
+        query.order_by(Itinerary.updated_at.desc(), Itinerary.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    next_cursor = None
+    if len(itineraries) > limit:
+        next_cursor = encode_cursor(itineraries[limit - 1].updated_at, itineraries[limit - 1].id)
+    return itineraries[:limit], next_cursor
+
+
 @itinerary_router.get("/users/{user_id}/itineraries", response_model=List[itinerary_schema.ItinerarySchema])
-def get_user_itineraries(user_id: str, db: Session = Depends(get_db)):
+def get_user_itineraries(
+    user_id: str,
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's X-Next-Cursor header"),
+    fields: Optional[str] = Query(None, description="Comma-separated subset of itinerary fields to return"),
+    db: Session = Depends(get_db),
+):
     """
-    ✅ Fetches all itineraries for a specific user.
+    ✅ Fetches a page of itineraries for a specific user, most recently updated first.
+    The cursor for the next page is returned in the `X-Next-Cursor` header.
     """
-    itineraries = db.query(Itinerary).filter(Itinerary.created_by == user_id).all()
+    requested_fields = _parse_fields(fields)
+    itineraries, next_cursor = list_user_itineraries(db, user_id, limit, cursor, requested_fields)
+
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    if requested_fields is not None:
+        return JSONResponse(
+            content=jsonable_encoder(to_itinerary_summaries(itineraries, requested_fields)),
+            headers=headers,
+        )
 
-    if not itineraries:
-        return []  # ✅ Instead of 404, return an empty list if no itineraries exist.
-    
-    for itinerary in itineraries:
-        if itinerary.extra_data and "image_url" in itinerary.extra_data:
-            key = extract_key(itinerary.extra_data["image_url"])
-            presigned_url = s3_client.generate_presigned_url(
-                "get_object",
-                Params={"Bucket": AWS_BUCKET_NAME, "Key": key},
-                ExpiresIn=3600  # URL valid for 1 hour
-            )
-            itinerary.extra_data["image_url"] = presigned_url
-
-    return itineraries
+    response.headers.update(headers)
+    return to_itinerary_summaries(itineraries)  # ✅ Empty list (not 404) if no itineraries exist.
 
 @itinerary_router.patch("/{itinerary_id}/days/reorder", response_model=dict)
-def reorder_days(itinerary_id: str, reorder_request: itinerary_schema.ReorderDaysRequest, db: Session = Depends(get_db)):
+def reorder_days(
+    itinerary_id: uuid.UUID,
+    reorder_request: itinerary_schema.ReorderDaysRequest,
+    db: Session = Depends(get_db),
+    x_user_id: Optional[str] = Header(None, alias="X-User-Id")
+):
     """
     ✅ Updates the order of days inside an itinerary.
+    Pass the itinerary's `updated_at` to reject the reorder (409) if someone else edited it meanwhile.
     """
-    try:
-        # Validate that all provided days exist
-        day_ids = [d.id for d in reorder_request.days]
-        days = db.query(ItineraryDay).filter(ItineraryDay.id.in_(day_ids)).all()
-
-        if len(days) != len(day_ids):
-            raise HTTPException(status_code=400, detail="One or more day IDs are invalid.")
-
-        # ✅ Update order_index based on frontend request
-        for item in reorder_request.days:
-            day = next((d for d in days if d.id == item.id), None)
-            if day:
-                day.order_index = item.order_index
-
-        db.commit()
-        return {"message": "Days reordered successfully"}
-
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=500, detail=str(e))
+    updated_at = reorder_itinerary_days(
+        db,
+        itinerary_id,
+        reorder_request.days,
+        user_id=x_user_id,
+        expected_updated_at=reorder_request.updated_at,
+    )
+    return {"message": "Days reordered successfully", "updated_at": updated_at}
 
 @itinerary_router.get("/{itinerary_id}/days/{day_id}", response_model=itinerary_schema.ItineraryDayResponse)
 def get_day_activities(itinerary_id: uuid.UUID, day_id: uuid.UUID, db: Session = Depends(get_db)):
@@ -348,15 +398,8 @@ def delete_itinerary_day(
     if not day:
         raise HTTPException(status_code=404, detail="Itinerary day not found")
 
-    db.delete(day)
-    db.commit()
-
-    # Update itinerary metadata:
-    itinerary = db.query(Itinerary).filter(Itinerary.id == itinerary_id).first()
-    if itinerary:
-        itinerary.updated_at = datetime.utcnow()
-        itinerary.last_updated_by = x_user_id
-        db.commit()
+    with itinerary_edit(db, itinerary_id, x_user_id):
+        db.delete(day)
 
     return {"message": "Itinerary day deleted successfully"}
 
@@ -406,10 +449,6 @@ def update_itinerary_day(
     db: Session = Depends(get_db),
     x_user_id: str = Header(..., alias="X-User-Id")
 ):
-    itinerary = db.query(Itinerary).filter(Itinerary.id == itinerary_id).first()
-    if not itinerary:
-        raise HTTPException(status_code=404, detail="Itinerary not found")
-    
     day = db.query(ItineraryDay).filter(
         ItineraryDay.id == day_id, 
         ItineraryDay.itinerary_id == itinerary_id
@@ -417,15 +456,9 @@ def update_itinerary_day(
     if not day:
         raise HTTPException(status_code=404, detail="Itinerary day not found")
     
-    day.title = updated_day.title
-    day.date = updated_day.date
-    db.commit()
-    db.refresh(day)
-
-    # Update itinerary metadata:
-    itinerary.updated_at = datetime.utcnow()
-    itinerary.last_updated_by = x_user_id
-    db.commit()
+    with itinerary_edit(db, itinerary_id, x_user_id):
+        day.title = updated_day.title
+        day.date = updated_day.date
 
     return day
 
@@ -449,15 +482,8 @@ def delete_activity(
     if not activity:
         raise HTTPException(status_code=404, detail="Activity not found")
 
-    db.delete(activity)
-    db.commit()
-
-    # Update itinerary metadata:
-    itinerary = db.query(Itinerary).filter(Itinerary.id == itinerary_id).first()
-    if itinerary:
-        itinerary.updated_at = datetime.utcnow()
-        itinerary.last_updated_by = x_user_id
-        db.commit()
+    with itinerary_edit(db, itinerary_id, x_user_id):
+        db.delete(activity)
 
     return {"detail": "Activity deleted successfully."}
 
@@ -486,17 +512,9 @@ def update_activity(
         raise HTTPException(status_code=404, detail="Activity not found")
 
     update_data = activity_update.dict(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(activity, key, value)
-
-    db.commit()
-    db.refresh(activity)
-
-    itinerary = db.query(Itinerary).filter(Itinerary.id == itinerary_id).first()
-    if itinerary:
-        itinerary.updated_at = datetime.utcnow()
-        itinerary.last_updated_by = x_user_id
-        db.commit()
+    with itinerary_edit(db, itinerary_id, x_user_id):
+        for key, value in update_data.items():
+            setattr(activity, key, value)
 
     return {
     "id": str(activity.id),  # ✅ Convert UUID to string
@@ -515,22 +533,6 @@ def get_recent_user_itineraries(user_id: str, db: Session = Depends(get_db)):
     """
     ✅ Returns only the 3 most recent itineraries for the given user, with presigned image URLs if available.
     """
-    itineraries = (
-        db.query(Itinerary)
-        .filter(Itinerary.created_by == user_id)
-        .order_by(Itinerary.updated_at.desc())  # Sort by most recently updated
-        .limit(3)
-        .all()
-    )
+    itineraries, _ = list_user_itineraries(db, user_id, limit=3)  # ✅ First page of the paginated listing
 
-    for itinerary in itineraries:
-        if itinerary.extra_data and "image_url" in itinerary.extra_data:
-            key = extract_key(itinerary.extra_data["image_url"])
-            presigned_url = s3_client.generate_presigned_url(
-                "get_object",
-                Params={"Bucket": AWS_BUCKET_NAME, "Key": key},
-                ExpiresIn=3600  # URL valid for 1 hour
-            )
-            itinerary.extra_data["image_url"] = presigned_url
-
-    return itineraries
+    return to_itinerary_summaries(itineraries)
@@ -1,27 +1,54 @@
-import requests
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from app.db.db import get_db
-from app.models.place_model import Place
 from app.schemas.place_schema import PlaceResponse
-from datetime import datetime, timezone
+from app.services.place_service import TRAVEL_STYLE_MAPPING, find_places_within, place_to_dict, upsert_places
+from app.services.geo import haversine_m
+from app.services.place_cache import tile_for, get_cached_search, store_search, cache_stats
+from datetime import timezone
 from app.config.config import settings  # Secure API Key Access
 from typing import List
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+from app.services.http_client import upstream_request
+from app.services.recommendation_service import get_recommendations
 
 place_router = APIRouter()
 GOOGLE_PLACES_API_KEY = settings.GOOGLE_PLACES_API_KEY  # ✅ Secure API Key Access
 
-# ✅ Travel Style Mapping (Subcategories)
-TRAVEL_STYLE_MAPPING = {
-    "relaxation": ["park", "beach", "spa", "massage"],
-    "adventure": ["amusement_park", "zoo", "aquarium"],
-    "cultural": ["museum", "art_gallery", "historical_place", "monument"],
-    "foodie": ["restaurant", "bakery", "bar", "cafe", "coffee_shop"]
-}
+def _place_data_from_result(result: dict) -> dict:
+    types = result.get("types", [])
+    return {
+        "name": result.get("displayName", {}).get("text", "Unknown"),
+        "category": types[0] if types else "unknown",  # ✅ Use first type as category
+        "latitude": result["location"]["latitude"],
+        "longitude": result["location"]["longitude"],
+        "rating": result.get("rating"),
+        "source_api": "google_places_v3",
+        "cached_data": result
+    }
+
+def _places_near(results: list, latitude: float, longitude: float, radius_m: float) -> list:
+    """
+    ✅ Tile results narrowed to the caller's own circle, nearest first.
+    """
+    places = []
+    for result in results:
+        place = _place_data_from_result(result)
+        distance = haversine_m(latitude, longitude, place["latitude"], place["longitude"])
+        if distance <= radius_m:
+            places.append((distance, place))
+    places.sort(key=lambda item: item[0])
+    return [place for _, place in places]
+
+def _store_and_upsert(db: Session, cache_key: str, data: dict, places: list):
+    store_search(db, cache_key, data)
+    # ✅ Single batched upsert; duplicates refresh rating/cached_data instead of being skipped
+    upsert_places(db, places)
+    db.commit()
 
 @place_router.get("/search")
-def search_places(
+async def search_places(
     location: str = Query(...),
     radius: int = Query(100),  # ✅ Set default radius to 100 meters
     travel_style: str = Query(None),
@@ -37,23 +64,29 @@ def search_places(
         print(f"🎯 Travel Style: {travel_style}")
 
         place_types = TRAVEL_STYLE_MAPPING[travel_style.lower()]
-        places = []
+
+        # ✅ Serve repeated nearby searches from the geo-tile cache
+        cache_key, tile_lat, tile_lon, upstream_radius = tile_for(lat, lon, radius, travel_style)
+        cached = await run_in_threadpool(get_cached_search, db, cache_key)
+        if cached is not None:
+            print(f"⚡ Tile cache hit: {cache_key}")
+            return _places_near(cached.get("places", []), lat, lon, radius)
 
         # ✅ One single API request with all includedTypes
         url = "https://places.googleapis.com/v1/places:searchNearby"
         headers = {
             "Content-Type": "application/json",
-            "X-Goog-Api-Key": GOOGLE_PLACES_API_KEY,
+            "X-Goog-Api-Key": GOOGLE_PLACES_API_KEY or "",
             "X-Goog-FieldMask": "places.displayName,places.location,places.rating,places.types"
         }
         body = {
             "locationRestriction": {
                 "circle": {
                     "center": {
-                        "latitude": lat,
-                        "longitude": lon
+                        "latitude": tile_lat,
+                        "longitude": tile_lon
                     },
-                    "radius": radius
+                    "radius": upstream_radius
                 }
             },
             "includedTypes": place_types,
@@ -61,68 +94,50 @@ def search_places(
         }
 
         # print(f"📡 API Body: {body}")  # Optional debugging
-        response = requests.post(url, headers=headers, json=body)
+        response = await upstream_request("google_places", "POST", url, headers=headers, json=body)
 
         if response.status_code != 200:
             print(f"❌ API Error: {response.status_code} - {response.text}")
             raise HTTPException(status_code=500, detail=f"Google API Error: {response.text}")
 
         data = response.json()
+        places = [_place_data_from_result(result) for result in data.get("places", [])]
+
+        # ✅ DB work runs off the event loop (the whole tile is cached and stored)
+        await run_in_threadpool(_store_and_upsert, db, cache_key, data, places)
 
-        for result in data.get("places", []):
-            name = result.get("displayName", {}).get("text", "Unknown")
-            latitude = result["location"]["latitude"]
-            longitude = result["location"]["longitude"]
-            rating = result.get("rating")
-            types = result.get("types", [])
-            category = types[0] if types else "unknown"  # ✅ Use first type as category
-
-            place_data = {
-                "name": name,
-                "category": category,
-                "latitude": latitude,
-                "longitude": longitude,
-                "rating": rating,
-                "source_api": "google_places_v3",
-                "cached_data": result
-            }
-
-            # ✅ Save to DB
-            place_record = Place(
-                name=place_data["name"],
-                category=place_data["category"],
-                latitude=place_data["latitude"],
-                longitude=place_data["longitude"],
-                rating=place_data["rating"],
-                source_api=place_data["source_api"],
-                cached_data=place_data["cached_data"],
-                last_updated=datetime.utcnow()
-            )
-            existing_place = db.query(Place).filter(
-                Place.name == place_data["name"],
-                Place.latitude == place_data["latitude"],
-                Place.longitude == place_data["longitude"]
-            ).first()
-
-            if existing_place:
-                print(f"⚠️ Skipping duplicate place: {place_data['name']}")
-                continue
-
-            db.add(place_record)
-
-            # ✅ Return value to frontend
-            places.append(place_data)
-
-        # ✅ Commit after the loop
-        db.commit()
-
-
-        return places
+        return _places_near(data.get("places", []), lat, lon, radius)
 
     except Exception as e:
         print(f"❌ Internal Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@place_router.get("/cache/stats")
+def get_places_cache_stats():
+    """
+    ✅ Hit/miss counters for the Google Places tile cache on this worker.
+    """
+    return cache_stats()
+
+@place_router.get("/recommended")
+def get_recommended_places(
+    location: str = Query(..., description="Latitude,Longitude as a comma-separated string"),
+    travel_style: str = Query(...),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """
+    ✅ Ranked places for the geohash cell around `location`, from the precomputed recommendation feed.
+    """
+    if travel_style.lower() not in TRAVEL_STYLE_MAPPING:
+        raise HTTPException(status_code=400, detail="Invalid travel style")
+    try:
+        lat, lon = map(float, location.split(","))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid location")
+
+    return get_recommendations(db, lat, lon, travel_style, limit)
+
 @place_router.get("/cached")
 def get_cached_places(
     location: str = Query(...),
@@ -133,31 +148,13 @@ def get_cached_places(
     try:
         lat, lon = map(float, location.split(","))
 
-        db_places = db.query(Place).all()
-        filtered = []
-
-        for place in db_places:
-            # Basic radius filter (approximate)
-            distance = ((place.latitude - lat) ** 2 + (place.longitude - lon) ** 2) ** 0.5
-            within_radius = distance <= radius / 111_000  # Convert meters to degrees
-
-            # ✅ Filter by travel style mapped types
-            matches_style = True
-            if travel_style and travel_style.lower() in TRAVEL_STYLE_MAPPING:
-                matches_style = place.category in TRAVEL_STYLE_MAPPING[travel_style.lower()]
+        # ✅ Filter by travel style mapped types (pushed into SQL)
+        categories = None
+        if travel_style and travel_style.lower() in TRAVEL_STYLE_MAPPING:
+            categories = TRAVEL_STYLE_MAPPING[travel_style.lower()]
 
-            if within_radius and matches_style:
-                filtered.append({
-                    "name": place.name,
-                    "category": place.category,
-                    "latitude": place.latitude,
-                    "longitude": place.longitude,
-                    "rating": place.rating,
-                    "source_api": place.source_api,
-                    "cached_data": place.cached_data
-                })
-
-        return filtered
+        db_places = find_places_within(db, lat, lon, radius, categories=categories)
+        return [place_to_dict(place) for place in db_places]
 
     except Exception as e:
         print(f"❌ Internal Error: {e}")
@@ -171,42 +168,10 @@ def get_filtered_places(
 ):
     try: 
         lat, lon = map(float, location.split(","))
-        db_places = db.query(Place).all()
         allowed_categories = {"park", "bar", "museum"}
-        filtered = []
-
-        for place in db_places:
-            # Basic approximate radius filter (converting meters to degrees ~111,000 m/degree)
-            distance = ((place.latitude - lat) ** 2 + (place.longitude - lon) ** 2) ** 0.5
-            within_radius = distance <= radius / 111000
-
-            if within_radius:
-                # First, check top-level category
-                cat = place.category.lower() if place.category else ""
-                if cat in allowed_categories:
-                    filtered.append({
-                        "name": place.name,
-                        "category": place.category,
-                        "latitude": place.latitude,
-                        "longitude": place.longitude,
-                        "rating": place.rating,
-                        "source_api": place.source_api,
-                        "cached_data": place.cached_data
-                    })
-                # Otherwise, check if any of the cached_data.types match allowed categories
-                # elif place.cached_data and "types" in place.cached_data:
-                #     types_lower = [t.lower() for t in place.cached_data.get("types", [])]
-                #     if any(t in allowed_categories for t in types_lower):
-                #         filtered.append({
-                #             "name": place.name,
-                #             "category": place.category,
-                #             "latitude": place.latitude,
-                #             "longitude": place.longitude,
-                #             "rating": place.rating,
-                #             "source_api": place.source_api,
-                #             "cached_data": place.cached_data
-                #         })
-        return filtered
+
+        db_places = find_places_within(db, lat, lon, radius, categories=allowed_categories)
+        return [place_to_dict(place) for place in db_places]
     except Exception as e:
         print(f"Internal Error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
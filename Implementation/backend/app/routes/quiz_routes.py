@@ -1,4 +1,7 @@
+import uuid
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.db.db import get_db
 from app.models import quiz_model
@@ -6,26 +9,26 @@ from app.schemas import quiz_schema
 
 quiz_router = APIRouter()
 
-# ✅ Create or update quiz result
+# ✅ Create or update quiz result (one `INSERT ... ON CONFLICT DO UPDATE`, guarded by uq_quiz_results_user_id)
 @quiz_router.post("/", response_model=quiz_schema.QuizResultResponse)
 def create_or_update_quiz_result(quiz_result: quiz_schema.QuizResultCreate, db: Session = Depends(get_db)):
-    existing_result = db.query(quiz_model.QuizResult).filter(quiz_model.QuizResult.user_id == quiz_result.user_id).first()
-
-    if existing_result:
-        existing_result.travel_style = quiz_result.travel_style
-        db.commit()
-        db.refresh(existing_result)
-        return existing_result  
-
-    db_quiz_result = quiz_model.QuizResult(**quiz_result.dict())
-    db.add(db_quiz_result)
+    stmt = pg_insert(quiz_model.QuizResult).values(id=uuid.uuid4(), **quiz_result.model_dump())
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[quiz_model.QuizResult.user_id],
+        set_={"travel_style": stmt.excluded.travel_style},
+    ).returning(quiz_model.QuizResult.id, quiz_model.QuizResult.user_id, quiz_model.QuizResult.travel_style)
+    try:
+        result = db.execute(stmt).one()
+    except IntegrityError:
+        # Foreign key: the user doesn't exist
+        db.rollback()
+        raise HTTPException(status_code=404, detail="User not found")
     db.commit()
-    db.refresh(db_quiz_result)
-    return db_quiz_result
+    return result
 
 # ✅ Retrieve quiz result based on user_id
 @quiz_router.get("/user/{user_id}", response_model=quiz_schema.QuizResultResponse)
-def get_quiz_result_by_user_id(user_id: int, db: Session = Depends(get_db)):
+def get_quiz_result_by_user_id(user_id: uuid.UUID, db: Session = Depends(get_db)):
     quiz_result = db.query(quiz_model.QuizResult).filter(quiz_model.QuizResult.user_id == user_id).first()
     if not quiz_result:
         raise HTTPException(status_code=404, detail="Quiz result not found")
@@ -33,7 +36,7 @@ def get_quiz_result_by_user_id(user_id: int, db: Session = Depends(get_db)):
 
 # ✅ Update quiz result for a user (Using `QuizResultUpdate`)
 @quiz_router.put("/user/{user_id}")
-def update_quiz_result(user_id: int, quiz_update: quiz_schema.QuizResultUpdate, db: Session = Depends(get_db)):
+def update_quiz_result(user_id: uuid.UUID, quiz_update: quiz_schema.QuizResultUpdate, db: Session = Depends(get_db)):
     quiz_result = db.query(quiz_model.QuizResult).filter(quiz_model.QuizResult.user_id == user_id).first()
 
     if not quiz_result:
@@ -1,53 +1,64 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session, joinedload
 from app.db.db import get_db
 from app.models.user_favorite_model import UserFavorite
-from app.schemas.user_favorite_schema import UserFavoriteCreate, UserFavoriteResponse
-from app.models.user_model import User
-from app.models.place_model import Place
-from datetime import datetime, timezone
+from app.schemas.user_favorite_schema import (
+    UserFavoriteBatchRequest,
+    UserFavoriteBatchResponse,
+    UserFavoriteCreate,
+    UserFavoriteResponse,
+    UserFavoriteWithPlaceResponse,
+)
+from app.services import favorite_service
+from app.services.pagination import decode_cursor, encode_cursor
+from typing import List, Optional
+from uuid import UUID
 
 # ========== USER FAVORITE ROUTES ==========
 user_favorite_router = APIRouter()
 
 @user_favorite_router.post("/", response_model=UserFavoriteResponse)
 def add_favorite(favorite: UserFavoriteCreate, db: Session = Depends(get_db)):
-    # Check if user exists
-    user = db.query(User).filter(User.id == favorite.user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    # Check if place exists
-    place = db.query(Place).filter(Place.id == favorite.place_id).first()
-    if not place:
-        raise HTTPException(status_code=404, detail="Place not found")
-
-    # Check if already favorited
-    existing_favorite = db.query(UserFavorite).filter(
-        UserFavorite.user_id == favorite.user_id,
-        UserFavorite.place_id == favorite.place_id
-    ).first()
-    if existing_favorite:
-        raise HTTPException(status_code=400, detail="Place already in favorites")
-
-    # Add to favorites
-    db_favorite = UserFavorite(
-        user_id=favorite.user_id,
-        place_id=favorite.place_id,
-        added_at=datetime.now(timezone.utc).replace(tzinfo=None)  # Ensure UTC storage
+    # ✅ Single insert guarded by the (user_id, place_id) unique index; FK errors mean user/place is missing
+    return favorite_service.add_favorite(db, favorite.user_id, favorite.place_id)
+
+@user_favorite_router.post("/batch", response_model=UserFavoriteBatchResponse)
+def batch_favorites(batch: UserFavoriteBatchRequest, db: Session = Depends(get_db)):
+    """
+    ✅ Adds and removes many favorites (by place id) for a user in one transaction.
+    """
+    return favorite_service.apply_favorites_batch(db, batch.user_id, batch.add, batch.remove)
+
+
+@user_favorite_router.get("/{user_id}", response_model=List[UserFavoriteWithPlaceResponse])
+def get_user_favorites(
+    user_id: UUID,
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's X-Next-Cursor header"),
+    db: Session = Depends(get_db),
+):
+    """
+    ✅ A page of the user's favorites with their place joined in (one query), newest first.
+    The cursor for the next page is returned in the `X-Next-Cursor` header.
+    """
+    query = (
+        db.query(UserFavorite)
+        .options(joinedload(UserFavorite.place, innerjoin=True))
+        .filter(UserFavorite.user_id == user_id)
     )
-    db.add(db_favorite)
-    db.commit()
-    db.refresh(db_favorite)
-    return db_favorite
+    if cursor:
+        cursor_added_at, cursor_id = decode_cursor(cursor)
+        query = query.filter(tuple_(UserFavorite.added_at, UserFavorite.id) < tuple_(cursor_added_at, cursor_id))
 
-@user_favorite_router.get("/{user_id}", response_model=list[UserFavoriteResponse])
-def get_user_favorites(user_id: int, db: Session = Depends(get_db)):
-    favorites = db.query(UserFavorite).filter(UserFavorite.user_id == user_id).all()
-    return favorites
+    favorites = query.order_by(UserFavorite.added_at.desc(), UserFavorite.id.desc()).limit(limit + 1).all()
+    if len(favorites) > limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(favorites[limit - 1].added_at, favorites[limit - 1].id)
+    return favorites[:limit]
 
 @user_favorite_router.delete("/{favorite_id}")
-def remove_favorite(favorite_id: int, db: Session = Depends(get_db)):
+def remove_favorite(favorite_id: UUID, db: Session = Depends(get_db)):
     favorite = db.query(UserFavorite).filter(UserFavorite.id == favorite_id).first()
     if not favorite:
         raise HTTPException(status_code=404, detail="Favorite not found")
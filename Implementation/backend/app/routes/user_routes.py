@@ -5,6 +5,7 @@ from app.db.db import get_db
 from app.models.user_model import User
 from app.models.travel_style_model import TravelStyle  # ✅ Ensure this model exists
 from app.schemas.user_schema import UserCreate, UserResponse, UpdateTravelStyle
+from app.services import image_derivatives
 from passlib.context import CryptContext  # ✅ Import Password Hashing
 from uuid import UUID
 
@@ -48,11 +49,15 @@ def get_user(user_id: UUID, db: Session = Depends(get_db)):
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
+    # ✅ Profile photo variants whose generation failed are retried in the background after a backoff
+    image_derivatives.schedule_failed_profile_variants(user)
+
     return {
         "id": user.id,
         "name": user.name,
         "email": user.email,
-        "travel_style_id": user.travel_style_id  # ✅ No longer relying on quiz_results
+        "travel_style_id": user.travel_style_id,  # ✅ No longer relying on quiz_results
+        "profile_photo_variants": image_derivatives.profile_variant_urls(user.profile_photo_variants),
     }
 
 # ✅ NEW: Get user's travel style details
@@ -1,10 +1,11 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Dict
+from typing import Dict, Optional
 
 class APICacheResponse(BaseModel):
     id: int
     source: str
+    cache_key: Optional[str] = None
     data: Dict
     fetched_at: datetime
     
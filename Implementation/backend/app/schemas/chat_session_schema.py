@@ -0,0 +1,34 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+class ChatSessionCreate(BaseModel):
+    user_id: UUID
+    travel_style: str
+
+class ChatSessionResponse(ChatSessionCreate):
+    id: UUID
+    summary: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class ChatMessageCreate(BaseModel):
+    user_message: str
+
+class ChatMessageResponse(BaseModel):
+    id: UUID
+    role: str
+    content: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class ChatTurnResponse(BaseModel):
+    response: str
+    usage: Dict[str, int]  # Upstream token usage for this turn (prompt stays bounded by the context budget)
+    places: List[Dict[str, Any]] = []  # Candidate places named in the answer, for linking
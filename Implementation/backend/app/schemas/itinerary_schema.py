@@ -1,7 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from uuid import UUID
-from typing import List, Optional, Dict, Any
+from typing import List, Literal, Optional, Dict, Any
 
 # -------------------- Activity Schema --------------------
 
@@ -110,6 +110,7 @@ class ReorderDayItem(BaseModel):
 
 class ReorderDaysRequest(BaseModel):
     days: List[ReorderDayItem]
+    updated_at: Optional[datetime] = None  # Itinerary version the client saw; 409 if it changed since
 
 class ActivityUpdateSchema(BaseModel):
     time: Optional[str]
@@ -129,3 +130,36 @@ class ActivityResponseSchema(BaseModel):
 
     class Config:
         from_attributes = True
+
+# -------------------- Activity Batch Schema --------------------
+
+ACTIVITY_BATCH_MAX_OPERATIONS = 500
+
+class ActivityBatchOperation(BaseModel):
+    op: Literal["create", "update", "delete"]
+    activity_id: Optional[UUID] = None  # Required for update / delete
+    day_id: Optional[UUID] = None  # Required for create; on update, moves the activity to that day
+    client_ref: Optional[str] = None  # Echoed back so the client can match offline-created activities
+    time: Optional[str] = None
+    name: Optional[str] = None
+    location: Optional[str] = None
+    notes: Optional[str] = None
+    estimated_cost: Optional[float] = None
+    extra_data: Optional[dict] = None
+
+class ActivityBatchRequest(BaseModel):
+    operations: List[ActivityBatchOperation] = Field(..., max_length=ACTIVITY_BATCH_MAX_OPERATIONS)
+
+class ActivityBatchResult(BaseModel):
+    index: int
+    op: str
+    status: Literal["ok", "error"]
+    activity_id: Optional[UUID] = None
+    client_ref: Optional[str] = None
+    detail: Optional[str] = None
+
+class ActivityBatchResponse(BaseModel):
+    results: List[ActivityBatchResult]
+    applied: int
+    failed: int
+    updated_at: Optional[datetime] = None
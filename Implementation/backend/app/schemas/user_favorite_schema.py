@@ -1,10 +1,11 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
+from typing import List, Optional
 from uuid import UUID  # ✅ Import UUID
 
 class UserFavoriteCreate(BaseModel):
     user_id: UUID  # ✅ Updated to UUID
-    place_id: UUID  # ✅ Updated to UUID
+    place_id: int  # ✅ Matches places.id (integer)
 
 class UserFavoriteResponse(UserFavoriteCreate):
     id: UUID  # ✅ Updated to UUID
@@ -12,3 +13,30 @@ class UserFavoriteResponse(UserFavoriteCreate):
     
     class Config:
         from_attributes = True
+
+class FavoritePlaceSchema(BaseModel):
+    id: int
+    name: str
+    category: str
+    latitude: float
+    longitude: float
+    rating: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+class UserFavoriteWithPlaceResponse(UserFavoriteResponse):
+    place: FavoritePlaceSchema  # ✅ Joined in the listing query; no per-place lookups
+
+FAVORITES_BATCH_MAX_PLACES = 200
+
+class UserFavoriteBatchRequest(BaseModel):
+    user_id: UUID
+    add: List[int] = Field(default_factory=list, max_length=FAVORITES_BATCH_MAX_PLACES)
+    remove: List[int] = Field(default_factory=list, max_length=FAVORITES_BATCH_MAX_PLACES)
+
+class UserFavoriteBatchResponse(BaseModel):
+    added: List[int]
+    already_favorited: List[int]
+    removed: List[int]
+    not_found: List[int]  # Places that don't exist (add) or weren't favorited (remove)
@@ -0,0 +1,184 @@
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from app.config.config import settings
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    ✅ Thread-safe in-process LRU cache with a per-entry time-to-live.
+    Tracks hit/miss counters so callers can expose them.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl: float = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class MemoryBackend:
+    """
+    ✅ Per-worker async cache backend on top of TTLCache.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key):
+        return self._cache.get(key)
+
+    async def set(self, key, value, ttl: float):
+        self._cache.set(key, value, ttl=ttl)
+
+
+class RedisBackend:
+    """
+    ✅ Shared async cache backend for any Redis-compatible server. Values are stored as JSON.
+    """
+
+    def __init__(self, url: str, prefix: str = "waypoint:"):
+        import redis.asyncio as redis_asyncio  # ✅ Imported only when this backend is selected
+
+        self._client = redis_asyncio.from_url(url)
+        self._prefix = prefix
+
+    async def get(self, key):
+        raw = await self._client.get(self._prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key, value, ttl: float):
+        await self._client.set(self._prefix + key, json.dumps(value), px=max(1, int(ttl * 1000)))
+
+
+def make_backend(name: str, maxsize: int, ttl: float):
+    if name == "memory":
+        return MemoryBackend(maxsize=maxsize, ttl=ttl)
+    if name == "redis":
+        return RedisBackend(settings.REDIS_URL)
+    raise ValueError(f"Unknown cache backend: {name}")
+
+
+class SWRCache:
+    """
+    ✅ Async read-through cache with stale-while-revalidate and request coalescing.
+
+    Entries are fresh for `ttl` seconds and may then be served stale for another
+    `stale_ttl` seconds while a single background refresh runs. Concurrent misses
+    for the same key share one call to `fetch`.
+    """
+
+    def __init__(self, backend, ttl: float, stale_ttl: float = 0):
+        self.backend = backend
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._inflight = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def get_or_fetch(self, key, fetch):
+        entry = await self.backend.get(key)
+        if entry is not None:
+            age = time.time() - entry["stored_at"]
+            if age < self.ttl:
+                self.hits += 1
+                return entry["value"]
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                if key not in self._inflight:
+                    self._refresh(key, fetch).add_done_callback(_log_refresh_error)
+                return entry["value"]
+
+        self.misses += 1
+        if key in self._inflight:
+            self.coalesced += 1
+        return await asyncio.shield(self._refresh(key, fetch))
+
+    async def get_fresh(self, key):
+        """
+        The cached value if it is still fresh, else None (never fetches).
+        """
+        entry = await self.backend.get(key)
+        if entry is not None and time.time() - entry["stored_at"] < self.ttl:
+            self.hits += 1
+            return entry["value"]
+        return None
+
+    async def put(self, key, value):
+        await self.backend.set(key, {"value": value, "stored_at": time.time()}, ttl=self.ttl + self.stale_ttl)
+
+    def _refresh(self, key, fetch) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_and_store(key, fetch))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return task
+
+    async def _fetch_and_store(self, key, fetch):
+        value = await fetch()
+        await self.put(key, value)
+        return value
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
+
+
+def _log_refresh_error(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        print(f"⚠️ Background cache refresh failed: {task.exception()}")
@@ -0,0 +1,116 @@
+import math
+from typing import List, Optional
+from sqlalchemy import select, union_all
+from sqlalchemy.orm import Session
+from app.config.config import settings
+from app.models.itinerary_models import Activity, Itinerary, ItineraryDay
+from app.models.place_model import Place
+from app.services.cache import TTLCache
+from app.services.place_service import TRAVEL_STYLE_MAPPING
+
+# ✅ Retrieval step for the chatbot: instead of free-form suggestions, the model chooses from
+# highly rated places we already have (and can link to), with the user's current itinerary as context.
+
+GROUNDED_MAX_TOKENS = 300
+ITINERARY_CONTEXT_ACTIVITIES = 15
+
+# ✅ Travel style -> candidate places (per worker); the places table changes slowly
+candidate_cache = TTLCache(maxsize=64, ttl=300)
+
+
+def candidate_places(db: Session, travel_style: str) -> List[dict]:
+    """
+    Top-rated places for the style's categories: one `ORDER BY rating DESC LIMIT k` per category,
+    each served by ix_places_category_rating, combined with UNION ALL.
+    """
+    categories = TRAVEL_STYLE_MAPPING.get((travel_style or "").lower())
+    if not categories:
+        return []
+    cached = candidate_cache.get(travel_style.lower())
+    if cached is not None:
+        return cached
+
+    per_category = math.ceil(settings.CHATBOT_GROUNDING_CANDIDATES / len(categories))
+    columns = (Place.id, Place.name, Place.category, Place.rating, Place.latitude, Place.longitude)
+    stmt = union_all(*[
+        select(
+            select(*columns)
+            .where(Place.category == category, Place.rating.isnot(None))
+            .order_by(Place.rating.desc())
+            .limit(per_category)
+            .subquery()
+        )
+        for category in categories
+    ])
+    rows = db.execute(stmt).all()
+    places = sorted((dict(row._mapping) for row in rows), key=lambda place: place["rating"], reverse=True)
+    places = places[: settings.CHATBOT_GROUNDING_CANDIDATES]
+    candidate_cache.set(travel_style.lower(), places)
+    return places
+
+
+def itinerary_context(db: Session, user_id) -> Optional[str]:
+    """
+    The user's most recently updated itinerary with its first few activities, as prompt text.
+    """
+    itinerary = (
+        db.query(Itinerary.id, Itinerary.name, Itinerary.destination, Itinerary.start_date, Itinerary.end_date)
+        .filter(Itinerary.created_by == user_id)
+        .order_by(Itinerary.updated_at.desc())
+        .first()
+    )
+    if itinerary is None:
+        return None
+
+    activities = (
+        db.query(ItineraryDay.title, Activity.name, Activity.location)
+        .join(Activity, Activity.itinerary_day_id == ItineraryDay.id)
+        .filter(ItineraryDay.itinerary_id == itinerary.id)
+        .order_by(ItineraryDay.order_index, Activity.created_at)
+        .limit(ITINERARY_CONTEXT_ACTIVITIES)
+        .all()
+    )
+    header = (
+        f'The traveler\'s current itinerary is "{itinerary.name}" in {itinerary.destination}, '
+        f"{itinerary.start_date:%b %d} to {itinerary.end_date:%b %d}."
+    )
+    if not activities:
+        return header
+    planned = "; ".join(
+        f"{title}: {name}" + (f" ({location})" if location else "") for title, name, location in activities
+    )
+    return f"{header} Already planned: {planned}. Suggest things that fit around these plans."
+
+
+def grounding_context(db: Session, travel_style: str, user_id=None):
+    """
+    ✅ Returns (prompt_text, candidates). prompt_text is None when there is nothing to ground on.
+    """
+    candidates = candidate_places(db, travel_style)
+    itinerary = itinerary_context(db, user_id) if user_id is not None else None
+    if not candidates and not itinerary:
+        return None, []
+
+    parts = []
+    if candidates:
+        listing = "\n".join(
+            f"- {place['name']} ({place['category'].replace('_', ' ')}, rated {place['rating']:.1f})"
+            for place in candidates
+        )
+        parts.append(
+            "Candidate places from the Waypoint database:\n"
+            f"{listing}\n"
+            "Choose from these candidates when they fit the request and refer to them by their exact name."
+        )
+    if itinerary:
+        parts.append(itinerary)
+    parts.append("Explain each choice in one sentence and keep the whole answer under 120 words.")
+    return "\n\n".join(parts), candidates
+
+
+def mentioned_places(answer: str, candidates: List[dict]) -> List[dict]:
+    """
+    Candidates the answer actually names, so the client can link them.
+    """
+    lowered = answer.lower()
+    return [place for place in candidates if place["name"].lower() in lowered]
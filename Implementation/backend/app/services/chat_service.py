@@ -0,0 +1,236 @@
+import asyncio
+import hashlib
+import json
+import re
+import threading
+from app.config.config import settings
+from app.services.cache import SWRCache, make_backend
+from app.services.http_client import get_openai_client, upstream_slot
+
+# ✅ Chat completions for the Waypointer chatbot, behind a response cache.
+# Identical prompts (after normalization) are answered from cache, and concurrent identical
+# requests share one upstream call.
+
+
+def get_system_prompt(travel_style):
+    base_prompt = "Your name is Waypointer, a travel assistant for Vancouver, British Columbia, Canada."
+    
+    style_prompts = {
+        "relaxation": "Focus on suggesting quiet, peaceful, and scenic locations like spas, beaches, and tranquil parks. Provide specific place suggestions.",
+        "adventure": "Recommend thrilling activities such as hiking, kayaking, zip-lining, and outdoor exploration. Provide specific place suggestions.",
+        "cultural": "Suggest historical sites, museums, art galleries, and local cultural experiences. Provide specific place suggestions.",
+    }
+
+    additional_prompt = "Please limit to 3 suggestions unless specified in my request. Provide specific place suggestions."
+    
+    style_message = style_prompts.get(travel_style.lower(), "Provide general travel recommendations.")
+    
+    return f"{base_prompt} {style_message} {additional_prompt}"
+
+
+class OpenAICompletionBackend:
+    async def complete(self, messages, model: str, **params) -> dict:
+        async with upstream_slot("openai"):
+            completion = await get_openai_client().chat.completions.create(model=model, messages=messages, **params)
+        usage = completion.usage
+        return {
+            "content": completion.choices[0].message.content,
+            "usage": _usage(usage),
+        }
+
+    async def stream(self, messages, model: str, usage: dict, **params):
+        """
+        Yields content deltas as they arrive; fills `usage` from the final chunk.
+        Closing the generator (e.g. on client disconnect) closes the upstream stream.
+        """
+        async with upstream_slot("openai"):
+            stream = await get_openai_client().chat.completions.create(
+                model=model,
+                messages=messages,
+                stream=True,
+                stream_options={"include_usage": True},
+                **params,
+            )
+            try:
+                async for chunk in stream:
+                    if chunk.usage:
+                        usage.update(_usage(chunk.usage))
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            finally:
+                await stream.close()
+
+
+def _usage(usage) -> dict:
+    return {
+        "prompt_tokens": usage.prompt_tokens if usage else 0,
+        "completion_tokens": usage.completion_tokens if usage else 0,
+    }
+
+
+class FakeCompletionBackend:
+    """
+    Offline stand-in for OpenAI (CHATBOT_COMPLETION_BACKEND=fake): echoes the last message after `delay`
+    seconds, or word by word every `token_delay` seconds when streaming.
+    """
+
+    def __init__(self, delay: float = 0.05, token_delay: float = 0.02):
+        self.delay = delay
+        self.token_delay = token_delay
+        self.calls = 0
+        self.tokens_streamed = 0
+
+    async def complete(self, messages, model: str, **params) -> dict:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        prompt = " ".join(message["content"] for message in messages)
+        content = f"[{model}] {messages[-1]['content']}"
+        if params.get("max_tokens"):
+            content = " ".join(content.split(" ")[: params["max_tokens"]])
+        return {
+            "content": content,
+            "usage": {"prompt_tokens": len(prompt.split()), "completion_tokens": len(content.split())},
+        }
+
+    async def stream(self, messages, model: str, usage: dict, **params):
+        result = await self.complete(messages, model, **params)
+        for index, word in enumerate(result["content"].split(" ")):
+            await asyncio.sleep(self.token_delay)
+            self.tokens_streamed += 1
+            yield word if index == 0 else " " + word
+        usage.update(result["usage"])
+
+
+_backend = None
+
+
+def get_completion_backend():
+    global _backend
+    if _backend is None:
+        _backend = FakeCompletionBackend() if settings.CHATBOT_COMPLETION_BACKEND == "fake" else OpenAICompletionBackend()
+    return _backend
+
+
+def set_completion_backend(backend):
+    """
+    Swaps the completion backend (e.g. a FakeCompletionBackend in local runs).
+    """
+    global _backend
+    _backend = backend
+
+
+chat_cache = SWRCache(
+    backend=make_backend(
+        settings.CHATBOT_CACHE_BACKEND,
+        maxsize=settings.CHATBOT_CACHE_MAX_ENTRIES,
+        ttl=settings.CHATBOT_CACHE_TTL_SECONDS,
+    ),
+    ttl=settings.CHATBOT_CACHE_TTL_SECONDS,
+)
+
+_counter_lock = threading.Lock()
+_counters = {
+    "requests": 0,
+    "upstream_calls": 0,
+    "prompt_tokens_saved": 0,
+    "completion_tokens_saved": 0,
+    "streams": 0,
+    "streams_cancelled": 0,
+}
+
+
+def _count(**deltas):
+    with _counter_lock:
+        for name, delta in deltas.items():
+            _counters[name] += delta
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+def completion_cache_key(messages, model: str, params: dict) -> str:
+    normalized = {
+        "model": model,
+        "params": params,
+        "messages": [{"role": message["role"], "content": _normalize(message["content"])} for message in messages],
+    }
+    digest = hashlib.sha256(json.dumps(normalized, sort_keys=True).encode()).hexdigest()
+    return f"chat:{digest}"
+
+
+async def cached_completion(messages, model: str = None, **params) -> dict:
+    """
+    ✅ Returns {"content", "usage"} for `messages`, from cache when an equivalent prompt
+    (same model/params, same messages up to case and whitespace) was answered recently.
+    """
+    model = model or settings.CHATBOT_MODEL
+    fetched = False
+
+    async def fetch():
+        nonlocal fetched
+        fetched = True
+        _count(upstream_calls=1)
+        return await get_completion_backend().complete(messages, model=model, **params)
+
+    _count(requests=1)
+    result = await chat_cache.get_or_fetch(completion_cache_key(messages, model, params), fetch)
+    if not fetched:  # Cache hit, or coalesced onto another request's call
+        usage = result.get("usage", {})
+        _count(
+            prompt_tokens_saved=usage.get("prompt_tokens", 0),
+            completion_tokens_saved=usage.get("completion_tokens", 0),
+        )
+    return result
+
+
+async def stream_completion(messages, model: str = None, **params):
+    """
+    ✅ Async generator of content deltas for `messages`.
+    A cached answer is replayed as a single delta; otherwise deltas are relayed from the backend as they
+    arrive and the full answer is cached once the stream completes. If the consumer stops early
+    (client disconnect), the upstream stream is closed and nothing is cached.
+    Yields (delta, None) pairs, then a final (None, usage).
+    """
+    model = model or settings.CHATBOT_MODEL
+    key = completion_cache_key(messages, model, params)
+    _count(requests=1, streams=1)
+
+    cached = await chat_cache.get_fresh(key)
+    if cached is not None:
+        usage = cached.get("usage", {})
+        _count(
+            prompt_tokens_saved=usage.get("prompt_tokens", 0),
+            completion_tokens_saved=usage.get("completion_tokens", 0),
+        )
+        yield cached["content"], None
+        yield None, usage
+        return
+
+    _count(upstream_calls=1)
+    usage, parts, completed = {}, [], False
+    stream = get_completion_backend().stream(messages, model=model, usage=usage, **params)
+    try:
+        async for delta in stream:
+            parts.append(delta)
+            yield delta, None
+        completed = True
+    finally:
+        await stream.aclose()
+        if not completed:
+            _count(streams_cancelled=1)
+
+    await chat_cache.put(key, {"content": "".join(parts), "usage": usage})
+    yield None, usage
+
+
+def cache_stats() -> dict:
+    with _counter_lock:
+        counters = dict(_counters)
+    requests = counters["requests"]
+    served_without_upstream = requests - counters["upstream_calls"]
+    return {
+        **chat_cache.stats(),
+        **counters,
+        "hit_rate": round(served_without_upstream / requests, 4) if requests else 0.0,
+    }
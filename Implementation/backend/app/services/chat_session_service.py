@@ -0,0 +1,139 @@
+from datetime import datetime, timedelta
+from typing import List
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.config.config import settings
+from app.models.chat_session_model import ChatMessage, ChatSession
+from app.services.chat_grounding import GROUNDED_MAX_TOKENS, grounding_context, mentioned_places
+from app.services.chat_service import get_completion_backend, get_system_prompt
+
+# ✅ Multi-turn chatbot sessions with a bounded prompt.
+# Each turn sends: persona system prompt + rolling summary + the most recent turns verbatim
+# (at most CHATBOT_CONTEXT_TOKEN_BUDGET tokens) + the new message. When the verbatim history
+# outgrows the budget, its oldest turns are folded into the summary (capped at
+# CHATBOT_SUMMARY_MAX_TOKENS), so prompt size stays flat however long the conversation gets.
+
+SUMMARY_INSTRUCTIONS = (
+    "You maintain a running summary of a conversation between a traveler and Waypointer, a travel assistant. "
+    "Update the summary with the new turns. Keep the traveler's preferences, plans, places mentioned and open "
+    "questions; drop pleasantries. Reply with the summary only, in under {max_words} words."
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count (~4 characters per token for English); only used for budgeting.
+    """
+    return max(1, len(text) // 4)
+
+
+def create_session(db: Session, user_id, travel_style: str) -> ChatSession:
+    session = ChatSession(user_id=user_id, travel_style=travel_style)
+    db.add(session)
+    db.commit()
+    db.refresh(session)
+    return session
+
+
+def get_session(db: Session, session_id) -> ChatSession:
+    session = db.query(ChatSession).filter(ChatSession.id == session_id).first()
+    if not session:
+        raise HTTPException(status_code=404, detail="Chat session not found")
+    return session
+
+
+def _unsummarized_messages(db: Session, session_id) -> List[ChatMessage]:
+    return (
+        db.query(ChatMessage)
+        .filter(ChatMessage.session_id == session_id, ChatMessage.summarized.is_(False))
+        .order_by(ChatMessage.created_at, ChatMessage.id)
+        .all()
+    )
+
+
+def _split_history(history: List[ChatMessage], budget: int):
+    """
+    Returns (to_fold, to_keep). Once the history exceeds `budget`, the oldest turns are folded
+    until what remains fits in half of it, so summarization runs every few turns, not every turn.
+    """
+    if sum(message.token_count for message in history) <= budget:
+        return [], history
+    kept, used = [], 0
+    for message in reversed(history):
+        if used + message.token_count > budget // 2:
+            break
+        kept.append(message)
+        used += message.token_count
+    kept.reverse()
+    return history[: len(history) - len(kept)], kept
+
+
+async def _fold_into_summary(summary: str, messages: List[ChatMessage]) -> str:
+    transcript = "\n".join(f"{message.role}: {message.content}" for message in messages)
+    max_tokens = settings.CHATBOT_SUMMARY_MAX_TOKENS
+    result = await get_completion_backend().complete(
+        [
+            {"role": "system", "content": SUMMARY_INSTRUCTIONS.format(max_words=int(max_tokens * 0.75))},
+            {"role": "user", "content": f"Current summary:\n{summary or '(none)'}\n\nNew turns:\n{transcript}"},
+        ],
+        model=settings.CHATBOT_MODEL,
+        max_tokens=max_tokens,
+        temperature=0,
+    )
+    return result["content"][: max_tokens * 4]  # Hard cap in case the model overruns
+
+
+def _save_summary(db: Session, session: ChatSession, summary: str, folded: List[ChatMessage]):
+    session.summary = summary
+    session.summary_tokens = estimate_tokens(summary)
+    for message in folded:
+        message.summarized = True
+    db.commit()
+
+
+def _save_turn(db: Session, session: ChatSession, user_message: str, reply: str):
+    now = datetime.utcnow()
+    db.add_all([
+        ChatMessage(session_id=session.id, role="user", content=user_message,
+                    token_count=estimate_tokens(user_message), created_at=now),
+        ChatMessage(session_id=session.id, role="assistant", content=reply,
+                    token_count=estimate_tokens(reply), created_at=now + timedelta(microseconds=1)),
+    ])
+    session.updated_at = now
+    db.commit()
+
+
+async def send_message(db: Session, session_id, user_message: str) -> dict:
+    """
+    ✅ Runs one chat turn: builds the bounded context, calls the model, stores both messages.
+    DB work runs in the threadpool; returns {"response", "usage"}.
+    """
+    session = await run_in_threadpool(get_session, db, session_id)
+    history = await run_in_threadpool(_unsummarized_messages, db, session.id)
+    travel_style, summary = session.travel_style, session.summary  # Read before any commit expires them
+    context, candidates = await run_in_threadpool(grounding_context, db, travel_style, session.user_id)
+
+    to_fold, history = _split_history(history, settings.CHATBOT_CONTEXT_TOKEN_BUDGET)
+    recent = [{"role": message.role, "content": message.content} for message in history]
+    if to_fold:
+        summary = await _fold_into_summary(summary, to_fold)
+        await run_in_threadpool(_save_summary, db, session, summary, to_fold)
+
+    messages = [{"role": "system", "content": get_system_prompt(travel_style)}]
+    params = {}
+    if context:
+        messages.append({"role": "system", "content": context})
+        params["max_tokens"] = GROUNDED_MAX_TOKENS
+    if summary:
+        messages.append({"role": "system", "content": f"Summary of the conversation so far: {summary}"})
+    messages += recent
+    messages.append({"role": "user", "content": user_message})
+
+    result = await get_completion_backend().complete(messages, model=settings.CHATBOT_MODEL, **params)
+    await run_in_threadpool(_save_turn, db, session, user_message, result["content"])
+    return {
+        "response": result["content"],
+        "usage": result["usage"],
+        "places": mentioned_places(result["content"], candidates),
+    }
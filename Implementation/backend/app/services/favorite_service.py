@@ -0,0 +1,76 @@
+from datetime import datetime
+from typing import List
+from fastapi import HTTPException
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.place_model import Place
+from app.models.user_favorite_model import UserFavorite
+
+
+def _insert_favorites(db: Session, user_id, place_ids: List[int]):
+    """
+    ✅ One `INSERT ... ON CONFLICT DO NOTHING RETURNING`, guarded by uq_user_favorites_user_id_place_id.
+    Returns the rows actually inserted; existing favorites are skipped.
+    """
+    now = datetime.utcnow()
+    stmt = (
+        pg_insert(UserFavorite)
+        .values([{"user_id": user_id, "place_id": place_id, "added_at": now} for place_id in place_ids])
+        .on_conflict_do_nothing(index_elements=[UserFavorite.user_id, UserFavorite.place_id])
+        .returning(UserFavorite.id, UserFavorite.user_id, UserFavorite.place_id, UserFavorite.added_at)
+    )
+    try:
+        return db.execute(stmt).all()
+    except IntegrityError:
+        # Foreign key: the user (or a place) doesn't exist
+        db.rollback()
+        raise HTTPException(status_code=404, detail="User or place not found")
+
+
+def add_favorite(db: Session, user_id, place_id: int):
+    row = _insert_favorites(db, user_id, [place_id])
+    if not row:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Place already in favorites")
+    db.commit()
+    return row[0]
+
+
+def apply_favorites_batch(db: Session, user_id, add: List[int], remove: List[int]) -> dict:
+    """
+    ✅ Adds and removes many favorites in one transaction: one SELECT to drop unknown places,
+    one guarded INSERT and one `DELETE ... RETURNING`. A place in both lists is treated as an add.
+    """
+    add = list(dict.fromkeys(add))
+    remove = [place_id for place_id in dict.fromkeys(remove) if place_id not in add]
+
+    existing_places = set()
+    if add:
+        existing_places = {row[0] for row in db.query(Place.id).filter(Place.id.in_(add)).all()}
+    to_add = [place_id for place_id in add if place_id in existing_places]
+
+    try:
+        added = {row.place_id for row in _insert_favorites(db, user_id, to_add)} if to_add else set()
+        removed = set()
+        if remove:
+            stmt = (
+                delete(UserFavorite)
+                .where(UserFavorite.user_id == user_id, UserFavorite.place_id.in_(remove))
+                .returning(UserFavorite.place_id)
+                .execution_options(synchronize_session=False)
+            )
+            removed = {row[0] for row in db.execute(stmt).all()}
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return {
+        "added": [place_id for place_id in to_add if place_id in added],
+        "already_favorited": [place_id for place_id in to_add if place_id not in added],
+        "removed": [place_id for place_id in remove if place_id in removed],
+        "not_found": [place_id for place_id in add if place_id not in existing_places]
+        + [place_id for place_id in remove if place_id not in removed],
+    }
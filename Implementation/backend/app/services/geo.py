@@ -0,0 +1,128 @@
+import math
+
+EARTH_RADIUS_M = 6_371_000
+GEOHASH_PRECISION = 7  # ✅ ~150m x 150m cells, stored on every Place
+MAX_COVER_CELLS = 16  # ✅ Upper bound on geohash prefixes used for one lookup
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """
+    Encodes a coordinate into a base32 geohash of the given precision.
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(chars) < precision:
+        rng, value = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits = bits << 1
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(chars)
+
+
+def decode_geohash(geohash: str):
+    """
+    Returns the (latitude, longitude) center of a geohash cell.
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    even = True
+
+    for char in geohash:
+        bits = _BASE32.index(char)
+        for shift in range(4, -1, -1):
+            rng = lon_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            if (bits >> shift) & 1:
+                rng[0] = mid
+            else:
+                rng[1] = mid
+            even = not even
+
+    return (lat_range[0] + lat_range[1]) / 2, (lon_range[0] + lon_range[1]) / 2
+
+
+def cell_size(precision: int):
+    """
+    Returns the (lat, lon) size in degrees of a geohash cell at `precision`.
+    """
+    lat_bits = (5 * precision) // 2
+    lon_bits = 5 * precision - lat_bits
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lon_bits)
+
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Great-circle distance between two coordinates, in meters.
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(latitude: float, longitude: float, radius_m: float):
+    """
+    Returns (min_lat, max_lat, min_lon, max_lon) enclosing a circle of `radius_m`.
+    Near the poles or across the antimeridian the longitude span is widened to the full range.
+    """
+    d_lat = math.degrees(radius_m / EARTH_RADIUS_M)
+    min_lat = max(-90.0, latitude - d_lat)
+    max_lat = min(90.0, latitude + d_lat)
+
+    cos_lat = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    if cos_lat <= 1e-9:
+        return min_lat, max_lat, -180.0, 180.0
+
+    d_lon = math.degrees(radius_m / (EARTH_RADIUS_M * cos_lat))
+    min_lon = longitude - d_lon
+    max_lon = longitude + d_lon
+    if min_lon < -180.0 or max_lon > 180.0:
+        return min_lat, max_lat, -180.0, 180.0
+
+    return min_lat, max_lat, min_lon, max_lon
+
+
+def covering_geohashes(min_lat: float, max_lat: float, min_lon: float, max_lon: float):
+    """
+    Returns the smallest set of geohash prefixes (at the finest precision that keeps the
+    set under MAX_COVER_CELLS) whose cells together cover the bounding box.
+    """
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_step, lon_step = cell_size(precision)
+        rows = math.floor(max_lat / lat_step) - math.floor(min_lat / lat_step) + 1
+        cols = math.floor(max_lon / lon_step) - math.floor(min_lon / lon_step) + 1
+        if rows * cols <= MAX_COVER_CELLS:
+            break
+
+    cells = set()
+    for row in range(rows):
+        lat = min(max_lat, min_lat + row * lat_step)
+        for col in range(cols):
+            lon = min(max_lon, min_lon + col * lon_step)
+            cells.add(encode_geohash(lat, lon, precision))
+        cells.add(encode_geohash(lat, max_lon, precision))
+    for col in range(cols):
+        cells.add(encode_geohash(max_lat, min(max_lon, min_lon + col * lon_step), precision))
+    cells.add(encode_geohash(max_lat, max_lon, precision))
+
+    return sorted(cells)
@@ -0,0 +1,108 @@
+import asyncio
+import httpx
+from app.config.config import settings
+
+# ✅ Shared async clients for outbound calls (Google Places, OpenWeatherMap, OpenAI, Firebase).
+# Clients and concurrency limits are bound to the event loop that uses them, so they are created
+# lazily per running loop and closed from the app lifespan.
+
+
+class _Upstream:
+    def __init__(self, timeout: float, max_concurrency: int):
+        self.timeout = httpx.Timeout(timeout, connect=min(timeout, 5.0))
+        self.max_concurrency = max_concurrency
+
+
+UPSTREAMS = {
+    "google_places": _Upstream(settings.GOOGLE_PLACES_TIMEOUT_SECONDS, settings.GOOGLE_PLACES_MAX_CONCURRENCY),
+    "openweathermap": _Upstream(settings.OPENWEATHERMAP_TIMEOUT_SECONDS, settings.OPENWEATHERMAP_MAX_CONCURRENCY),
+    "openai": _Upstream(settings.OPENAI_TIMEOUT_SECONDS, settings.OPENAI_MAX_CONCURRENCY),
+    "firebase": _Upstream(settings.FIREBASE_TIMEOUT_SECONDS, settings.FIREBASE_MAX_CONCURRENCY),
+}
+
+
+class _LoopClients:
+    """
+    The clients and per-upstream semaphores owned by one event loop.
+    """
+    def __init__(self):
+        self.http_client = None
+        self.openai_client = None
+        self.semaphores = {name: asyncio.Semaphore(upstream.max_concurrency) for name, upstream in UPSTREAMS.items()}
+
+
+_loop_clients = {}
+
+
+def _clients() -> _LoopClients:
+    loop = asyncio.get_running_loop()
+    clients = _loop_clients.get(loop)
+    if clients is None:
+        # ✅ Forget loops that were closed without going through close_http_clients
+        for closed in [other for other in _loop_clients if other.is_closed()]:
+            del _loop_clients[closed]
+        clients = _loop_clients[loop] = _LoopClients()
+    return clients
+
+
+def get_http_client() -> httpx.AsyncClient:
+    clients = _clients()
+    if clients.http_client is None:
+        clients.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        )
+    return clients.http_client
+
+
+def get_openai_client():
+    clients = _clients()
+    if clients.openai_client is None:
+        from openai import AsyncOpenAI  # ✅ Deferred: the SDK is slow to import
+
+        clients.openai_client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            timeout=UPSTREAMS["openai"].timeout,
+            max_retries=2,
+        )
+    return clients.openai_client
+
+
+def upstream_slot(upstream: str) -> asyncio.Semaphore:
+    """
+    ✅ Bounds in-flight calls to one upstream: `async with upstream_slot("openai"): ...`
+    """
+    return _clients().semaphores[upstream]
+
+
+async def upstream_request(upstream: str, method: str, url: str, retries: int = 0, **kwargs) -> httpx.Response:
+    """
+    Sends a request through the pooled client using the upstream's timeout and concurrency limit.
+    With `retries`, transport errors and 5xx responses are retried with exponential backoff.
+    """
+    config = UPSTREAMS[upstream]
+    for attempt in range(retries + 1):
+        try:
+            async with upstream_slot(upstream):
+                response = await get_http_client().request(method, url, timeout=config.timeout, **kwargs)
+            if response.status_code < 500 or attempt == retries:
+                return response
+        except httpx.TransportError:
+            if attempt == retries:
+                raise
+        await asyncio.sleep(0.2 * 2 ** attempt)
+
+
+async def close_http_clients():
+    """
+    ✅ Closes and forgets the running loop's clients; the next call on this loop starts fresh.
+    """
+    clients = _loop_clients.pop(asyncio.get_running_loop(), None)
+    if clients is None:
+        return
+    if clients.http_client is not None:
+        await clients.http_client.aclose()
+    if clients.openai_client is not None:
+        await clients.openai_client.close()
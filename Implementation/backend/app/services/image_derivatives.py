@@ -0,0 +1,250 @@
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Dict, Optional
+from app.aws import s3_client
+from app.config.config import settings
+
+# ✅ Fixed-size WebP derivatives generated after upload, on a worker pool (never on a request thread).
+# Each endpoint picks the variant it needs: list screens use "thumb", detail screens use "medium".
+# Itinerary covers record them in extra_data["image_variants"], profile photos in users.profile_photo_variants.
+VARIANTS = {
+    "thumb": (320, 320),
+    "medium": (1280, 1280),
+}
+WEBP_QUALITY = 80
+
+_executor = ThreadPoolExecutor(max_workers=settings.IMAGE_WORKERS, thread_name_prefix="image-derivatives")
+_pending = set()
+_pending_lock = threading.Lock()
+
+
+def variant_key(object_key: str, variant: str) -> str:
+    base = object_key.rsplit(".", 1)[0]
+    return f"{base}_{variant}.webp"
+
+
+def variant_keys(object_key: str) -> Dict[str, str]:
+    return {variant: variant_key(object_key, variant) for variant in VARIANTS}
+
+
+def generate_variants(object_key: str, public: bool = False) -> Dict[str, str]:
+    """
+    Downloads the original, writes every variant as WebP and returns {variant: key}.
+    `public` matches the original's ACL (profile photos uploaded through the API are public-read).
+    """
+    from PIL import Image, ImageOps
+
+    original = io.BytesIO()
+    s3_client.download_fileobj(object_key, original)
+    original.seek(0)
+
+    with Image.open(original) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGB")
+
+        keys = {}
+        for variant, size in VARIANTS.items():
+            resized = image.copy()
+            resized.thumbnail(size, Image.LANCZOS)
+            body = io.BytesIO()
+            resized.save(body, format="WEBP", quality=WEBP_QUALITY, method=4)
+            body.seek(0)
+            keys[variant] = variant_key(object_key, variant)
+            s3_client.upload_fileobj(body, keys[variant], content_type="image/webp", public=public)
+
+    return keys
+
+
+def _is_missing_original(error: Exception) -> bool:
+    """
+    True when the original isn't in S3 (yet): e.g. the client hasn't finished its pre-signed PUT.
+    """
+    from botocore.exceptions import ClientError
+
+    return isinstance(error, ClientError) and error.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound")
+
+
+def failure_record(previous: Optional[dict], error: Exception) -> dict:
+    """
+    The image_variants value for a failed job: the error, when it happened and how many attempts so far.
+    """
+    attempts = previous.get("attempts", 1) + 1 if previous and "error" in previous else 1
+    return {
+        "error": str(error)[:200],
+        "missing": _is_missing_original(error),
+        "failed_at": datetime.utcnow().isoformat(),
+        "attempts": attempts,
+    }
+
+
+def retry_due(image_variants: Optional[dict], now: Optional[datetime] = None) -> bool:
+    """
+    ✅ Whether derivatives should be (re)generated: never generated, or failed and past the backoff.
+    Backoff doubles per attempt up to IMAGE_VARIANT_RETRY_MAX_SECONDS; missing originals are never
+    given up on (the upload may still land), other failures stop after IMAGE_VARIANT_MAX_ATTEMPTS.
+    """
+    if image_variants is None:
+        return True
+    if "error" not in image_variants:
+        return False
+    attempts = image_variants.get("attempts", 1)
+    if not image_variants.get("missing") and attempts >= settings.IMAGE_VARIANT_MAX_ATTEMPTS:
+        return False
+    try:
+        failed_at = datetime.fromisoformat(image_variants["failed_at"])
+    except (KeyError, TypeError, ValueError):
+        return True  # Recorded before failures were timestamped
+    delay = min(settings.IMAGE_VARIANT_RETRY_BASE_SECONDS * 2 ** (attempts - 1), settings.IMAGE_VARIANT_RETRY_MAX_SECONDS)
+    return (now or datetime.utcnow()) >= failed_at + timedelta(seconds=delay)
+
+
+def _record_itinerary_variants(itinerary_id, object_key: str, keys: Optional[dict] = None, error: Optional[Exception] = None):
+    """
+    Stores the variant keys (or a failure record for `error`) in the itinerary's image_variants
+    without bumping its updated_at: derivatives are not an edit, so the version stamp, list order
+    and ETag stay put.
+    """
+    from sqlalchemy import update
+    from app.db.db import SessionLocal
+    from app.models.itinerary_models import Itinerary
+    from app.services.itinerary_projection import extract_key
+
+    db = SessionLocal()
+    try:
+        extra_data = (
+            db.query(Itinerary.extra_data).filter(Itinerary.id == itinerary_id).with_for_update().scalar()
+        )
+        # ✅ Skip if the cover was replaced while we were processing
+        if not extra_data or extract_key(extra_data.get("image_url", "")) != object_key:
+            return
+        image_variants = keys if error is None else failure_record(extra_data.get("image_variants"), error)
+        db.execute(
+            update(Itinerary)
+            .where(Itinerary.id == itinerary_id)
+            .values(extra_data={**extra_data, "image_variants": image_variants}, updated_at=Itinerary.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def _record_profile_variants(user_id, object_key: str, keys: Optional[dict] = None, error: Optional[Exception] = None, public: bool = False):
+    """
+    Stores the variant keys (or a failure record for `error`) in users.profile_photo_variants,
+    along with the original they were made from (and its ACL) so a failed job can be retried.
+    """
+    from sqlalchemy import update
+    from app.db.db import SessionLocal
+    from app.models.user_model import User
+
+    db = SessionLocal()
+    try:
+        previous = db.query(User.profile_photo_variants).filter(User.id == user_id).with_for_update().scalar()
+        if error is None:
+            profile_photo_variants = {**keys, "generated_at": datetime.utcnow().isoformat()}
+        else:
+            profile_photo_variants = failure_record(previous, error)
+        db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(profile_photo_variants={"source": object_key, "public": public, **profile_photo_variants})
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def _process(job_key, object_key: str, record, public: bool):
+    try:
+        keys = generate_variants(object_key, public=public)
+        record(object_key, keys)
+        print(f"🖼️ Generated image variants for {object_key}")
+    except Exception as e:
+        print(f"⚠️ Image derivative generation failed for {object_key}: {e}")
+        # ✅ Remember the failure with a timestamp and attempt count so it is retried
+        # after a backoff instead of being re-queued on every request
+        try:
+            record(object_key, error=e)
+        except Exception as record_error:
+            print(f"⚠️ Could not record image derivative failure for {object_key}: {record_error}")
+    finally:
+        with _pending_lock:
+            _pending.discard(job_key)
+
+
+def _schedule(job_key, object_key: str, record, public: bool = False) -> bool:
+    with _pending_lock:
+        if job_key in _pending:
+            return False
+        _pending.add(job_key)
+    _executor.submit(_process, job_key, object_key, record, public)
+    return True
+
+
+def schedule_variants(object_key: str, itinerary_id) -> bool:
+    """
+    ✅ Queues derivative generation for an itinerary cover unless it is already queued.
+    The variant keys (or a failure record) are stored in the itinerary's extra_data["image_variants"].
+    """
+    record = partial(_record_itinerary_variants, itinerary_id)
+    return _schedule((object_key, "itinerary", itinerary_id), object_key, record)
+
+
+def schedule_profile_variants(object_key: str, user_id, public: bool = False) -> bool:
+    """
+    ✅ Queues derivative generation for a user's profile photo unless it is already queued.
+    The variant keys (or a failure record) are stored in users.profile_photo_variants.
+    """
+    record = partial(_record_profile_variants, user_id, public=public)
+    return _schedule((object_key, "profile", user_id), object_key, record, public)
+
+
+def profile_variant_urls(profile_photo_variants: Optional[dict]) -> Optional[Dict[str, str]]:
+    """
+    {variant: url} for a user's generated profile variants (None until generated). The URLs carry the
+    generation time because every upload overwrites the same keys.
+    """
+    if not profile_photo_variants or "error" in profile_photo_variants:
+        return None
+    version = profile_photo_variants.get("generated_at", "")
+    return {
+        variant: f"{s3_client.object_url(profile_photo_variants[variant])}?ts={version}"
+        for variant in VARIANTS
+        if variant in profile_photo_variants
+    }
+
+
+def schedule_failed_profile_variants(user):
+    """
+    Retries a user's failed profile photo variants once their backoff has passed (see retry_due).
+    """
+    profile_photo_variants = user.profile_photo_variants
+    if profile_photo_variants and "error" in profile_photo_variants and retry_due(profile_photo_variants):
+        schedule_profile_variants(
+            profile_photo_variants["source"],
+            user_id=user.id,
+            public=profile_photo_variants.get("public", False),
+        )
+
+
+def schedule_missing_itinerary_variants(itineraries):
+    """
+    Backfills variants for covers uploaded before derivatives existed (or whose job was lost),
+    and retries failed ones once their backoff has passed (see retry_due).
+    """
+    from app.services.itinerary_projection import extract_key
+
+    for itinerary in itineraries:
+        extra_data = itinerary.extra_data or {}
+        if extra_data.get("image_url") and retry_due(extra_data.get("image_variants")):
+            schedule_variants(extract_key(extra_data["image_url"]), itinerary_id=itinerary.id)
+
+
+def shutdown():
+    _executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,145 @@
+import hashlib
+from datetime import datetime
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+from app.aws.s3_client import PRESIGNED_GET_REFRESH_MARGIN, generate_presigned_get_url, generate_presigned_get_urls
+from app.config.config import settings
+from app.services.cache import TTLCache
+from app.models.itinerary_models import Itinerary
+from app.schemas.itinerary_detail_schema import ItineraryDetailResponseSchema
+from app.schemas.itinerary_schema import ItinerarySchema
+
+# ✅ Builds outbound itinerary responses from ORM rows without touching them.
+# The stored `extra_data["image_url"]` stays the S3 object URL; only the response carries a signed URL.
+
+
+def extract_key(url: str) -> str:
+    parsed = urlparse(url)
+    return parsed.path.lstrip('/')
+
+
+def _image_key(itinerary: Itinerary, variant: str) -> Optional[str]:
+    """
+    The object key to serve: the requested derivative when it exists, otherwise the original upload.
+    """
+    if itinerary.extra_data and "image_url" in itinerary.extra_data:
+        variants = itinerary.extra_data.get("image_variants") or {}
+        return variants.get(variant) or extract_key(itinerary.extra_data["image_url"])
+    return None
+
+
+def _signed_extra_data(itinerary: Itinerary, signed_urls: Dict[str, str], variant: str) -> Optional[dict]:
+    if itinerary.extra_data is None:
+        return None
+    extra_data = dict(itinerary.extra_data)  # ✅ Copy; never mutate the ORM value
+    extra_data.pop("image_variants", None)
+    key = _image_key(itinerary, variant)
+    if key is not None:
+        extra_data["image_url"] = signed_urls[key]
+    return extra_data
+
+
+SUMMARY_FIELDS = tuple(ItinerarySchema.model_fields)
+
+
+def to_itinerary_summaries(itineraries: List[Itinerary], fields: Optional[List[str]] = None):
+    """
+    Projects a page of itineraries, signing every cover image (thumbnail variant) in one batch.
+    With `fields`, returns plain dicts holding only those fields (and only reads those columns).
+    """
+    signed_urls = {}
+    if fields is None or "extra_data" in fields:
+        signed_urls = generate_presigned_get_urls(
+            key for key in (_image_key(itinerary, "thumb") for itinerary in itineraries) if key is not None
+        )
+
+    if fields is not None:
+        return [
+            {
+                field: _signed_extra_data(itinerary, signed_urls, "thumb") if field == "extra_data" else getattr(itinerary, field)
+                for field in fields
+            }
+            for itinerary in itineraries
+        ]
+
+    return [
+        ItinerarySchema(
+            id=itinerary.id,
+            name=itinerary.name,
+            destination=itinerary.destination,
+            start_date=itinerary.start_date,
+            end_date=itinerary.end_date,
+            created_by=itinerary.created_by,
+            budget=itinerary.budget,
+            updated_at=itinerary.updated_at,
+            last_updated_by=itinerary.last_updated_by,
+            extra_data=_signed_extra_data(itinerary, signed_urls, "thumb"),
+        )
+        for itinerary in itineraries
+    ]
+
+
+def to_itinerary_detail(itinerary: Itinerary) -> ItineraryDetailResponseSchema:
+    """
+    Projects an itinerary with its (already loaded) days and activities, using the medium cover variant.
+    """
+    key = _image_key(itinerary, "medium")
+    signed_urls = {key: generate_presigned_get_url(key)} if key is not None else {}
+
+    return ItineraryDetailResponseSchema(
+        id=itinerary.id,
+        name=itinerary.name,
+        destination=itinerary.destination,
+        start_date=itinerary.start_date,
+        end_date=itinerary.end_date,
+        created_by=itinerary.created_by,
+        updated_at=itinerary.updated_at,
+        last_updated_by=itinerary.last_updated_by,
+        budget=itinerary.budget,
+        extra_data=_signed_extra_data(itinerary, signed_urls, "medium") or {},
+        days=[
+            {
+                "id": day.id,
+                "date": day.date,
+                "title": day.title,
+                "activities": [
+                    {
+                        "id": activity.id,
+                        "time": activity.time,
+                        "name": activity.name,
+                        "location": activity.location,
+                        "estimated_cost": activity.estimated_cost if activity.estimated_cost is not None else 0,
+                    }
+                    for activity in day.activities
+                ],
+            }
+            for day in itinerary.days
+        ],
+    )
+
+
+# ✅ ETag -> encoded detail response (per worker). A body is valid while the itinerary's updated_at is
+# unchanged, but it also carries signed image URLs, so it is only reused for PRESIGNED_GET_REFRESH_MARGIN:
+# the presigned-URL cache always hands out URLs with at least that much life left.
+itinerary_detail_cache = TTLCache(
+    maxsize=settings.ITINERARY_DETAIL_CACHE_MAX_ENTRIES,
+    ttl=PRESIGNED_GET_REFRESH_MARGIN,
+)
+
+
+def itinerary_etag(itinerary_id, updated_at: datetime) -> str:
+    """
+    Strong ETag for an itinerary detail response, derived from (id, updated_at) only.
+    """
+    version = f"{itinerary_id}|{updated_at.isoformat() if updated_at else ''}"
+    return '"' + hashlib.sha1(version.encode()).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match uses weak comparison, so a `W/` prefix added by a proxy still matches.
+    """
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
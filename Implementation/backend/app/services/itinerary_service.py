@@ -0,0 +1,204 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import List, Optional
+import uuid
+from fastapi import HTTPException
+from sqlalchemy import Integer, column, delete, insert, update, values
+from sqlalchemy.orm import Session
+from app.models.itinerary_models import Activity, Itinerary, ItineraryDay
+from app.schemas.itinerary_schema import ActivityBatchOperation, ActivityBatchResult, ReorderDayItem
+
+
+def format_activity_time(time_str: str) -> str:
+    """Normalizes "8AM" / "8:30AM" to "08:00 AM" / "08:30 AM"; unknown formats are kept unchanged."""
+    try:
+        return datetime.strptime(time_str, "%I%p").strftime("%I:%M %p")
+    except ValueError:
+        try:
+            return datetime.strptime(time_str, "%I:%M%p").strftime("%I:%M %p")
+        except ValueError:
+            return time_str
+
+
+def touch_itinerary(db: Session, itinerary_id, user_id, expected_updated_at: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    ✅ Bumps the itinerary's updated_at / last_updated_by in a single `UPDATE ... RETURNING`.
+    With `expected_updated_at`, only bumps if the row is still at that version (optimistic concurrency).
+    Returns the new updated_at, or None if no row matched.
+    """
+    values = {"updated_at": datetime.utcnow()}
+    if user_id is not None:
+        values["last_updated_by"] = user_id
+    stmt = update(Itinerary).where(Itinerary.id == itinerary_id)
+    if expected_updated_at is not None:
+        stmt = stmt.where(Itinerary.updated_at == expected_updated_at)
+    stmt = stmt.values(**values).returning(Itinerary.updated_at).execution_options(synchronize_session=False)
+    return db.execute(stmt).scalar_one_or_none()
+
+
+class ItineraryEdit:
+    updated_at: Optional[datetime] = None  # The itinerary's new version, set before the body runs
+
+
+@contextmanager
+def itinerary_edit(db: Session, itinerary_id, user_id, expected_updated_at: Optional[datetime] = None):
+    """
+    ✅ Unit of work for a change inside an itinerary: the child change and the parent
+    timestamp bump are committed together in one transaction, or not at all.
+    With `expected_updated_at`, a concurrent edit since that version raises 409.
+
+        with itinerary_edit(db, itinerary_id, x_user_id):
+            db.add(new_day)
+
+    The parent is bumped (and its row locked) before the body runs, so every edit locks the
+    itinerary before its days/activities, whether the body uses the ORM or Core statements,
+    and a missing itinerary (404) or stale version (409) fails before anything is written.
+    """
+    edit = ItineraryEdit()
+    try:
+        with db.no_autoflush:
+            edit.updated_at = touch_itinerary(db, itinerary_id, user_id, expected_updated_at)
+            if edit.updated_at is None:
+                exists = expected_updated_at is not None and db.query(Itinerary.id).filter(Itinerary.id == itinerary_id).first()
+                if exists:
+                    raise HTTPException(status_code=409, detail="Itinerary was modified by someone else")
+                raise HTTPException(status_code=404, detail="Itinerary not found")
+        yield edit
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+ACTIVITY_FIELDS = ("time", "name", "location", "notes", "estimated_cost", "extra_data")
+
+
+def apply_activity_batch(db: Session, itinerary_id, operations: List[ActivityBatchOperation], user_id, day_id=None):
+    """
+    ✅ Applies create/update/delete operations to an itinerary's activities in one transaction.
+    Operations are validated in order against the itinerary's days and activities (two queries);
+    invalid ones are reported and skipped, the rest are written with one bulk INSERT, one bulk
+    UPDATE and one DELETE. With `day_id`, the whole batch is scoped to that day: activities in
+    other days are "not found". Returns (results, updated_at).
+    """
+    rows = (
+        db.query(Itinerary.id, ItineraryDay.id)
+        .outerjoin(ItineraryDay, ItineraryDay.itinerary_id == Itinerary.id)
+        .filter(Itinerary.id == itinerary_id)
+        .all()
+    )
+    if not rows:
+        raise HTTPException(status_code=404, detail="Itinerary not found")
+    day_ids = {row_day_id for _, row_day_id in rows if row_day_id is not None}
+    if day_id is not None:
+        if day_id not in day_ids:
+            raise HTTPException(status_code=404, detail="Itinerary day not found")
+        day_ids = {day_id}
+
+    # Activity id -> day id, for the activities this batch touches that belong to the itinerary
+    target_ids = {op.activity_id for op in operations if op.activity_id is not None}
+    activity_days = dict(
+        db.query(Activity.id, Activity.itinerary_day_id)
+        .filter(Activity.id.in_(target_ids), Activity.itinerary_day_id.in_(day_ids))
+        .all()
+    ) if target_ids and day_ids else {}
+
+    inserts, updates, deletes, results = [], {}, set(), []
+    created_at = datetime.utcnow()
+
+    for index, op in enumerate(operations):
+        error = None
+        activity_id = op.activity_id
+
+        if op.day_id is not None and op.day_id not in day_ids:
+            error = "Itinerary day not found"
+        elif op.op == "create":
+            if op.day_id is None or not op.time or not op.name:
+                error = "day_id, time and name are required"
+            else:
+                activity_id = uuid.uuid4()  # Server-assigned; the client matches it up via client_ref
+                inserts.append({
+                    "id": activity_id,
+                    "itinerary_day_id": op.day_id,
+                    "time": format_activity_time(op.time),
+                    "name": op.name,
+                    "location": op.location,
+                    "notes": op.notes or "",
+                    "estimated_cost": float(op.estimated_cost) if op.estimated_cost is not None else 0.0,
+                    "extra_data": op.extra_data or {},
+                    # ✅ Keep the batch's order: activities are listed by (created_at, id)
+                    "created_at": created_at + timedelta(microseconds=index),
+                })
+        elif activity_id is None or activity_id not in activity_days:
+            error = "Activity not found"
+        elif op.op == "update":
+            values = {field: getattr(op, field) for field in ACTIVITY_FIELDS if field in op.model_fields_set}
+            if ("time" in values and not values["time"]) or ("name" in values and not values["name"]):
+                error = "time and name cannot be empty"
+            else:
+                if "time" in values:
+                    values["time"] = format_activity_time(values["time"])
+                if op.day_id is not None:
+                    values["itinerary_day_id"] = op.day_id
+                if values:
+                    updates.setdefault(activity_id, {"id": activity_id}).update(values)
+        else:
+            updates.pop(activity_id, None)
+            deletes.add(activity_id)
+            del activity_days[activity_id]  # Later operations on it in this batch fail
+
+        results.append(ActivityBatchResult(
+            index=index,
+            op=op.op,
+            status="error" if error else "ok",
+            activity_id=activity_id,
+            client_ref=op.client_ref,
+            detail=error,
+        ))
+
+    if not (inserts or updates or deletes):
+        return results, None
+
+    with itinerary_edit(db, itinerary_id, user_id) as edit:
+        if deletes:
+            db.execute(delete(Activity).where(Activity.id.in_(deletes)).execution_options(synchronize_session=False))
+        if inserts:
+            db.execute(insert(Activity), inserts)
+        if updates:
+            db.execute(update(Activity), list(updates.values()))
+
+    return results, edit.updated_at
+
+
+def reorder_itinerary_days(
+    db: Session,
+    itinerary_id,
+    items: List[ReorderDayItem],
+    user_id=None,
+    expected_updated_at: Optional[datetime] = None,
+) -> datetime:
+    """
+    ✅ Applies a new day order with one set-based `UPDATE ... FROM (VALUES ...)` scoped to the
+    itinerary, in the same transaction as the parent bump. The bump runs first: it locks the
+    itinerary and checks `expected_updated_at`, so a stale version 409s before any day is written.
+    Returns the new updated_at.
+    """
+    if len({item.id for item in items}) != len(items):
+        raise HTTPException(status_code=400, detail="Duplicate day IDs in reorder request.")
+
+    new_order = values(
+        column("id", ItineraryDay.id.type),
+        column("order_index", Integer),
+        name="new_order",
+    ).data([(item.id, item.order_index) for item in items])
+    stmt = (
+        update(ItineraryDay)
+        .where(ItineraryDay.id == new_order.c.id, ItineraryDay.itinerary_id == itinerary_id)
+        .values(order_index=new_order.c.order_index)
+        .execution_options(synchronize_session=False)
+    )
+
+    with itinerary_edit(db, itinerary_id, user_id, expected_updated_at) as edit:
+        if items and db.execute(stmt).rowcount != len(items):
+            raise HTTPException(status_code=400, detail="One or more day IDs are invalid.")
+    return edit.updated_at
@@ -0,0 +1,22 @@
+import base64
+from datetime import datetime
+from uuid import UUID
+from fastapi import HTTPException
+
+# ✅ Opaque keyset cursors over (timestamp, id), shared by the paginated list endpoints.
+
+
+def encode_cursor(timestamp: datetime, row_id) -> str:
+    raw = f"{timestamp.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    """
+    Returns (timestamp, id) from a cursor made by `encode_cursor`; a malformed cursor is a 400.
+    """
+    try:
+        timestamp, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(timestamp), UUID(row_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
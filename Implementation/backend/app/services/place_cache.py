@@ -0,0 +1,115 @@
+import math
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from app.config.config import settings
+from app.models.api_cache_model import APICache
+from app.services.cache import TTLCache
+from app.services.geo import cell_size, decode_geohash, encode_geohash
+
+PLACES_CACHE_SOURCE = "google_places_tile"
+RADIUS_BUCKET_M = 50
+MAX_SEARCH_RADIUS_M = 50_000  # ✅ searchNearby's limit for locationRestriction.circle.radius
+
+# ✅ Tile-keyed cache in front of Google Places searchNearby (per worker)
+places_tile_cache = TTLCache(
+    maxsize=settings.PLACES_CACHE_MAX_ENTRIES,
+    ttl=settings.PLACES_CACHE_TTL_SECONDS,
+)
+
+_counter_lock = threading.Lock()
+_counters = {"db_hits": 0, "upstream_requests": 0}
+
+
+def _tile_precision(latitude: float, radius_m: float) -> int:
+    """
+    Picks the coarsest geohash precision whose cell center stays within a quarter
+    of the search radius of any point in the cell.
+    """
+    for precision in range(4, 10):
+        lat_step, lon_step = cell_size(precision)
+        height_m = lat_step * 110_540
+        width_m = lon_step * 111_320 * math.cos(math.radians(latitude))
+        if math.hypot(height_m, width_m) / 2 <= radius_m / 4:
+            return precision
+    return 9
+
+
+def tile_for(latitude: float, longitude: float, radius_m: int, travel_style: str):
+    """
+    ✅ Quantizes a search to a tile: returns (cache_key, center_lat, center_lon, upstream_radius).
+    Upstream requests are made from the tile center so cached results depend only on the key; the
+    radius is widened by the tile's half-diagonal so the circle around any point in the tile is covered.
+    Callers filter the results back down to the caller's own point and radius.
+    """
+    radius = max(RADIUS_BUCKET_M, int(math.ceil(radius_m / RADIUS_BUCKET_M)) * RADIUS_BUCKET_M)
+    tile = encode_geohash(latitude, longitude, _tile_precision(latitude, radius))
+    center_lat, center_lon = decode_geohash(tile)
+    lat_step, lon_step = cell_size(len(tile))
+    half_diagonal_m = math.hypot(lat_step * 110_540, lon_step * 111_320 * math.cos(math.radians(center_lat))) / 2
+    upstream_radius = min(MAX_SEARCH_RADIUS_M, int(math.ceil(radius + half_diagonal_m)))
+    key = f"places:{travel_style.lower()}:{tile}:{radius}"
+    return key, center_lat, center_lon, upstream_radius
+
+
+def get_cached_search(db: Session, key: str):
+    """
+    Returns the cached searchNearby payload for `key`, warming from `api_cache` on a local miss.
+    """
+    data = places_tile_cache.get(key)
+    if data is not None:
+        return data
+
+    cutoff = datetime.utcnow() - timedelta(seconds=places_tile_cache.ttl)
+    row = (
+        db.query(APICache)
+        .filter(
+            APICache.source == PLACES_CACHE_SOURCE,
+            APICache.cache_key == key,
+            APICache.fetched_at >= cutoff,
+        )
+        .order_by(APICache.fetched_at.desc())
+        .first()
+    )
+    if row is None:
+        return None
+
+    remaining = places_tile_cache.ttl - (datetime.utcnow() - row.fetched_at).total_seconds()
+    places_tile_cache.set(key, row.data, ttl=remaining)
+    with _counter_lock:
+        _counters["db_hits"] += 1
+    return row.data
+
+
+def store_search(db: Session, key: str, data: dict):
+    """
+    Stores a fresh upstream payload in memory and writes it through to `api_cache`.
+    The caller owns the commit.
+    """
+    with _counter_lock:
+        _counters["upstream_requests"] += 1
+    places_tile_cache.set(key, data)
+
+    row = (
+        db.query(APICache)
+        .filter(APICache.source == PLACES_CACHE_SOURCE, APICache.cache_key == key)
+        .first()
+    )
+    if row is None:
+        row = APICache(source=PLACES_CACHE_SOURCE, cache_key=key)
+        db.add(row)
+    row.data = data
+    row.fetched_at = datetime.utcnow()
+
+
+def cache_stats() -> dict:
+    memory = places_tile_cache.stats()
+    with _counter_lock:
+        db_hits = _counters["db_hits"]
+        upstream = _counters["upstream_requests"]
+    return {
+        "memory": memory,
+        "db_hits": db_hits,
+        "upstream_requests": upstream,
+        "upstream_requests_saved": memory["hits"] + db_hits,
+    }
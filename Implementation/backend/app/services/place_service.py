@@ -0,0 +1,93 @@
+from datetime import datetime
+from sqlalchemy import func, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from app.models.place_model import Place
+from app.services.geo import bounding_box, covering_geohashes, encode_geohash, haversine_m
+
+# ✅ Travel Style Mapping (Subcategories)
+TRAVEL_STYLE_MAPPING = {
+    "relaxation": ["park", "beach", "spa", "massage"],
+    "adventure": ["amusement_park", "zoo", "aquarium"],
+    "cultural": ["museum", "art_gallery", "historical_place", "monument"],
+    "foodie": ["restaurant", "bakery", "bar", "cafe", "coffee_shop"]
+}
+
+
+def find_places_within(db: Session, latitude: float, longitude: float, radius_m: float, categories=None):
+    """
+    ✅ Returns places within `radius_m` meters of (latitude, longitude), nearest first.
+
+    The geohash prefixes and bounding box are pushed into SQL so only the small
+    candidate set is loaded; the exact haversine check runs on those rows.
+    Prefixes are matched with `LIKE 'prefix%'` (served by ix_places_geohash_pattern), not a
+    `>= prefix AND < prefix + "~"` range, which breaks under non-C collations such as en_US.UTF-8.
+    """
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_m)
+    prefixes = covering_geohashes(min_lat, max_lat, min_lon, max_lon)
+
+    query = db.query(Place).filter(
+        or_(*[Place.geohash.like(prefix + "%") for prefix in prefixes]),
+        Place.latitude.between(min_lat, max_lat),
+        Place.longitude.between(min_lon, max_lon),
+    )
+    if categories is not None:
+        query = query.filter(func.lower(Place.category).in_([c.lower() for c in categories]))
+
+    results = []
+    for place in query.all():
+        distance = haversine_m(latitude, longitude, place.latitude, place.longitude)
+        if distance <= radius_m:
+            results.append((distance, place))
+
+    results.sort(key=lambda item: item[0])
+    return [place for _, place in results]
+
+
+def place_to_dict(place: Place) -> dict:
+    return {
+        "name": place.name,
+        "category": place.category,
+        "latitude": place.latitude,
+        "longitude": place.longitude,
+        "rating": place.rating,
+        "source_api": place.source_api,
+        "cached_data": place.cached_data,
+    }
+
+
+def upsert_places(db: Session, places: list):
+    """
+    ✅ Inserts or refreshes places in one `INSERT ... ON CONFLICT DO UPDATE` keyed on
+    (name, latitude, longitude). Existing rows get a fresh rating, cached_data and last_updated.
+    The caller owns the commit.
+    """
+    now = datetime.utcnow()
+    rows = {}
+    for place in places:
+        key = (place["name"], place["latitude"], place["longitude"])
+        rows[key] = {  # ✅ Last one wins; a statement can't touch the same row twice
+            "name": place["name"],
+            "category": place["category"],
+            "latitude": place["latitude"],
+            "longitude": place["longitude"],
+            "geohash": encode_geohash(place["latitude"], place["longitude"]),
+            "rating": place["rating"],
+            "source_api": place["source_api"],
+            "cached_data": place["cached_data"],
+            "last_updated": now,
+            "created_at": now,
+        }
+    if not rows:
+        return
+
+    stmt = pg_insert(Place).values(list(rows.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Place.name, Place.latitude, Place.longitude],
+        set_={
+            "rating": stmt.excluded.rating,
+            "cached_data": stmt.excluded.cached_data,
+            "last_updated": stmt.excluded.last_updated,
+        },
+    )
+    db.execute(stmt)
@@ -0,0 +1,146 @@
+import asyncio
+import math
+from collections import defaultdict
+from datetime import datetime
+from typing import List
+from sqlalchemy import delete, func, insert, text
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.config.config import settings
+from app.models.place_model import Place
+from app.models.place_recommendation_model import PlaceRecommendation
+from app.models.user_favorite_model import UserFavorite
+from app.services.geo import encode_geohash
+from app.services.place_service import TRAVEL_STYLE_MAPPING
+
+# ✅ Home-screen recommendations, precomputed per (geohash cell, travel style) by a background job,
+# so /places/recommended is a single primary-key lookup instead of a Google call or a table scan.
+
+RATING_WEIGHT = 0.6
+FAVORITES_WEIGHT = 0.25
+RECENCY_WEIGHT = 0.15
+RECENCY_HALF_LIFE_DAYS = 30
+REFRESH_LOCK_ID = 720_025  # ✅ Postgres advisory lock: one worker refreshes at a time
+
+
+def score_place(rating, favorites: int, max_favorites: int, last_updated, now: datetime) -> float:
+    """
+    Weighted blend of rating (0-5), favorite count (log-scaled against the most favorited place)
+    and how recently the place data was refreshed (exponential decay).
+    """
+    rating_score = (rating or 0) / 5
+    favorites_score = math.log1p(favorites) / math.log1p(max_favorites) if max_favorites else 0.0
+    age_days = (now - last_updated).total_seconds() / 86400 if last_updated else RECENCY_HALF_LIFE_DAYS * 4
+    recency_score = 0.5 ** (max(age_days, 0) / RECENCY_HALF_LIFE_DAYS)
+    return RATING_WEIGHT * rating_score + FAVORITES_WEIGHT * favorites_score + RECENCY_WEIGHT * recency_score
+
+
+def compute_recommendations(db: Session, now: datetime = None) -> List[dict]:
+    """
+    Ranks every place with a geohash into its cell for each travel style; returns table rows.
+    """
+    now = now or datetime.utcnow()
+    precision = settings.RECOMMENDATIONS_CELL_PRECISION
+    favorite_counts = dict(
+        db.query(UserFavorite.place_id, func.count(UserFavorite.id)).group_by(UserFavorite.place_id).all()
+    )
+    max_favorites = max(favorite_counts.values(), default=0)
+
+    rows = []
+    for travel_style, categories in TRAVEL_STYLE_MAPPING.items():
+        cells = defaultdict(list)
+        places = (
+            db.query(Place.id, Place.name, Place.category, Place.latitude, Place.longitude,
+                     Place.rating, Place.geohash, Place.last_updated)
+            .filter(Place.category.in_(categories), Place.geohash.isnot(None))
+            .yield_per(1000)
+        )
+        for place in places:
+            favorites = favorite_counts.get(place.id, 0)
+            cells[place.geohash[:precision]].append({
+                "id": place.id,
+                "name": place.name,
+                "category": place.category,
+                "latitude": place.latitude,
+                "longitude": place.longitude,
+                "rating": place.rating,
+                "favorites": favorites,
+                "score": round(score_place(place.rating, favorites, max_favorites, place.last_updated, now), 4),
+            })
+        for cell, candidates in cells.items():
+            candidates.sort(key=lambda candidate: candidate["score"], reverse=True)
+            rows.append({
+                "cell": cell,
+                "travel_style": travel_style,
+                "places": candidates[: settings.RECOMMENDATIONS_TOP_N],
+                "computed_at": now,
+            })
+    return rows
+
+
+def refresh_recommendations(db: Session, force: bool = False) -> bool:
+    """
+    ✅ Recomputes the whole feed and swaps it in within one transaction (readers keep seeing the
+    previous feed until commit). Skips if another worker holds the lock or the feed is still fresh.
+    Returns True if the feed was rebuilt.
+    """
+    try:
+        if db.bind.dialect.name == "postgresql":
+            if not db.execute(text("SELECT pg_try_advisory_xact_lock(:id)"), {"id": REFRESH_LOCK_ID}).scalar():
+                return False
+        if not force:
+            last = db.query(func.max(PlaceRecommendation.computed_at)).scalar()
+            if last and (datetime.utcnow() - last).total_seconds() < settings.RECOMMENDATIONS_REFRESH_SECONDS * 0.9:
+                return False
+
+        rows = compute_recommendations(db)
+        db.execute(delete(PlaceRecommendation))
+        if rows:
+            db.execute(insert(PlaceRecommendation), rows)
+        db.commit()
+        print(f"✅ Recommendation feed rebuilt: {len(rows)} cell/style rows")
+        return True
+    except Exception:
+        db.rollback()
+        raise
+
+
+def get_recommendations(db: Session, latitude: float, longitude: float, travel_style: str, limit: int) -> List[dict]:
+    """
+    ✅ Single primary-key lookup of the precomputed feed for the cell containing (latitude, longitude).
+    """
+    cell = encode_geohash(latitude, longitude, settings.RECOMMENDATIONS_CELL_PRECISION)
+    places = (
+        db.query(PlaceRecommendation.places)
+        .filter(PlaceRecommendation.cell == cell, PlaceRecommendation.travel_style == travel_style.lower())
+        .scalar()
+    )
+    return (places or [])[:limit]
+
+
+async def run_refresh_loop():
+    """
+    Background task started from the app lifespan: refreshes the feed every RECOMMENDATIONS_REFRESH_SECONDS.
+    """
+    from app.db.db import SessionLocal
+
+    while True:
+        db = SessionLocal()
+        try:
+            await run_in_threadpool(refresh_recommendations, db)
+        except Exception as e:
+            print(f"⚠️ Recommendation feed refresh failed: {e}")
+        finally:
+            db.close()
+        await asyncio.sleep(settings.RECOMMENDATIONS_REFRESH_SECONDS)
+
+
+if __name__ == "__main__":
+    # ✅ One-off rebuild (e.g. from a scheduler): `python -m app.services.recommendation_service`
+    from app.db.db import SessionLocal
+
+    session = SessionLocal()
+    try:
+        refresh_recommendations(session, force=True)
+    finally:
+        session.close()
@@ -0,0 +1,44 @@
+import asyncio
+import json
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+from app.aws import s3_client
+from app.config.config import settings
+from app.services.http_client import upstream_request
+from app.services import image_derivatives
+
+# ✅ Caps uploads running in the threadpool so they can't starve sync endpoints
+_upload_slots = asyncio.Semaphore(settings.UPLOAD_MAX_CONCURRENCY)
+
+
+async def upload_to_s3(file: UploadFile, object_key: str, public: bool = False) -> str:
+    """
+    ✅ Streams an uploaded file to S3 without blocking the event loop.
+    The multipart form body is already spooled to a temp file by Starlette; the S3 gateway
+    reads it in chunks and switches to a multipart upload for large files.
+    """
+    async with _upload_slots:
+        await run_in_threadpool(
+            s3_client.upload_fileobj,
+            file.file,
+            object_key,
+            content_type=file.content_type,
+            public=public,
+        )
+    return s3_client.object_url(object_key)
+
+
+async def save_profile_photo_url(user_id: str, image_url: str):
+    firebase_url = f"{settings.FIREBASE_DB_URL}/users/{user_id}/profilePhotoUrl.json"
+    response = await upstream_request("firebase", "PATCH", firebase_url, retries=3, content=json.dumps(image_url))
+    if response.status_code != 200:
+        raise Exception("Failed to update Firebase")
+
+
+async def upload_profile_photo(user_id: str, file: UploadFile) -> str:
+    object_key = f"profile_photos/{user_id}/profile.jpg"
+    image_url = await upload_to_s3(file, object_key, public=True)
+    await save_profile_photo_url(user_id, image_url)
+    # ✅ Thumbnail/WebP variants are written next to the original and recorded on the user row
+    image_derivatives.schedule_profile_variants(object_key, user_id=user_id, public=True)
+    return image_url
@@ -0,0 +1,46 @@
+from fastapi import HTTPException
+from app.config.config import settings
+from app.services.cache import SWRCache, make_backend
+from app.services.http_client import upstream_request
+
+COORD_PRECISION = 2  # ✅ ~1 km cells; weather barely changes inside one
+
+weather_cache = SWRCache(
+    backend=make_backend(
+        settings.WEATHER_CACHE_BACKEND,
+        maxsize=settings.WEATHER_CACHE_MAX_ENTRIES,
+        ttl=settings.WEATHER_CACHE_TTL_SECONDS + settings.WEATHER_CACHE_STALE_SECONDS,
+    ),
+    ttl=settings.WEATHER_CACHE_TTL_SECONDS,
+    stale_ttl=settings.WEATHER_CACHE_STALE_SECONDS,
+)
+
+
+async def _fetch_weather(latitude: float, longitude: float) -> dict:
+    weather_url = (
+        f"https://api.openweathermap.org/data/2.5/weather?lat={latitude}&lon={longitude}"
+        f"&appid={settings.OPENWEATHERMAP_API_KEY}&units=metric"
+    )
+    response = await upstream_request("openweathermap", "GET", weather_url)
+    data = response.json()
+
+    if response.status_code != 200:
+        raise HTTPException(status_code=response.status_code, detail=data.get("message", "Error fetching weather data"))
+
+    return {
+        "temperature": data["main"]["temp"],
+        "weather_main": data["weather"][0]["main"],
+        "weather_icon": data["weather"][0]["icon"],
+        "weather_name": data["name"],
+    }
+
+
+async def get_weather_for(latitude: float, longitude: float) -> dict:
+    """
+    ✅ Current weather for the ~1 km cell containing (latitude, longitude).
+    Served from cache when fresh, stale-while-revalidate after that; concurrent misses share one upstream call.
+    """
+    lat = round(latitude, COORD_PRECISION)
+    lon = round(longitude, COORD_PRECISION)
+    key = f"weather:{lat:.{COORD_PRECISION}f}:{lon:.{COORD_PRECISION}f}"
+    return await weather_cache.get_or_fetch(key, lambda: _fetch_weather(lat, lon))
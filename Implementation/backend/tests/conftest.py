@@ -0,0 +1,154 @@
+import os
+import uuid
+import pytest
+
+# ✅ The models are Postgres-only (UUID columns, named enums, ON CONFLICT), so database tests
+# run against a disposable Postgres database given by TEST_DATABASE_URL and are skipped without it.
+# Every test runs inside a transaction that is rolled back afterwards.
+if os.getenv("TEST_DATABASE_URL"):
+    os.environ["DATABASE_URL"] = os.environ["TEST_DATABASE_URL"]
+os.environ.setdefault("CHATBOT_COMPLETION_BACKEND", "fake")
+
+
+@pytest.fixture(scope="session")
+def engine():
+    if not os.getenv("TEST_DATABASE_URL"):
+        pytest.skip("TEST_DATABASE_URL is not set")
+    from app.db.db import engine
+    from app.db.migrations import migrate
+
+    migrate()
+    return engine
+
+
+@pytest.fixture
+def db(engine):
+    """
+    Session bound to one connection; `db.commit()` in the code under test releases a savepoint,
+    and the outer transaction is rolled back when the test ends.
+    """
+    from sqlalchemy.orm import Session
+
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, autoflush=False, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture
+def client(db):
+    """
+    TestClient whose requests use the test session (the lifespan is not started).
+    """
+    from fastapi.testclient import TestClient
+    from app.db.db import get_db
+    from app.main import app
+
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    """
+    The app's S3 gateway pointed at an in-process moto bucket.
+    """
+    from moto import mock_aws
+    from app.aws import s3_client
+    from app.config.config import settings
+
+    monkeypatch.setattr(settings, "AWS_ACCESS_KEY", "testing")
+    monkeypatch.setattr(settings, "AWS_SECRET_KEY", "testing")
+    monkeypatch.setattr(settings, "AWS_S3_ENDPOINT_URL", None)
+    monkeypatch.setattr(s3_client, "AWS_BUCKET_NAME", "waypoint-test")
+    monkeypatch.setattr(s3_client, "AWS_REGION", "us-east-1")
+    with mock_aws():
+        s3_client.reset_s3_client()
+        s3_client.get_s3_client().create_bucket(Bucket="waypoint-test")
+        try:
+            yield s3_client
+        finally:
+            s3_client.reset_s3_client()
+
+
+@pytest.fixture
+def sql_statements(engine):
+    """
+    Records every statement sent to the database while the test runs.
+    """
+    from sqlalchemy import event
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def make_user(db):
+    from app.models.user_model import User
+
+    def make_user():
+        user_id = uuid.uuid4()
+        db.add(User(id=user_id, name="Test User", email=f"{user_id}@example.com", password_hash="x"))
+        db.flush()
+        return user_id
+
+    return make_user
+
+
+@pytest.fixture
+def user(make_user):
+    return make_user()
+
+
+@pytest.fixture
+def make_itinerary(db, user):
+    """
+    Creates an itinerary owned by `user` with `days` days of `activities` activities each.
+    """
+    from datetime import datetime, timedelta
+    from app.models.itinerary_models import Activity, Itinerary, ItineraryDay
+
+    def make_itinerary(days=3, activities=2, extra_data=None):
+        start = datetime(2025, 7, 1)
+        itinerary = Itinerary(
+            id=uuid.uuid4(),
+            name="Summer trip",
+            destination="Vancouver",
+            start_date=start,
+            end_date=start + timedelta(days=max(days - 1, 0)),
+            created_by=user,
+            last_updated_by=user,
+            extra_data=extra_data,
+        )
+        db.add(itinerary)
+        for index in range(days):
+            day = ItineraryDay(
+                id=uuid.uuid4(),
+                itinerary_id=itinerary.id,
+                date=start + timedelta(days=index),
+                title=f"Day {index + 1}",
+                order_index=index,
+            )
+            db.add(day)
+            for number in range(activities):
+                db.add(Activity(id=uuid.uuid4(), itinerary_day_id=day.id, time="09:00 AM", name=f"Activity {number + 1}"))
+        db.commit()
+        return itinerary
+
+    return make_itinerary
@@ -0,0 +1,100 @@
+import asyncio
+import json
+import time
+import uuid
+import pytest
+from app.services import chat_service
+from app.services.chat_service import FakeCompletionBackend, stream_completion
+
+# ✅ Time-to-first-byte benchmark for streamed chatbot answers, against the local fake backend.
+# The fake takes BACKEND_DELAY before its first token and TOKEN_DELAY per token after that,
+# so a 60-word answer takes ~1.3 s in full; streaming should deliver the first bytes in ~0.1 s.
+BACKEND_DELAY = 0.05
+TOKEN_DELAY = 0.02
+ANSWER_WORDS = 60
+
+
+@pytest.fixture
+def fake_backend():
+    previous = chat_service._backend
+    backend = FakeCompletionBackend(delay=BACKEND_DELAY, token_delay=TOKEN_DELAY)
+    chat_service.set_completion_backend(backend)
+    try:
+        yield backend
+    finally:
+        chat_service.set_completion_backend(previous)
+
+
+def _user_message():
+    # Unique per run so the response cache never answers
+    return " ".join(["word"] * (ANSWER_WORDS - 2) + [uuid.uuid4().hex])
+
+
+def test_stream_completion_first_delta_latency(fake_backend):
+    async def run():
+        started = time.perf_counter()
+        first = None
+        async for delta, _ in stream_completion([{"role": "user", "content": _user_message()}]):
+            if delta is not None and first is None:
+                first = time.perf_counter() - started
+        return first, time.perf_counter() - started
+
+    first, total = asyncio.run(run())
+    print(f"\nstream_completion: first delta {first * 1000:.0f} ms, full answer {total * 1000:.0f} ms")
+    assert first < BACKEND_DELAY + 5 * TOKEN_DELAY
+    assert first < total / 5
+
+
+async def _post_and_time(app, path: str, payload: dict):
+    """
+    Drives the ASGI app directly (TestClient buffers the whole body) and returns
+    (seconds to the first non-empty body chunk, seconds to the end of the response, body).
+    """
+    body = json.dumps(payload).encode()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        "client": ("testclient", 50000), "server": ("testserver", 80),
+    }
+    finished = asyncio.Event()
+    request_sent = False
+    chunks, first = [], None
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal first
+        if message["type"] == "http.response.body":
+            if message.get("body") and first is None:
+                first = time.perf_counter() - started
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body"):
+                finished.set()
+
+    started = time.perf_counter()
+    await app(scope, receive, send)
+    return first, time.perf_counter() - started, b"".join(chunks).decode()
+
+
+def test_chatbot_stream_time_to_first_byte(client, fake_backend):
+    async def run():
+        # One warm-up request (threadpool, DB connection, grounding candidate cache), then the median of 3
+        await _post_and_time(client.app, "/chatbot/stream", {"user_message": _user_message(), "travel_style": "adventure"})
+        return [
+            await _post_and_time(client.app, "/chatbot/stream", {"user_message": _user_message(), "travel_style": "adventure"})
+            for _ in range(3)
+        ]
+
+    runs = sorted(asyncio.run(run()))
+    first, total, body = runs[len(runs) // 2]
+
+    print(f"\nPOST /chatbot/stream: first byte {first * 1000:.0f} ms, full answer {total * 1000:.0f} ms")
+    assert "event: done" in body
+    assert first < total / 5
@@ -0,0 +1,36 @@
+import asyncio
+
+from app.services import http_client
+
+
+async def _contend(upstream):
+    # Two tasks on a one-slot semaphore: the second waits, which binds the semaphore to this loop
+    async def hold():
+        async with http_client.upstream_slot(upstream):
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(hold(), hold())
+    return http_client.get_http_client()
+
+
+def test_clients_and_limits_work_across_event_loops(monkeypatch):
+    monkeypatch.setattr(http_client.UPSTREAMS["openai"], "max_concurrency", 1)
+
+    first = asyncio.run(_contend("openai"))
+    second = asyncio.run(_contend("openai"))  # A new loop, e.g. the next TestClient or worker restart
+
+    assert first is not second
+
+
+def test_close_http_clients_resets_the_loop_clients():
+    async def scenario():
+        client = http_client.get_http_client()
+        slot = http_client.upstream_slot("firebase")
+        assert http_client.get_http_client() is client
+        await http_client.close_http_clients()
+        assert client.is_closed
+        assert http_client.get_http_client() is not client
+        assert http_client.upstream_slot("firebase") is not slot
+        await http_client.close_http_clients()
+
+    asyncio.run(scenario())
@@ -0,0 +1,123 @@
+import io
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.config.config import settings
+from app.services import image_derivatives
+
+
+def test_generate_variants_writes_webp_derivatives(s3):
+    from PIL import Image
+
+    body = io.BytesIO()
+    Image.new("RGB", (2000, 1500), "teal").save(body, format="JPEG")
+    body.seek(0)
+    s3.upload_fileobj(body, "itineraries/cover.jpg", content_type="image/jpeg")
+
+    keys = image_derivatives.generate_variants("itineraries/cover.jpg")
+
+    assert keys == image_derivatives.variant_keys("itineraries/cover.jpg")
+    thumb = io.BytesIO()
+    s3.download_fileobj(keys["thumb"], thumb)
+    with Image.open(thumb) as image:
+        assert image.format == "WEBP"
+        assert max(image.size) == 320
+
+
+def test_missing_original_is_recorded_as_a_retryable_failure(s3):
+    with pytest.raises(Exception) as missing:
+        image_derivatives.generate_variants("itineraries/never-uploaded.jpg")
+
+    first = image_derivatives.failure_record(None, missing.value)
+    second = image_derivatives.failure_record(first, missing.value)
+    assert first["missing"] is True
+    assert (first["attempts"], second["attempts"]) == (1, 2)
+
+    # ✅ Missing originals are retried past the attempt cap (the upload may still land)
+    exhausted = {**first, "attempts": settings.IMAGE_VARIANT_MAX_ATTEMPTS + 3}
+    later = datetime.fromisoformat(first["failed_at"]) + timedelta(seconds=settings.IMAGE_VARIANT_RETRY_MAX_SECONDS)
+    assert image_derivatives.retry_due(exhausted, now=later)
+
+
+def test_failures_are_retried_with_exponential_backoff():
+    failed_at = datetime(2025, 7, 1, 12, 0)
+    record = {"error": "cannot identify image file", "missing": False, "failed_at": failed_at.isoformat(), "attempts": 3}
+    backoff = settings.IMAGE_VARIANT_RETRY_BASE_SECONDS * 4
+
+    assert not image_derivatives.retry_due(record, now=failed_at + timedelta(seconds=backoff - 1))
+    assert image_derivatives.retry_due(record, now=failed_at + timedelta(seconds=backoff))
+
+    gave_up = {**record, "attempts": settings.IMAGE_VARIANT_MAX_ATTEMPTS}
+    assert not image_derivatives.retry_due(gave_up, now=failed_at + timedelta(days=30))
+
+    assert image_derivatives.retry_due(None)
+    assert not image_derivatives.retry_due({"thumb": "a_thumb.webp", "medium": "a_medium.webp"})
+    assert image_derivatives.retry_due({"error": "recorded before timestamps"})
+
+
+def test_detail_backfill_only_schedules_due_covers(monkeypatch):
+    scheduled = []
+    monkeypatch.setattr(image_derivatives, "schedule_variants", lambda key, itinerary_id: scheduled.append(key))
+    recent_failure = image_derivatives.failure_record(None, ValueError("cannot identify image file"))
+
+    def itinerary(name, **extra):
+        return SimpleNamespace(id=uuid.uuid4(), extra_data={"image_url": f"https://bucket.s3.amazonaws.com/itineraries/{name}.jpg", **extra})
+
+    image_derivatives.schedule_missing_itinerary_variants([
+        itinerary("fresh"),
+        itinerary("done", image_variants={"thumb": "t.webp", "medium": "m.webp"}),
+        itinerary("just-failed", image_variants=recent_failure),
+        itinerary("failed-long-ago", image_variants={**recent_failure, "failed_at": "2020-01-01T00:00:00"}),
+        SimpleNamespace(id=uuid.uuid4(), extra_data=None),
+    ])
+
+    assert scheduled == ["itineraries/fresh.jpg", "itineraries/failed-long-ago.jpg"]
+
+
+@pytest.fixture
+def run_jobs_inline(db, monkeypatch):
+    """
+    Runs derivative jobs synchronously, recording through the test's connection.
+    """
+    from sqlalchemy.orm import Session
+    from app.db import db as db_module
+
+    monkeypatch.setattr(db_module, "SessionLocal", lambda: Session(bind=db.connection(), join_transaction_mode="create_savepoint"))
+    monkeypatch.setattr(image_derivatives._executor, "submit", lambda job, *args: job(*args))
+
+
+def _upload_jpeg(s3, object_key):
+    from PIL import Image
+
+    body = io.BytesIO()
+    Image.new("RGB", (800, 800), "orange").save(body, format="JPEG")
+    body.seek(0)
+    s3.upload_fileobj(body, object_key, content_type="image/jpeg")
+
+
+def test_profile_photo_variants_are_recorded_on_the_user(client, db, user, s3, run_jobs_inline):
+    from app.models.user_model import User
+
+    assert client.get(f"/users/{user}").json()["profile_photo_variants"] is None
+
+    # Pre-signed flow: the upload-complete call comes before the PUT has landed, then again after it
+    early = client.post(f"/images/profile-photo-upload-complete/?user_id={user}")
+    assert early.status_code == 200
+    db.expire_all()
+    failed = db.get(User, user).profile_photo_variants
+    assert failed["missing"] is True and failed["attempts"] == 1
+
+    _upload_jpeg(s3, s3.profile_photo_key(user))
+    assert client.post(f"/images/profile-photo-upload-complete/?user_id={user}").json()["queued"] is True
+
+    variants = client.get(f"/users/{user}").json()["profile_photo_variants"]
+    assert set(variants) == {"thumb", "medium"}
+    assert f"users/{user}/profile_thumb.webp?ts=" in variants["thumb"]
+
+
+def test_profile_photo_upload_complete_requires_a_user(client):
+    response = client.post(f"/images/profile-photo-upload-complete/?user_id={uuid.uuid4()}")
+    assert response.status_code == 404
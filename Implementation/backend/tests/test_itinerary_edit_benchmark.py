@@ -0,0 +1,88 @@
+import os
+import time
+import uuid
+from datetime import datetime
+from app.models.itinerary_models import Activity, Itinerary
+from app.services.itinerary_service import itinerary_edit
+
+# ✅ Write throughput for a burst of activity edits (run with -s to see the report).
+# Every edit is one transaction whose only extra statement is the parent's UPDATE ... RETURNING;
+# the old handlers committed the child change, SELECTed the itinerary and committed again.
+# Commits here are savepoint releases inside the test's transaction, so the WAL flush a real
+# commit pays is not in the timings; statements and commits per edit are the numbers to watch.
+EDITS = int(os.getenv("BENCH_EDITS", "300"))
+
+
+def _count(sql_statements):
+    commits = sum(1 for statement in sql_statements if statement.startswith("RELEASE SAVEPOINT"))
+    statements = sum(1 for statement in sql_statements if not statement.startswith(("SAVEPOINT", "RELEASE", "ROLLBACK")))
+    return statements, commits
+
+
+def test_activity_edit_burst_through_the_endpoints(client, db, user, make_itinerary, sql_statements):
+    itinerary = make_itinerary(days=1, activities=0)
+    day_id = itinerary.days[0].id
+    base = f"/itineraries/{itinerary.id}/days/{day_id}/activities"
+    headers = {"X-User-Id": str(user)}
+
+    sql_statements.clear()
+    started = time.perf_counter()
+    activity_id = None
+    for edit in range(EDITS):
+        if edit % 3 == 0:
+            response = client.post(f"{base}/", json={"itinerary_day_id": str(day_id), "time": "9AM", "name": f"Stop {edit}"}, headers=headers)
+            activity_id = response.json()["id"]
+        elif edit % 3 == 1:
+            update = {"time": "10:00 AM", "name": f"Stop {edit}", "location": "Granville Island", "notes": "moved", "estimated_cost": 12.5}
+            response = client.put(f"{base}/{activity_id}", json=update, headers=headers)
+        else:
+            response = client.delete(f"{base}/{activity_id}", headers=headers)
+        assert response.status_code == 200
+    elapsed = time.perf_counter() - started
+    statements, commits = _count(sql_statements)
+
+    print(
+        f"\n{EDITS} add/update/delete activity requests: {EDITS / elapsed:.0f} edits/s, "
+        f"{statements / EDITS:.1f} statements and {commits / EDITS:.1f} commits per edit"
+    )
+    assert commits == EDITS
+
+
+def _legacy_add(db, itinerary_id, day_id, user_id, name):
+    # The old handlers: commit the child, load the parent, bump it, commit again
+    db.add(Activity(id=uuid.uuid4(), itinerary_day_id=day_id, time="09:00 AM", name=name))
+    db.commit()
+    itinerary = db.query(Itinerary).filter(Itinerary.id == itinerary_id).first()
+    itinerary.updated_at = datetime.utcnow()
+    itinerary.last_updated_by = user_id
+    db.commit()
+
+
+def _unit_of_work_add(db, itinerary_id, day_id, user_id, name):
+    with itinerary_edit(db, itinerary_id, user_id):
+        db.add(Activity(id=uuid.uuid4(), itinerary_day_id=day_id, time="09:00 AM", name=name))
+
+
+def _burst(db, sql_statements, add, itinerary_id, day_id, user_id):
+    sql_statements.clear()
+    started = time.perf_counter()
+    for edit in range(EDITS):
+        add(db, itinerary_id, day_id, user_id, f"Stop {edit}")
+    elapsed = time.perf_counter() - started
+    statements, commits = _count(sql_statements)
+    return EDITS / elapsed, statements / EDITS, commits / EDITS
+
+
+def test_unit_of_work_vs_double_commit(db, user, make_itinerary, sql_statements):
+    itinerary = make_itinerary(days=1, activities=0)
+    itinerary_id, day_id = itinerary.id, itinerary.days[0].id
+
+    legacy = _burst(db, sql_statements, _legacy_add, itinerary_id, day_id, user)
+    unit_of_work = _burst(db, sql_statements, _unit_of_work_add, itinerary_id, day_id, user)
+
+    print(f"\n{EDITS} activity inserts with the itinerary bump:")
+    print(f"  double commit: {legacy[0]:6.0f} edits/s, {legacy[1]:.1f} statements, {legacy[2]:.1f} commits per edit")
+    print(f"  unit of work:  {unit_of_work[0]:6.0f} edits/s, {unit_of_work[1]:.1f} statements, {unit_of_work[2]:.1f} commits per edit")
+    assert unit_of_work[2] == 1 and legacy[2] == 2
+    assert unit_of_work[1] == 2  # UPDATE itineraries ... RETURNING, INSERT activities
+    assert unit_of_work[1] < legacy[1]
@@ -0,0 +1,33 @@
+import copy
+from sqlalchemy import text
+from app.config.config import settings
+
+
+def test_reads_never_change_stored_extra_data(client, db, user, make_itinerary, s3, monkeypatch):
+    monkeypatch.setattr(settings, "ITINERARY_DETAIL_CACHE_ENABLED", False)  # Project on every read
+    key = "itineraries/cover.jpg"
+    stored = {
+        "image_url": s3.object_url(key),
+        "image_variants": {"thumb": "itineraries/cover_thumb.webp", "medium": "itineraries/cover_medium.webp"},
+        "theme": "coast",
+    }
+    itinerary = make_itinerary(days=2, activities=1, extra_data=copy.deepcopy(stored))
+    itinerary_id = itinerary.id
+
+    for read in range(1000):
+        if read % 2:
+            response = client.get(f"/itineraries/{itinerary_id}")
+            extra_data, variant = response.json()["extra_data"], "cover_medium.webp"
+        else:
+            response = client.get(f"/itineraries/users/{user}/itineraries")
+            extra_data, variant = response.json()[0]["extra_data"], "cover_thumb.webp"
+        assert response.status_code == 200
+        assert variant in extra_data["image_url"] and "Signature=" in extra_data["image_url"]
+        assert "image_variants" not in extra_data
+
+    assert not db.dirty
+    db.commit()  # A session that later commits must not persist the signed URL
+    assert itinerary.extra_data == stored
+    assert db.execute(
+        text("SELECT extra_data FROM itineraries WHERE id = :id"), {"id": itinerary_id}
+    ).scalar() == stored
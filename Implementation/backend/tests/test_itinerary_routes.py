@@ -0,0 +1,83 @@
+def _detail_queries(client, db, itinerary, sql_statements):
+    itinerary_id = itinerary.id
+    db.expunge_all()  # Nothing preloaded from the fixture; the route loads the whole tree itself
+    sql_statements.clear()
+    response = client.get(f"/itineraries/{itinerary_id}")
+    assert response.status_code == 200
+    return len(sql_statements), response.json()
+
+
+def test_itinerary_detail_query_count_does_not_grow_with_days(client, db, make_itinerary, sql_statements):
+    small, small_body = _detail_queries(client, db, make_itinerary(days=1, activities=1), sql_statements)
+    large, large_body = _detail_queries(client, db, make_itinerary(days=14, activities=5), sql_statements)
+
+    assert len(small_body["days"]) == 1
+    assert len(large_body["days"]) == 14
+    assert sum(len(day["activities"]) for day in large_body["days"]) == 70
+    # Version check, itinerary + days (joined), activities (selectin)
+    assert small == large == 3
+
+
+def test_itinerary_detail_etag_is_stable_until_the_itinerary_changes(client, db, user, make_itinerary, monkeypatch):
+    import time
+
+    itinerary = make_itinerary(days=2, activities=1)
+    itinerary_id, day_id = itinerary.id, itinerary.days[0].id
+    etag = client.get(f"/itineraries/{itinerary_id}").headers["ETag"]
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 3600)  # Well past the presigned-URL refresh margin
+    revalidated = client.get(f"/itineraries/{itinerary_id}", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == etag
+
+    edited = client.put(
+        f"/itineraries/{itinerary_id}/days/{day_id}",
+        json={"date": "2025-07-01T00:00:00", "title": "Arrival"},
+        headers={"X-User-Id": str(user)},
+    )
+    assert edited.status_code == 200
+    changed = client.get(f"/itineraries/{itinerary_id}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_day_batch_only_touches_activities_in_that_day(client, db, user, make_itinerary):
+    from app.models.itinerary_models import Activity
+
+    itinerary = make_itinerary(days=2, activities=1)
+    itinerary_id = itinerary.id
+    day, other_day = itinerary.days[0], itinerary.days[1]
+    own, foreign = day.activities[0].id, other_day.activities[0].id
+
+    response = client.post(
+        f"/itineraries/{itinerary_id}/days/{day.id}/activities/batch",
+        json={"operations": [
+            {"op": "update", "activity_id": str(foreign), "name": "Hijacked"},
+            {"op": "delete", "activity_id": str(foreign)},
+            {"op": "update", "activity_id": str(own), "day_id": str(other_day.id)},
+            {"op": "update", "activity_id": str(own), "name": "Renamed"},
+        ]},
+        headers={"X-User-Id": str(user)},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert [result["status"] for result in body["results"]] == ["error", "error", "error", "ok"]
+    assert body["results"][0]["detail"] == body["results"][1]["detail"] == "Activity not found"
+    assert body["results"][2]["detail"] == "Itinerary day not found"
+
+    db.expire_all()
+    assert db.get(Activity, foreign).name == "Activity 1"
+    assert db.get(Activity, own).name == "Renamed"
+    assert db.get(Activity, own).itinerary_day_id == day.id
+
+
+def test_day_batch_rejects_a_day_from_another_itinerary(client, user, make_itinerary):
+    itinerary = make_itinerary(days=1, activities=0)
+    other = make_itinerary(days=1, activities=0)
+    response = client.post(
+        f"/itineraries/{itinerary.id}/days/{other.days[0].id}/activities/batch",
+        json={"operations": [{"op": "create", "time": "10:00 AM", "name": "Museum"}]},
+        headers={"X-User-Id": str(user)},
+    )
+    assert response.status_code == 404
@@ -0,0 +1,77 @@
+from datetime import timedelta
+import pytest
+from fastapi import HTTPException
+from app.models.itinerary_models import Activity, ItineraryDay
+from app.schemas.itinerary_schema import ActivityBatchOperation, ReorderDayItem
+from app.services.itinerary_service import apply_activity_batch, reorder_itinerary_days
+
+
+def _writes(statements):
+    return [statement.split()[0:3] for statement in statements if statement.lstrip().startswith(("INSERT", "UPDATE", "DELETE"))]
+
+
+def test_activity_batch_locks_the_itinerary_before_its_activities(db, user, make_itinerary, sql_statements):
+    itinerary = make_itinerary(days=2, activities=2)
+    day = itinerary.days[0]
+    activity, other = day.activities
+    operations = [
+        ActivityBatchOperation(op="create", day_id=day.id, time="8AM", name="Breakfast"),
+        ActivityBatchOperation(op="update", activity_id=activity.id, name="Harbour walk"),
+        ActivityBatchOperation(op="delete", activity_id=other.id),
+    ]
+    sql_statements.clear()
+
+    results, updated_at = apply_activity_batch(db, itinerary.id, operations, user)
+
+    assert [result.status for result in results] == ["ok", "ok", "ok"]
+    assert updated_at is not None
+    writes = _writes(sql_statements)
+    assert writes[0] == ["UPDATE", "itineraries", "SET"]  # Parent row first, same order as single-activity edits
+    assert {tuple(write) for write in writes[1:]} <= {
+        ("DELETE", "FROM", "activities"), ("INSERT", "INTO", "activities"), ("UPDATE", "activities", "SET"),
+    }
+    assert db.query(Activity).filter(Activity.itinerary_day_id == day.id).count() == 2
+
+
+def _day_order(db, itinerary_id):
+    return [
+        day_id for (day_id,) in
+        db.query(ItineraryDay.id).filter(ItineraryDay.itinerary_id == itinerary_id).order_by(ItineraryDay.order_index)
+    ]
+
+
+def test_reorder_days_bumps_the_itinerary_before_the_days(db, user, make_itinerary, sql_statements):
+    itinerary = make_itinerary(days=3, activities=0)
+    day_ids = _day_order(db, itinerary.id)
+    sql_statements.clear()
+
+    reorder_itinerary_days(
+        db,
+        itinerary.id,
+        [ReorderDayItem(id=day_id, order_index=index) for index, day_id in enumerate(reversed(day_ids))],
+        user,
+        expected_updated_at=itinerary.updated_at,
+    )
+
+    assert [write[:2] for write in _writes(sql_statements)] == [["UPDATE", "itineraries"], ["UPDATE", "itinerary_days"]]
+    assert _day_order(db, itinerary.id) == list(reversed(day_ids))
+
+
+def test_reorder_days_with_stale_version_writes_nothing(db, user, make_itinerary, sql_statements):
+    itinerary = make_itinerary(days=3, activities=0)
+    day_ids = _day_order(db, itinerary.id)
+    stale = itinerary.updated_at - timedelta(seconds=1)
+    sql_statements.clear()
+
+    with pytest.raises(HTTPException) as error:
+        reorder_itinerary_days(
+            db,
+            itinerary.id,
+            [ReorderDayItem(id=day_id, order_index=index) for index, day_id in enumerate(reversed(day_ids))],
+            user,
+            expected_updated_at=stale,
+        )
+
+    assert error.value.status_code == 409
+    assert not any("itinerary_days" in statement for statement in sql_statements if statement.lstrip().startswith("UPDATE"))
+    assert _day_order(db, itinerary.id) == day_ids
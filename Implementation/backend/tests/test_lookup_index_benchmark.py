@@ -0,0 +1,183 @@
+import os
+import re
+import statistics
+import time
+from sqlalchemy import event, text
+
+# ✅ Benchmark for the lookup indexes of migrations 0004-0006 (run with -s to see the report).
+# Seeds BENCH_USERS users with itineraries, days, activities, members, favorites and quiz results,
+# then times the read endpoints of itinerary_routes, user_favorite_routes and quiz_routes and
+# EXPLAINs every statement they send: first with the indexes, then with them dropped (inside the
+# test's transaction, so the rollback restores them), i.e. before/after the migrations.
+USERS = int(os.getenv("BENCH_USERS", "500"))
+ITINERARIES_PER_USER = 3
+DAYS_PER_ITINERARY = 5
+ACTIVITIES_PER_DAY = 4
+FAVORITES_PER_USER = 10
+PLACES = 500
+REPEATS = int(os.getenv("BENCH_REPEATS", "20"))
+
+LOOKUP_INDEXES = {
+    "ix_itineraries_created_by_updated_at": "itineraries",
+    "ix_itinerary_days_itinerary_id_order_index": "itinerary_days",
+    "ix_activities_itinerary_day_id_created_at": "activities",
+    "uq_itinerary_members_itinerary_id_user_id": "itinerary_members",
+    "uq_user_favorites_user_id_place_id": "user_favorites",
+    "uq_quiz_results_user_id": "quiz_results",
+}
+
+# Endpoint -> the index its plans must use once the migrations ran
+ENDPOINTS = {
+    "GET /itineraries/{id}": "ix_activities_itinerary_day_id_created_at",
+    "GET /itineraries/{id}/days/{day_id}": "ix_activities_itinerary_day_id_created_at",
+    "GET /itineraries/{id}/members/": "uq_itinerary_members_itinerary_id_user_id",
+    "GET /itineraries/users/{user_id}/itineraries": "ix_itineraries_created_by_updated_at",
+    "GET /itineraries/users/{user_id}/itineraries/recent": "ix_itineraries_created_by_updated_at",
+    "GET /user_favorites/{user_id}": "uq_user_favorites_user_id_place_id",
+    "GET /quiz_results/user/{user_id}": "uq_quiz_results_user_id",
+    "POST /quiz_results/": "uq_quiz_results_user_id",  # ON CONFLICT (user_id) needs the index; "after" only
+}
+
+INDEX_IN_PLAN = re.compile(r"(?:Index (?:Only )?Scan(?: Backward)? using|Bitmap Index Scan on|Conflict Arbiter Indexes:) (\w+)")
+
+
+def _seed(db):
+    params = {
+        "users": USERS,
+        "itineraries": ITINERARIES_PER_USER,
+        "days": DAYS_PER_ITINERARY,
+        "activities": ACTIVITIES_PER_DAY,
+        "favorites": FAVORITES_PER_USER,
+        "places": PLACES,
+    }
+    statements = [
+        "CREATE TEMP TABLE bench_users ON COMMIT DROP AS "
+        "SELECT gen_random_uuid() AS id, n FROM generate_series(1, :users) n",
+        "INSERT INTO users (id, name, email, password_hash, status, created_at) "
+        "SELECT id, 'Bench ' || n, id || '@bench.example.com', 'x', 'active', now() FROM bench_users",
+        "INSERT INTO places (name, category, latitude, longitude, source_api, rating, created_at, last_updated) "
+        "SELECT 'Bench place ' || n || ' ' || gen_random_uuid(), 'Cafe', 49 + random(), -123 + random(), 'bench', 4.0, now(), now() "
+        "FROM generate_series(1, :places) n",
+        "CREATE TEMP TABLE bench_places ON COMMIT DROP AS "
+        "SELECT id, row_number() OVER (ORDER BY id) AS n FROM places WHERE source_api = 'bench'",
+        "INSERT INTO itineraries (id, name, destination, start_date, end_date, created_by, last_updated_by, created_at, updated_at) "
+        "SELECT gen_random_uuid(), 'Trip ' || i, 'Vancouver', now(), now() + interval '4 days', u.id, u.id, now(), "
+        "now() - (random() * interval '90 days') FROM bench_users u, generate_series(1, :itineraries) i",
+        "INSERT INTO itinerary_days (id, itinerary_id, date, title, order_index, created_at) "
+        "SELECT gen_random_uuid(), it.id, it.start_date + (d - 1) * interval '1 day', 'Day ' || d, d - 1, now() "
+        "FROM itineraries it JOIN bench_users u ON u.id = it.created_by, generate_series(1, :days) d",
+        "INSERT INTO activities (id, itinerary_day_id, time, name, notes, estimated_cost, created_at) "
+        "SELECT gen_random_uuid(), day.id, '09:00 AM', 'Activity ' || a, '', 0, now() + a * interval '1 microsecond' "
+        "FROM itinerary_days day JOIN itineraries it ON it.id = day.itinerary_id JOIN bench_users u ON u.id = it.created_by, "
+        "generate_series(1, :activities) a",
+        "INSERT INTO itinerary_members (id, itinerary_id, user_id, role, joined_at) "
+        "SELECT gen_random_uuid(), it.id, it.created_by, 'Owner', now() FROM itineraries it JOIN bench_users u ON u.id = it.created_by",
+        "INSERT INTO itinerary_members (id, itinerary_id, user_id, role, joined_at) "
+        "SELECT gen_random_uuid(), it.id, other.id, 'Editor', now() "
+        "FROM itineraries it JOIN bench_users u ON u.id = it.created_by JOIN bench_users other ON other.n = u.n % :users + 1",
+        "INSERT INTO user_favorites (id, user_id, place_id, added_at) "
+        "SELECT gen_random_uuid(), u.id, p.id, now() - f * interval '1 minute' "
+        "FROM bench_users u, generate_series(1, :favorites) f JOIN bench_places p ON p.n = f",
+        "INSERT INTO quiz_results (id, user_id, travel_style) SELECT gen_random_uuid(), id, 'adventure' FROM bench_users",
+    ]
+    for statement in statements:
+        db.execute(text(statement), params)
+    for table in set(LOOKUP_INDEXES.values()) | {"users", "places"}:
+        db.execute(text(f"ANALYZE {table}"))
+
+    samples = db.execute(text(
+        "SELECT u.id AS user_id, it.id AS itinerary_id, "
+        "(SELECT day.id FROM itinerary_days day WHERE day.itinerary_id = it.id ORDER BY day.order_index LIMIT 1) AS day_id "
+        "FROM bench_users u JOIN LATERAL (SELECT id FROM itineraries WHERE created_by = u.id LIMIT 1) it ON true "
+        "ORDER BY u.n LIMIT :repeats"
+    ), {"repeats": REPEATS}).all()
+    return samples
+
+
+def _requests(name, sample):
+    user_id, itinerary_id, day_id = sample
+    path = (
+        name.split(" ", 1)[1]
+        .replace("{id}", str(itinerary_id))
+        .replace("{day_id}", str(day_id))
+        .replace("{user_id}", str(user_id))
+    )
+    if name.startswith("POST"):
+        return "post", path, {"json": {"user_id": str(user_id), "travel_style": "relaxation"}}
+    return "get", path, {}
+
+
+def _measure(client, engine, db, samples, endpoints):
+    """
+    Returns {endpoint: (median ms, [plan, ...])}; plans come from EXPLAINing the statements of one request.
+    """
+    report = {}
+    for name in endpoints:
+        captured = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            captured.append((statement, parameters))
+
+        method, path, kwargs = _requests(name, samples[0])
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            assert getattr(client, method)(path, **kwargs).status_code == 200, name
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        timings = []
+        for sample in samples:
+            method, path, kwargs = _requests(name, sample)
+            started = time.perf_counter()
+            response = getattr(client, method)(path, **kwargs)
+            timings.append((time.perf_counter() - started) * 1000)
+            assert response.status_code == 200, name
+
+        plans = [
+            "\n".join(row[0] for row in db.connection().exec_driver_sql(f"EXPLAIN (COSTS OFF) {statement}", parameters))
+            for statement, parameters in captured
+            if not statement.lstrip().upper().startswith(("SAVEPOINT", "RELEASE", "ROLLBACK"))
+        ]
+        report[name] = (statistics.median(timings), plans)
+    return report
+
+
+def _indexes_used(plans):
+    return {index for plan in plans for index in INDEX_IN_PLAN.findall(plan)}
+
+
+def test_lookup_indexes_serve_the_hot_endpoints(client, db, engine, monkeypatch):
+    from app.config.config import settings
+
+    monkeypatch.setattr(settings, "ITINERARY_DETAIL_CACHE_ENABLED", False)  # Time the queries, not the cache
+    started = time.perf_counter()
+    samples = _seed(db)
+    print(
+        f"\nSeeded {USERS} users, {USERS * ITINERARIES_PER_USER} itineraries, "
+        f"{USERS * ITINERARIES_PER_USER * DAYS_PER_ITINERARY * ACTIVITIES_PER_DAY} activities, "
+        f"{USERS * FAVORITES_PER_USER} favorites in {time.perf_counter() - started:.1f} s"
+    )
+
+    after = _measure(client, engine, db, samples, ENDPOINTS)
+
+    for index in LOOKUP_INDEXES:
+        db.execute(text(f"DROP INDEX {index}"))
+    for table in set(LOOKUP_INDEXES.values()):
+        db.execute(text(f"ANALYZE {table}"))
+    before = _measure(client, engine, db, samples, [name for name in ENDPOINTS if not name.startswith("POST")])
+
+    print(f"\n{'endpoint':55} {'without':>10} {'with':>10}  indexes used")
+    for name, (median_ms, plans) in after.items():
+        without = f"{before[name][0]:.1f} ms" if name in before else "n/a"
+        print(f"{name:55} {without:>10} {median_ms:>7.1f} ms  {', '.join(sorted(_indexes_used(plans)))}")
+    for name, (_, plans) in after.items():
+        print(f"\n--- {name} (with indexes)")
+        print("\n\n".join(plans))
+        if name in before:
+            print(f"--- {name} (without)")
+            print("\n\n".join(before[name][1]))
+
+    for name, index in ENDPOINTS.items():
+        assert index in _indexes_used(after[name][1]), f"{name} does not use {index}"
+    for name, (_, plans) in before.items():
+        assert not _indexes_used(plans) & set(LOOKUP_INDEXES), name
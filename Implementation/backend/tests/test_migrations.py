@@ -0,0 +1,102 @@
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from app.db.migrations import _0006_lookup_indexes
+
+
+def _drop_unique_indexes(db):
+    # Recreate the pre-0006 state (inside the test transaction) so duplicates can be inserted
+    for name in ("uq_itinerary_members_itinerary_id_user_id", "uq_user_favorites_user_id_place_id", "uq_quiz_results_user_id"):
+        db.execute(text(f"DROP INDEX {name}"))
+
+
+def _itinerary(db, user_id):
+    itinerary_id = uuid.uuid4()
+    db.execute(
+        text(
+            "INSERT INTO itineraries (id, name, destination, start_date, end_date, created_by, last_updated_by) "
+            "VALUES (:id, 'Trip', 'Vancouver', now(), now(), :user_id, :user_id)"
+        ),
+        {"id": itinerary_id, "user_id": user_id},
+    )
+    return itinerary_id
+
+
+def test_duplicate_members_keep_the_owner(db, make_user):
+    owner, other = make_user(), make_user()
+    itinerary_id = _itinerary(db, owner)
+    _drop_unique_indexes(db)
+
+    joined = datetime(2025, 1, 1)
+    rows = [
+        (other, "Editor", joined),
+        (other, "Viewer", joined + timedelta(days=1)),
+        (owner, "Editor", joined),  # Earlier than the Owner row, but the Owner row must survive
+        (owner, "Owner", joined + timedelta(days=1)),
+    ]
+    for user_id, role, joined_at in rows:
+        db.execute(
+            text("INSERT INTO itinerary_members (id, itinerary_id, user_id, role, joined_at) VALUES (:id, :itinerary_id, :user_id, :role, :joined_at)"),
+            {"id": uuid.uuid4(), "itinerary_id": itinerary_id, "user_id": user_id, "role": role, "joined_at": joined_at},
+        )
+
+    _0006_lookup_indexes(db.connection())
+
+    survivors = dict(db.execute(
+        text("SELECT user_id, role FROM itinerary_members WHERE itinerary_id = :id"), {"id": itinerary_id}
+    ).all())
+    assert survivors == {owner: "Owner", other: "Editor"}
+
+
+def test_duplicate_favorites_keep_the_earliest(db, user):
+    place_id = db.execute(text(
+        "INSERT INTO places (name, category, latitude, longitude, source_api) "
+        "VALUES (:name, 'park', 0, 0, 'test') RETURNING id"
+    ), {"name": f"Place {uuid.uuid4()}"}).scalar()
+    _drop_unique_indexes(db)
+
+    added = datetime(2025, 1, 1)
+    for days in (2, 0, 1):
+        db.execute(
+            text("INSERT INTO user_favorites (id, user_id, place_id, added_at) VALUES (:id, :user_id, :place_id, :added_at)"),
+            {"id": uuid.uuid4(), "user_id": user, "place_id": place_id, "added_at": added + timedelta(days=days)},
+        )
+
+    _0006_lookup_indexes(db.connection())
+
+    assert db.execute(
+        text("SELECT added_at FROM user_favorites WHERE user_id = :user_id"), {"user_id": user}
+    ).scalars().all() == [added]
+
+
+def test_duplicate_quiz_results_keep_the_latest(db, user):
+    _drop_unique_indexes(db)
+    for style in ("relaxation", "cultural", "adventure"):
+        db.execute(text("SAVEPOINT write"))  # Each write gets its own (sub)transaction id
+        db.execute(
+            text("INSERT INTO quiz_results (id, user_id, travel_style) VALUES (:id, :user_id, :style)"),
+            {"id": uuid.uuid4(), "user_id": user, "style": style},
+        )
+        db.execute(text("RELEASE SAVEPOINT write"))
+
+    _0006_lookup_indexes(db.connection())
+
+    assert db.execute(
+        text("SELECT travel_style FROM quiz_results WHERE user_id = :user_id"), {"user_id": user}
+    ).scalars().all() == ["adventure"]
+
+
+def test_migrations_run_without_the_statement_timeout(engine, monkeypatch):
+    from app.db import migrations
+
+    seen = []
+    monkeypatch.setattr(migrations, "MIGRATIONS", [
+        ("test_statement_timeout", lambda conn: seen.append(conn.execute(text("SHOW statement_timeout")).scalar())),
+    ])
+    try:
+        migrations.run_migrations(engine)
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM schema_migrations WHERE version = 'test_statement_timeout'"))
+
+    assert seen == ["0"]
@@ -0,0 +1,105 @@
+import asyncio
+import os
+import statistics
+import time
+import uuid
+from types import SimpleNamespace
+import httpx
+import pytest
+from app.routes import chatbot_routes
+from app.services import chat_service
+
+# ✅ One worker (one event loop) under BENCH_COMPLETIONS concurrent POST /chatbot/ calls whose
+# OpenAI upstream is stubbed to take COMPLETION_DELAY seconds (run with -s to see the report).
+# An unrelated endpoint is probed throughout: with the async client it keeps answering in
+# milliseconds, and the completions overlap instead of queuing. For comparison the same run is
+# repeated with a stub that blocks like the old synchronous client did.
+COMPLETIONS = int(os.getenv("BENCH_COMPLETIONS", "100"))
+COMPLETION_DELAY = 1.0
+BLOCKING_COMPLETIONS = 10
+BLOCKING_DELAY = 0.1
+
+
+class _StubCompletions:
+    def __init__(self, delay: float, blocking: bool):
+        self.delay = delay
+        self.blocking = blocking
+        self.started = 0
+
+    async def create(self, model, messages, **params):
+        self.started += 1
+        if self.blocking:
+            time.sleep(self.delay)  # What a sync SDK call inside `async def` does to the event loop
+        else:
+            await asyncio.sleep(self.delay)
+        message = SimpleNamespace(content=f"Try {messages[-1]['content']}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+@pytest.fixture
+def stub_openai(client, monkeypatch):
+    """
+    Routes completions through OpenAICompletionBackend (upstream slot included) onto a stub client.
+    Grounding is skipped: it would share the test's single DB session across threads.
+    """
+    previous = chat_service._backend
+    chat_service.set_completion_backend(chat_service.OpenAICompletionBackend())
+    monkeypatch.setattr(chatbot_routes, "grounding_context", lambda db, travel_style, user_id: ("", []))
+
+    def use(delay: float, blocking: bool = False) -> _StubCompletions:
+        completions = _StubCompletions(delay, blocking)
+        stub = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        monkeypatch.setattr(chat_service, "get_openai_client", lambda: stub)
+        return completions
+
+    try:
+        yield use
+    finally:
+        chat_service.set_completion_backend(previous)
+
+
+async def _run(app, completions: int, stub: _StubCompletions):
+    """
+    Returns (seconds until every completion answered, probe latencies in ms). Probing starts once
+    every completion is waiting on the upstream (a blocking stub never gets there, so it starts at once).
+    """
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as http:
+        async def complete():
+            response = await http.post("/chatbot/", json={"user_message": uuid.uuid4().hex, "travel_style": "adventure"})
+            assert response.status_code == 200
+
+        probes = []
+        started = time.perf_counter()
+        pending = asyncio.gather(*[complete() for _ in range(completions)])
+        while not stub.blocking and stub.started < completions:
+            await asyncio.sleep(0.005)
+        while not pending.done():
+            probe_started = time.perf_counter()
+            response = await http.get("/places/cache/stats")
+            probes.append((time.perf_counter() - probe_started) * 1000)
+            assert response.status_code == 200
+            await asyncio.sleep(0.01)
+        await pending
+        return time.perf_counter() - started, probes
+
+
+def _p99(values):
+    return statistics.quantiles(values, n=100)[98] if len(values) > 1 else values[0]
+
+
+def test_worker_keeps_serving_during_slow_completions(client, stub_openai):
+    elapsed, probes = asyncio.run(_run(client.app, COMPLETIONS, stub_openai(COMPLETION_DELAY)))
+    blocking_elapsed, blocking_probes = asyncio.run(
+        _run(client.app, BLOCKING_COMPLETIONS, stub_openai(BLOCKING_DELAY, blocking=True))
+    )
+
+    print(
+        f"\n{COMPLETIONS} async completions x {COMPLETION_DELAY:.1f} s: all answered in {elapsed:.2f} s, "
+        f"{len(probes)} probes, p50 {statistics.median(probes):.1f} ms, p99 {_p99(probes):.1f} ms"
+        f"\n{BLOCKING_COMPLETIONS} blocking completions x {BLOCKING_DELAY:.1f} s: all answered in {blocking_elapsed:.2f} s, "
+        f"{len(blocking_probes)} probes, max {max(blocking_probes):.1f} ms"
+    )
+    assert elapsed < COMPLETION_DELAY * 3  # Overlapping, not one after another
+    assert len(probes) > 10
+    assert _p99(probes) < 100
+    assert blocking_elapsed >= BLOCKING_COMPLETIONS * BLOCKING_DELAY  # The old behaviour serializes
@@ -0,0 +1,40 @@
+import uuid
+from app.models.place_model import Place
+from app.services.place_service import upsert_places
+
+
+def _pages(client, path, limit):
+    items, cursor = [], None
+    while True:
+        response = client.get(path, params={"limit": limit, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        items += response.json()
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return items
+
+
+def test_user_favorites_pages(client, db, user):
+    names = [f"Favorite {index} {uuid.uuid4().hex[:8]}" for index in range(5)]
+    upsert_places(db, [
+        {"name": name, "category": "park", "latitude": 49.0 + index / 100, "longitude": -123.0,
+         "rating": 4.0, "source_api": "test", "cached_data": {}}
+        for index, name in enumerate(names)
+    ])
+    place_ids = [place_id for (place_id,) in db.query(Place.id).filter(Place.name.in_(names))]
+    assert client.post("/user_favorites/batch", json={"user_id": str(user), "add": place_ids}).status_code == 200
+
+    favorites = _pages(client, f"/user_favorites/{user}", limit=2)
+    assert sorted(favorite["place_id"] for favorite in favorites) == sorted(place_ids)
+
+
+def test_user_itineraries_pages(client, user, make_itinerary):
+    created = {str(make_itinerary(days=1, activities=0).id) for _ in range(5)}
+    itineraries = _pages(client, f"/itineraries/users/{user}/itineraries", limit=2)
+    assert len(itineraries) == 5
+    assert {itinerary["id"] for itinerary in itineraries} == created
+
+
+def test_invalid_cursor_is_rejected(client, user):
+    assert client.get(f"/user_favorites/{user}", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get(f"/itineraries/users/{user}/itineraries", params={"cursor": "bm9wZQ=="}).status_code == 400
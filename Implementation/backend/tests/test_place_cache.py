@@ -0,0 +1,51 @@
+import math
+import random
+from app.services.geo import haversine_m
+from app.services.place_cache import places_tile_cache, tile_for
+
+
+def _offset(latitude, longitude, distance_m, bearing):
+    d_lat = distance_m * math.cos(bearing) / 111_320
+    d_lon = distance_m * math.sin(bearing) / (111_320 * math.cos(math.radians(latitude)))
+    return latitude + d_lat, longitude + d_lon
+
+
+def test_tile_search_circle_covers_the_callers_circle():
+    rng = random.Random(7)
+    for _ in range(500):
+        latitude, longitude = rng.uniform(-60, 60), rng.uniform(-179, 179)
+        radius = rng.choice([100, 500, 1500, 5000, 20000])
+        _, center_lat, center_lon, upstream_radius = tile_for(latitude, longitude, radius, "relaxation")
+        # Points on the caller's circle must fall inside the upstream circle around the tile center
+        for bearing in (0, math.pi / 2, math.pi, 3 * math.pi / 2, rng.uniform(0, 2 * math.pi)):
+            edge = _offset(latitude, longitude, radius, bearing)
+            assert haversine_m(center_lat, center_lon, *edge) <= upstream_radius
+
+
+def _result(name, latitude, longitude):
+    return {
+        "displayName": {"text": name},
+        "location": {"latitude": latitude, "longitude": longitude},
+        "rating": 4.2,
+        "types": ["park"],
+    }
+
+
+def test_search_filters_tile_results_to_the_callers_point(client):
+    latitude, longitude, radius = 49.2827, -123.1207, 1000
+    key, center_lat, center_lon, _ = tile_for(latitude, longitude, radius, "relaxation")
+    places_tile_cache.set(key, {"places": [
+        _result("Far side of the tile", *_offset(latitude, longitude, 1400, 0)),
+        _result("Next door", *_offset(latitude, longitude, 50, 1)),
+        _result("Down the street", *_offset(latitude, longitude, 600, 2)),
+    ]})
+    try:
+        response = client.get(
+            "/places/search",
+            params={"location": f"{latitude},{longitude}", "radius": radius, "travel_style": "relaxation"},
+        )
+    finally:
+        places_tile_cache.delete(key)
+
+    assert response.status_code == 200
+    assert [place["name"] for place in response.json()] == ["Next door", "Down the street"]
@@ -0,0 +1,83 @@
+import os
+import random
+import statistics
+import time
+from sqlalchemy import insert
+from app.models.place_model import Place
+from app.services.geo import encode_geohash, haversine_m
+
+# ✅ Latency of /places/cached as the places table grows (run with -s to see the report).
+# The geohash + bounding-box lookup should stay flat; the old path (load every row, check the
+# distance in Python) is timed alongside it. Sizes come from BENCH_PLACE_SIZES, e.g.
+# BENCH_PLACE_SIZES=1000,10000,100000,1000000 for the full 1k -> 1M run.
+SIZES = [int(size) for size in os.getenv("BENCH_PLACE_SIZES", "1000,10000,50000").split(",")]
+REPEATS = int(os.getenv("BENCH_REPEATS", "5"))
+
+# Downtown Vancouver, with places spread over a ~4 x 4 degree box around it
+LAT, LON, RADIUS_M = 49.2827, -123.1207, 2_000
+SPREAD = 2.0
+
+
+def _top_up(db, current: int, size: int):
+    rng = random.Random(size)
+    rows = []
+    for n in range(current, size):
+        latitude = LAT + rng.uniform(-SPREAD, SPREAD)
+        longitude = LON + rng.uniform(-SPREAD, SPREAD)
+        rows.append({
+            "name": f"Bench place {n}",
+            "category": rng.choice(["park", "bar", "museum", "cafe"]),
+            "latitude": latitude,
+            "longitude": longitude,
+            "geohash": encode_geohash(latitude, longitude),
+            "rating": 4.0,
+            "source_api": "bench",
+        })
+    for start in range(0, len(rows), 10_000):
+        db.execute(insert(Place), rows[start:start + 10_000])
+    db.flush()
+
+
+def _full_scan(db):
+    # What /places/cached did before the geohash column: every row, distance checked in Python
+    return [
+        place for place in db.query(Place).all()
+        if haversine_m(LAT, LON, place.latitude, place.longitude) <= RADIUS_M
+    ]
+
+
+def _median_ms(db, call):
+    timings = []
+    for _ in range(REPEATS):
+        db.expunge_all()  # Don't let the identity map of the previous call help
+        started = time.perf_counter()
+        result = call()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), result
+
+
+def test_cached_places_latency_stays_flat_as_the_table_grows(client, db):
+    indexed, scanned = [], []
+    current = 0
+    print(f"\n{'places':>10} {'/places/cached':>15} {'full scan':>12} {'found':>6}")
+    for size in SIZES:
+        _top_up(db, current, size)
+        current = size
+        db.connection().exec_driver_sql("ANALYZE places")
+
+        def endpoint():
+            response = client.get("/places/cached", params={"location": f"{LAT},{LON}", "radius": RADIUS_M})
+            assert response.status_code == 200
+            return [place for place in response.json() if place["source_api"] == "bench"]
+
+        endpoint_ms, found = _median_ms(db, endpoint)
+        scan_ms, expected = _median_ms(db, lambda: _full_scan(db))
+        assert sorted(place["name"] for place in found) == sorted(place.name for place in expected if place.source_api == "bench")
+
+        indexed.append(endpoint_ms)
+        scanned.append(scan_ms)
+        print(f"{size:>10,} {endpoint_ms:>12.1f} ms {scan_ms:>9.1f} ms {len(found):>6}")
+
+    # Loose bounds: the indexed path must not grow with the table, and must beat the scan at scale
+    assert indexed[-1] < max(indexed[0] * 5, indexed[0] + 50)
+    assert indexed[-1] < scanned[-1]
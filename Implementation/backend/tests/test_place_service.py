@@ -0,0 +1,65 @@
+import uuid
+import pytest
+from sqlalchemy import text
+from app.services.geo import GEOHASH_PRECISION, bounding_box, covering_geohashes
+from app.services.place_service import find_places_within, upsert_places
+
+# Downtown Vancouver; a 10 km radius is covered by prefixes shorter than the stored precision
+LAT, LON, RADIUS_M = 49.2827, -123.1207, 10_000
+
+
+def _place(name, latitude, longitude, category="park"):
+    return {
+        "name": name,
+        "category": category,
+        "latitude": latitude,
+        "longitude": longitude,
+        "rating": 4.5,
+        "source_api": "Google Places",
+        "cached_data": {},
+    }
+
+
+@pytest.fixture
+def places(db):
+    suffix = uuid.uuid4().hex[:8]
+    upsert_places(db, [
+        _place(f"Stanley Park {suffix}", 49.3043, -123.1443),
+        _place(f"Queen Elizabeth Park {suffix}", 49.2418, -123.1126),
+        _place(f"Golden Gate Park {suffix}", 37.7694, -122.4862),  # Outside the radius
+    ])
+    db.flush()
+    return suffix
+
+
+def _names(rows, suffix):
+    return sorted(place.name for place in rows if place.name.endswith(suffix))
+
+
+def test_find_places_within_matches_prefixes_shorter_than_stored_geohash(db, places):
+    prefixes = covering_geohashes(*bounding_box(LAT, LON, RADIUS_M))
+    assert max(len(prefix) for prefix in prefixes) < GEOHASH_PRECISION
+
+    found = find_places_within(db, LAT, LON, RADIUS_M)
+    assert _names(found, places) == [f"Queen Elizabeth Park {places}", f"Stanley Park {places}"]
+
+
+def test_find_places_within_under_non_c_collation(db, places):
+    # ✅ en_US-style collations sort "~" before letters and digits; the prefix match must not depend on it
+    collation = db.execute(text(
+        "SELECT collname FROM pg_collation "
+        "WHERE collname IN ('en_US.utf8', 'en_US.UTF-8', 'en-US-x-icu', 'und-x-icu') LIMIT 1"
+    )).scalar()
+    if collation is None:
+        pytest.skip("No en_US / ICU collation in this Postgres build")
+    db.execute(text(f'ALTER TABLE places ALTER COLUMN geohash TYPE VARCHAR(12) COLLATE "{collation}"'))
+
+    found = find_places_within(db, LAT, LON, RADIUS_M)
+    assert _names(found, places) == [f"Queen Elizabeth Park {places}", f"Stanley Park {places}"]
+
+
+def test_cached_places_endpoint(client, places):
+    response = client.get("/places/cached", params={"location": f"{LAT},{LON}", "radius": RADIUS_M})
+    assert response.status_code == 200
+    names = [place["name"] for place in response.json() if place["name"].endswith(places)]
+    assert names == [f"Stanley Park {places}", f"Queen Elizabeth Park {places}"]  # Nearest first
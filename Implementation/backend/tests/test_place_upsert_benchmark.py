@@ -0,0 +1,103 @@
+import os
+import statistics
+import time
+import uuid
+import httpx
+import pytest
+from app.models.place_model import Place
+from app.routes import place_routes
+from app.services.geo import encode_geohash
+from app.services.place_service import upsert_places
+
+# ✅ DB round trips and latency of place ingestion in /places/search (run with -s to see the report).
+# The Google Places call is stubbed; every request hits a fresh tile so nothing is served from cache.
+# The batched upsert should send the same number of statements whatever the result count, where the
+# old path sent one duplicate-check SELECT per place before inserting the new ones.
+REQUESTS = int(os.getenv("BENCH_REQUESTS", "50"))
+RESULT_COUNTS = (1, 5, 20)
+
+
+def _google_result(name, latitude, longitude):
+    return {
+        "displayName": {"text": name},
+        "location": {"latitude": latitude, "longitude": longitude},
+        "rating": 4.2,
+        "types": ["park"],
+    }
+
+
+@pytest.fixture
+def google_places(monkeypatch):
+    """
+    Stubs the upstream: answers with `results` places next to `latitude`, whatever the tile.
+    """
+    state = {"results": 20, "latitude": 10.0, "suffix": uuid.uuid4().hex[:8]}
+
+    async def fake_upstream_request(upstream, method, url, **kwargs):
+        places = [
+            _google_result(f"Park {n} {state['suffix']}", state["latitude"] + n * 1e-4, -123.1207)
+            for n in range(state["results"])
+        ]
+        return httpx.Response(200, json={"places": places})
+
+    monkeypatch.setattr(place_routes, "upstream_request", fake_upstream_request)
+    return state
+
+
+def _search(client, sql_statements, latitude):
+    sql_statements.clear()
+    response = client.get("/places/search", params={"location": f"{latitude},-123.1207", "radius": 5000})
+    assert response.status_code == 200
+    return [statement for statement in sql_statements if not statement.startswith(("SAVEPOINT", "RELEASE"))]
+
+
+def test_search_ingestion_round_trips_do_not_grow_with_results(client, sql_statements, google_places):
+    counts = {}
+    for index, results in enumerate(RESULT_COUNTS):
+        google_places.update(results=results, latitude=10.0 + index)
+        counts[results] = len(_search(client, sql_statements, google_places["latitude"]))  # A new tile per request
+    refreshed = len(_search(client, sql_statements, 30.0))  # Another tile, answered with the same 20 places
+
+    print(f"\nstatements per /places/search: {counts} (by result count), {refreshed} when refreshing 20 places")
+    assert len(set(counts.values())) == 1
+    assert refreshed == counts[20]
+
+
+def _per_row_insert(db, places):
+    # What search_places did before the natural key: a duplicate check per place, then an INSERT
+    for place in places:
+        exists = (
+            db.query(Place)
+            .filter(Place.name == place["name"], Place.latitude == place["latitude"], Place.longitude == place["longitude"])
+            .first()
+        )
+        if not exists:
+            db.add(Place(**place, geohash=encode_geohash(place["latitude"], place["longitude"])))
+    db.flush()
+
+
+def _time_ingestion(db, sql_statements, ingest, suffix):
+    timings, statements = [], 0
+    for request in range(REQUESTS):
+        places = [
+            place_routes._place_data_from_result(_google_result(f"Park {n} {suffix}", 20 + request * 0.01 + n * 1e-4, 5.0))
+            for n in range(20)
+        ]
+        sql_statements.clear()
+        started = time.perf_counter()
+        ingest(db, places)
+        timings.append((time.perf_counter() - started) * 1000)
+        statements += len(sql_statements)
+    return statistics.median(timings), statements / REQUESTS
+
+
+def test_batched_upsert_vs_per_row_insert(db, sql_statements):
+    per_row_ms, per_row_statements = _time_ingestion(db, sql_statements, _per_row_insert, "per-row")
+    upsert_ms, upsert_statements = _time_ingestion(db, sql_statements, upsert_places, "upsert")
+
+    print(f"\n{REQUESTS} requests x 20 places")
+    print(f"  per-row insert: {per_row_ms:6.2f} ms/request, {per_row_statements:4.1f} statements/request")
+    print(f"  batched upsert: {upsert_ms:6.2f} ms/request, {upsert_statements:4.1f} statements/request")
+    assert upsert_statements == 1
+    assert per_row_statements > 20
+    assert upsert_ms < per_row_ms
@@ -0,0 +1,68 @@
+import os
+import statistics
+import time
+from app.aws import s3_client
+
+# ✅ List latency for a user with BENCH_ITINERARIES itineraries that all have a cover image
+# (run with -s to see the report): with the presigned-URL cache each URL is signed once per
+# ~55 minutes, without it every request re-signs every cover.
+ITINERARIES = int(os.getenv("BENCH_ITINERARIES", "200"))
+REPEATS = int(os.getenv("BENCH_REPEATS", "20"))
+
+
+class _NoCache:
+    def get(self, key):
+        return None
+
+    def set(self, key, value):
+        pass
+
+    def delete(self, key):
+        pass
+
+    def clear(self):
+        pass
+
+
+def _time_list(client, user, signed):
+    timings, signatures = [], []
+    for _ in range(REPEATS):
+        signed.clear()
+        started = time.perf_counter()
+        response = client.get(f"/itineraries/users/{user}/itineraries", params={"limit": 200})
+        timings.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200
+        assert len(response.json()) == min(ITINERARIES, 200)
+        signatures.append(len(signed))
+    return statistics.median(timings), statistics.median(signatures)
+
+
+def test_itinerary_list_latency_with_and_without_presign_cache(client, user, make_itinerary, s3, monkeypatch):
+    for number in range(ITINERARIES):
+        make_itinerary(days=0, activities=0, extra_data={"image_url": s3.object_url(f"itineraries/cover-{number}.jpg")})
+
+    # Count the actual signing calls
+    signed = []
+    boto_client = s3.get_s3_client()
+    generate_presigned_url = boto_client.generate_presigned_url
+
+    def counting_generate_presigned_url(*args, **kwargs):
+        signed.append(kwargs.get("Params", {}).get("Key"))
+        return generate_presigned_url(*args, **kwargs)
+
+    monkeypatch.setattr(boto_client, "generate_presigned_url", counting_generate_presigned_url)
+
+    client.get(f"/itineraries/users/{user}/itineraries", params={"limit": 200})  # Warm the cache
+    cached_ms, cached_signatures = _time_list(client, user, signed)
+
+    monkeypatch.setattr(s3_client, "presigned_get_cache", _NoCache())
+    uncached_ms, uncached_signatures = _time_list(client, user, signed)
+
+    print(
+        f"\nGET /itineraries/users/{{user_id}}/itineraries with {ITINERARIES} covers (median of {REPEATS}):"
+        f"\n  without cache: {uncached_ms:6.1f} ms, {uncached_signatures:.0f} signatures/request"
+        f"\n  with cache:    {cached_ms:6.1f} ms, {cached_signatures:.0f} signatures/request"
+    )
+    assert cached_signatures == 0
+    assert uncached_signatures == min(ITINERARIES, 200)
+    assert cached_ms < uncached_ms
@@ -0,0 +1,15 @@
+import uuid
+
+
+def test_quiz_result_create_then_update_keeps_one_row(client, user):
+    created = client.post("/quiz_results/", json={"user_id": str(user), "travel_style": "relaxation"})
+    updated = client.post("/quiz_results/", json={"user_id": str(user), "travel_style": "adventure"})
+
+    assert created.status_code == updated.status_code == 200
+    assert updated.json()["id"] == created.json()["id"]
+    assert updated.json()["travel_style"] == "adventure"
+
+
+def test_quiz_result_for_unknown_user(client):
+    response = client.post("/quiz_results/", json={"user_id": str(uuid.uuid4()), "travel_style": "relaxation"})
+    assert response.status_code == 404
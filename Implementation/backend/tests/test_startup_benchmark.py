@@ -0,0 +1,75 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+# ✅ Cold-start benchmark (run with -s to see the report): each run is a fresh interpreter that
+# imports app.main, starts the lifespan and serves one request. Importing the app must not
+# connect to the database or load the OpenAI / AWS / imaging SDKs; they load on first use.
+RUNS = int(os.getenv("BENCH_RUNS", "3"))
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+from app.db.db import engine
+sdks = sorted(name for name in ("openai", "boto3", "botocore", "PIL") if name in sys.modules)
+connections = engine.pool.checkedin() + engine.pool.checkedout()
+from fastapi.testclient import TestClient
+client_imported = time.perf_counter()
+with TestClient(app.main.app) as client:
+    response = client.get("/places/cache/stats")
+    served = time.perf_counter()
+print(json.dumps({
+    "import_s": imported - started,
+    "first_request_s": (imported - started) + (served - client_imported),
+    "status": response.status_code,
+    "sdks_at_import": sdks,
+    "db_connections_at_import": connections,
+}))
+"""
+
+
+def _cold_start():
+    env = {**os.environ, "AUTO_MIGRATE": "false", "RECOMMENDATIONS_REFRESH_ENABLED": "false"}
+    output = subprocess.run(
+        [sys.executable, "-c", _SCRIPT], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _slowest_app_imports(count=5):
+    """
+    The app modules with the largest cumulative import time, from `python -X importtime`.
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stderr
+    modules = []
+    for line in stderr.splitlines():
+        parts = line.removeprefix("import time:").split("|")
+        if len(parts) == 3 and parts[2].strip().startswith("app."):
+            modules.append((int(parts[1]) / 1000, parts[2].strip()))
+    return sorted(modules, reverse=True)[:count]
+
+
+def test_cold_import_and_time_to_first_request(engine):
+    runs = [_cold_start() for _ in range(RUNS)]
+    import_s = statistics.median(run["import_s"] for run in runs)
+    first_request_s = statistics.median(run["first_request_s"] for run in runs)
+
+    print(
+        f"\ncold start (median of {RUNS}): import app.main {import_s * 1000:.0f} ms, "
+        f"first response {first_request_s * 1000:.0f} ms after the import began"
+    )
+    for cumulative_ms, module in _slowest_app_imports():
+        print(f"  {cumulative_ms:7.1f} ms  {module}")
+    for run in runs:
+        assert run["status"] == 200
+        assert run["sdks_at_import"] == []
+        assert run["db_connections_at_import"] == 0
+    assert first_request_s < 10  # Loose: shared CI machines vary a lot
@@ -0,0 +1,114 @@
+import asyncio
+import os
+import statistics
+import threading
+import time
+import uuid
+import httpx
+import pytest
+import uvicorn
+from app.services import image_derivatives, upload_service
+
+# ✅ BENCH_UPLOADS concurrent profile photo uploads of BENCH_UPLOAD_MB each through
+# /upload-profile-photo/ (S3 is moto, the Firebase patch is stubbed), while an unrelated endpoint
+# is probed (run with -s to see the report). The app is served by a real uvicorn worker on its own
+# thread, so the client's work isn't counted against the server's event loop. For comparison the run
+# is repeated with the S3 upload done on the event loop, as the endpoint used to. Moto, the client
+# and the server share one process (and GIL), so compare the two runs rather than absolute numbers.
+# The request's full run is BENCH_UPLOADS=50 BENCH_UPLOAD_MB=10.
+UPLOADS = int(os.getenv("BENCH_UPLOADS", "50"))
+UPLOAD_MB = int(os.getenv("BENCH_UPLOAD_MB", "2"))
+
+
+@pytest.fixture
+def firebase(monkeypatch):
+    patched = []
+
+    async def fake_upstream_request(upstream, method, url, **kwargs):
+        await asyncio.sleep(0.05)
+        patched.append(url)
+        return httpx.Response(200, json=None)
+
+    monkeypatch.setattr(upload_service, "upstream_request", fake_upstream_request)
+    monkeypatch.setattr(image_derivatives, "schedule_profile_variants", lambda *args, **kwargs: True)  # Not images
+    return patched
+
+
+@pytest.fixture
+def live_server(client):
+    """
+    One uvicorn worker serving the app (with the test's DB override) on a free local port.
+    """
+    server = uvicorn.Server(uvicorn.Config(client.app, host="127.0.0.1", port=0, lifespan="off", log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+
+
+def _p99(values):
+    return statistics.quantiles(values, n=100)[98] if len(values) > 1 else values[0]
+
+
+async def _run(base_url: str, body: bytes):
+    limits = httpx.Limits(max_connections=UPLOADS + 1)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as http, httpx.AsyncClient(base_url=base_url) as probe:
+        async def upload():
+            response = await http.post(
+                "/upload-profile-photo/",
+                data={"user_id": str(uuid.uuid4())},
+                files={"file": ("profile.jpg", body, "image/jpeg")},
+            )
+            assert response.status_code == 200, response.text
+
+        await probe.get("/places/cache/stats")  # Warm-up
+        baseline = []
+        for _ in range(20):
+            probe_started = time.perf_counter()
+            await probe.get("/places/cache/stats")
+            baseline.append((time.perf_counter() - probe_started) * 1000)
+
+        probes = []
+        started = time.perf_counter()
+        pending = asyncio.gather(*[upload() for _ in range(UPLOADS)])
+        while not pending.done():
+            probe_started = time.perf_counter()
+            response = await probe.get("/places/cache/stats")
+            probes.append((time.perf_counter() - probe_started) * 1000)
+            assert response.status_code == 200
+            await asyncio.sleep(0.005)
+        await pending
+        return time.perf_counter() - started, baseline, probes
+
+
+def _report(label, elapsed, baseline, probes):
+    print(
+        f"\n{label}: {UPLOADS} uploads x {UPLOAD_MB} MB in {elapsed:.2f} s ({UPLOADS * UPLOAD_MB / elapsed:.0f} MB/s)"
+        f"\n  GET /places/cache/stats: idle p99 {_p99(baseline):.1f} ms; during uploads "
+        f"{len(probes)} probes, p50 {statistics.median(probes):.1f} ms, p99 {_p99(probes):.1f} ms"
+    )
+
+
+def test_concurrent_uploads_leave_other_endpoints_responsive(live_server, s3, firebase, monkeypatch):
+    body = os.urandom(UPLOAD_MB * 1024 * 1024)
+    elapsed, baseline, probes = asyncio.run(_run(live_server, body))
+    _report("off the event loop", elapsed, baseline, probes)
+    keys = s3.get_s3_client().list_objects_v2(Bucket="waypoint-test", Prefix="profile_photos/")["KeyCount"]
+    assert keys == UPLOADS
+    assert len(firebase) == UPLOADS
+
+    async def on_the_event_loop(function, *args, **kwargs):
+        return function(*args, **kwargs)
+
+    monkeypatch.setattr(upload_service, "run_in_threadpool", on_the_event_loop)
+    blocking_elapsed, blocking_baseline, blocking_probes = asyncio.run(_run(live_server, body))
+    _report("on the event loop (before)", blocking_elapsed, blocking_baseline, blocking_probes)
+
+    assert statistics.median(probes) < statistics.median(blocking_probes)
+    assert _p99(probes) < _p99(blocking_probes)
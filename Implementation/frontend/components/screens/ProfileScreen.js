@@ -218,6 +218,10 @@ const farLeftButtonStyle = useAnimatedStyle(() => {
           console.log('S3 Upload failed:', xhr.responseText);
           return;
         }
+
+        // ✅ Let the backend generate the thumbnail/WebP variants of the new photo
+        fetch(`${API_BASE_URL}/images/profile-photo-upload-complete/?user_id=${userId}`, { method: 'POST' })
+          .catch((error) => console.warn("Could not queue profile photo variants:", error));
   
         try {
           const db = getDatabase();
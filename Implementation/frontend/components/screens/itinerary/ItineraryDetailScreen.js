@@ -194,11 +194,20 @@ const ItineraryDetailScreen = () => {
       const { presigned_url, image_url } = response.data;
       const imageResponse = await fetch(imageUri);
       const blob = await imageResponse.blob();
-      await fetch(presigned_url, {
+      const putResponse = await fetch(presigned_url, {
         method: "PUT",
         body: blob,
         headers: { "Content-Type": "image/jpeg" },
       });
+      if (!putResponse.ok) {
+        throw new Error(`S3 upload failed with status ${putResponse.status}`);
+      }
+      // ✅ Let the backend know the upload landed so it can generate the thumbnail/WebP variants
+      try {
+        await axios.post(`${API_BASE_URL}/image-upload-complete/?itinerary_id=${itineraryId}`);
+      } catch (error) {
+        console.warn("Could not queue image variants:", error);
+      }
       setImageUrl(image_url);
       await updateRecentTripsInStorage();
 